@@ -6,6 +6,49 @@ class Settings(BaseSettings):
     debug_logs: bool = True
     YOUTUBE_API_KEY: str
 
+    # Feed fetching
+    feed_fetch_concurrency: int = 20
+    feed_fetch_per_host: int = 4
+    feed_fetch_timeout: float = 15.0
+    feed_fetch_deadline: float = 60.0
+    feed_max_body_bytes: int = 10 * 1024 * 1024
+
+    # Adaptive refresh scheduling
+    feed_min_refresh_minutes: int = 15
+    feed_default_refresh_minutes: int = 60
+    feed_max_refresh_minutes: int = 24 * 60
+    feed_refresh_jitter: float = 0.1
+    feed_scheduler_tick_seconds: int = 30
+    feed_scheduler_batch_size: int = 100
+
+    # Failure handling
+    feed_failure_backoff_minutes: int = 30
+    feed_max_backoff_minutes: int = 24 * 60
+    feed_park_after_failures: int = 10
+
+    # Refresh job queue and workers (python -m app.worker)
+    refresh_worker_batch_size: int = 20
+    refresh_worker_poll_seconds: float = 5.0
+    refresh_job_stale_minutes: int = 10
+    refresh_job_max_attempts: int = 3
+    refresh_job_retention_days: int = 7
+
+    # Fetch telemetry
+    feed_fetch_log_retention_days: int = 14
+
+    # WebSub push subscriptions (disabled unless the public callback base URL is set)
+    websub_callback_base_url: str | None = None
+    websub_lease_seconds: int = 7 * 24 * 3600
+    websub_fallback_refresh_minutes: int = 24 * 60
+
+    # Search result counts (see app/db/crud/counting.py)
+    search_count_cap: int = 10_000
+    search_count_cache_seconds: int = 60
+    search_count_cache_size: int = 1024
+
+    # Feed parsing (None = one worker process per CPU, 0 = parse inline)
+    feed_parse_workers: int | None = None
+
     class Config:
         env_file = ".env"
 
@@ -1,125 +1,339 @@
-from datetime import datetime, timezone
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Iterator, TypeVar
+from sqlalchemy import Executable, String, any_, bindparam, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.article import Article
-from ..models.feed import Feed
 from ..models.feed_articles import FeedArticles
+from .copy_loader import copy_to_staging, to_record
+from .crud_counters import article_delta_columns, feed_counter_cte
 from ...schemas.article import ArticleCreate
 
+# Postgres (and asyncpg) accept at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+T = TypeVar("T")
+
+def chunk_by_params(rows: list[T], params_per_row: int, reserved_params: int = 0) -> Iterator[list[T]]:
+    """
+    Splits rows into chunks that fit in a single statement: each chunk needs at most
+    params_per_row * len(chunk) + reserved_params bind parameters.
+
+    All chunks but the last have the same size, so their statements have the
+    same shape and SQLAlchemy's compiled cache can be reused between them.
+    """
+    size = max(1, (MAX_BIND_PARAMS - reserved_params) // max(params_per_row, 1))
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+async def bulk_insert(db: AsyncSession, stmt: Executable, rows: list[dict]) -> None:
+    """
+    Executes an INSERT (optionally with ON CONFLICT, without RETURNING) for many rows.
+
+    The rows are passed as executemany parameters, so the single-row statement is
+    compiled once and cached. SQLAlchemy's "insertmanyvalues" mode then sends it as
+    multi-row INSERTs, paged to stay below the driver's bind parameter limit.
+    Does not commit.
+    """
+    if rows:
+        await db.execute(stmt, rows)
+
+def _empty_counts() -> dict:
+    return {
+        "new_articles_count": 0,
+        "updated_articles_count": 0,
+        "unchanged_articles_count": 0,
+        "existing_articles_count": 0,
+        "new_relationships_count": 0,
+    }
+
+def deduplicate_articles(articles_data: list[ArticleCreate]) -> list[ArticleCreate]:
+    """
+    Keeps the first article of each link. A single INSERT .. ON CONFLICT
+    can't touch the same row twice.
+    """
+    unique_articles: dict[str, ArticleCreate] = {}
+    for article in articles_data:
+        unique_articles.setdefault(str(article.link), article)
+    return list(unique_articles.values())
+
+def _article_upsert_cte(insert_stmt):
+    """
+    Turns an INSERT into articles into the `upserted` CTE: rows with a new
+    content_hash are updated, and each returned row tells whether it was inserted.
+    """
+    return (
+        insert_stmt
+        .on_conflict_do_update(
+            constraint="articles_link_key",  # or index_elements=["link"]
+            set_={
+                "title":        insert_stmt.excluded.title,
+                # "published_at": insert_stmt.excluded.published_at,
+                "updated_at":   insert_stmt.excluded.updated_at,
+                "author":       insert_stmt.excluded.author,
+                "summary":      insert_stmt.excluded.summary,
+                "content":      insert_stmt.excluded.content,
+                "image_url":    insert_stmt.excluded.image_url,
+                "categories":   insert_stmt.excluded.categories,
+                "content_hash": insert_stmt.excluded.content_hash,
+                # Possibly also update is_favorited, is_read, etc.
+            },
+            # Leaves articles whose content did not change alone
+            where=Article.content_hash.is_distinct_from(insert_stmt.excluded.content_hash),
+        )
+        .returning(Article.id, (literal_column("xmax") == 0).label("inserted"))
+        .cte("upserted")
+    )
+
+def _upsert_counts_select(upserted):
+    return select(
+        select(func.count()).where(upserted.c.inserted).scalar_subquery().label("new_articles_count"),
+        select(func.count()).where(~upserted.c.inserted).scalar_subquery().label("updated_articles_count"),
+    )
+
+def _link_counts_select(article_ids, linked):
+    """
+    The SELECT of the link counts. The feed's counters are bumped in the same
+    statement, for the articles that were newly linked, and its categories
+    queued for a recount.
+    """
+    deltas = (
+        select(linked.c.feed_id, *article_delta_columns(article_ids.c.is_read, article_ids.c.is_favorited))
+        .join(article_ids, article_ids.c.id == linked.c.article_id)
+        .group_by(linked.c.feed_id)
+        .cte("article_deltas")
+    )
+    return select(
+        select(func.count()).select_from(article_ids).scalar_subquery().label("stored_articles_count"),
+        select(func.count()).select_from(linked).scalar_subquery().label("new_relationships_count"),
+    ).add_cte(feed_counter_cte(deltas))
+
+def build_upsert_statement(articles: list[ArticleCreate]):
+    """
+    Builds the statement that upserts the articles and counts the inserted and
+    updated ones:
+
+        WITH upserted AS (
+            INSERT INTO articles .. ON CONFLICT (link) DO UPDATE ..
+            WHERE articles.content_hash IS DISTINCT FROM excluded.content_hash
+            RETURNING id, xmax = 0 AS inserted
+        )
+        SELECT <counts>
+
+    - Articles whose stored content_hash matches are left alone (the conflict
+      WHERE is false, so they aren't rewritten nor returned).
+    - xmax is 0 only for freshly inserted rows, which tells new and updated apart.
+    - The articles are sent as a single JSONB parameter, expanded into rows
+      with jsonb_populate_recordset. A multi-row VALUES list would have to be
+      compiled again for every refresh (SQLAlchemy doesn't cache Postgres
+      INSERTs), and compiling it costs more than running it.
+    """
+    article_columns = list(ArticleCreate.model_fields)
+    incoming = (
+        func.jsonb_populate_recordset(
+            literal_column("NULL::articles"),
+            bindparam("articles", [article.model_dump(mode="json") for article in articles], type_=JSONB),
+        )
+        .table_valued(*article_columns)
+        .alias("incoming")
+    )
+    insert_stmt = pg_insert(Article).from_select(article_columns, select(*(incoming.c[name] for name in article_columns)))
+    return _upsert_counts_select(_article_upsert_cte(insert_stmt))
+
+def build_link_statement(feed_id: int, links: list[str]):
+    """
+    Builds the statement that links the articles with the given links to the
+    feed and bumps the counters for the new links:
+
+        WITH article_ids AS (SELECT id, is_read, is_favorited FROM articles WHERE link = ANY(:links)),
+        linked AS (
+            INSERT INTO feed_articles SELECT :feed_id, id FROM article_ids
+            ON CONFLICT DO NOTHING RETURNING feed_id, article_id
+        ),
+        <UPDATE feeds: counters + the newly linked articles>,
+        <INSERT INTO stale_categories: the feed's categories>
+        SELECT <counts>
+
+    It runs after build_upsert_statement, as its own statement: its snapshot
+    then also holds the articles that another transaction committed while the
+    upsert waited on them. Those come back from neither the upsert (a matching
+    hash skips them) nor the upsert's snapshot, so a single statement would
+    leave them unlinked.
+    """
+    links_param = bindparam("links", links, type_=ARRAY(String))
+    article_ids = (
+        select(Article.id, Article.is_read, Article.is_favorited)
+        .where(Article.link == any_(links_param))
+        .cte("article_ids")
+    )
+    linked = (
+        pg_insert(FeedArticles)
+        .from_select(["feed_id", "article_id"], select(literal(feed_id), article_ids.c.id))
+        .on_conflict_do_nothing(index_elements=["feed_id", "article_id"])
+        .returning(FeedArticles.feed_id, FeedArticles.article_id)
+        .cte("linked")
+    )
+    return _link_counts_select(article_ids, linked)
+
+def _add_counts(counts: dict, upsert_row, link_row) -> None:
+    counts["new_articles_count"] += upsert_row.new_articles_count
+    counts["updated_articles_count"] += upsert_row.updated_articles_count
+    counts["unchanged_articles_count"] += (
+        link_row.stored_articles_count - upsert_row.new_articles_count - upsert_row.updated_articles_count
+    )
+    counts["new_relationships_count"] += link_row.new_relationships_count
+
+async def _associate_articles(db: AsyncSession, feed_id: int, articles: list[ArticleCreate], counts: dict) -> None:
+    """
+    Runs the upsert and link statements for the feed's articles, adding up the
+    counts. Each takes a fixed number of bind parameters, whatever the number
+    of articles. Does not commit.
+    """
+    upsert_row = (await db.execute(build_upsert_statement(articles))).one()
+    link_row = (await db.execute(build_link_statement(feed_id, [str(article.link) for article in articles]))).one()
+    _add_counts(counts, upsert_row, link_row)
+    counts["existing_articles_count"] = counts["updated_articles_count"] + counts["unchanged_articles_count"]
+
 async def bulk_associate_articles_with_feed(
     db: AsyncSession, feed_id: int, articles_data: list[ArticleCreate]
 ) -> dict:
     """
     Inserts or updates Articles in bulk (using Postgres upsert) 
-    and associates them with the given Feed. 
+    and associates them with the given Feed, in two statements
+    and a single transaction (see build_upsert_statement and build_link_statement).
     
-    - On conflict for Articles (unique link), we update title, 
-      published_at, updated_at, author, summary, content, image_url, 
-      categories, etc.
+    - Every incoming article carries a content_hash computed at parse time.
+      Articles whose stored hash matches are left alone, so unchanged rows
+      are never rewritten (no dead tuples, no bloat).
+    - On conflict for Articles (unique link) with a different hash, we update
+      title, updated_at, author, summary, content, image_url, categories
+      and content_hash.
     - For the junction table (FeedArticles), we do "ON CONFLICT DO NOTHING"
       so we don't re-insert an existing (feed_id, article_id) pair.
     - Duplicates in articles_data (by link) are removed to avoid 
       redundant inserts/upserts.
 
+    Raises ValueError if the feed does not exist.
+
     Returns:
         dict of counts:
         {
             "new_articles_count": int,
+            "updated_articles_count": int,
+            "unchanged_articles_count": int,
             "existing_articles_count": int,
             "new_relationships_count": int,
         }
     """
+    return await bulk_associate_articles_with_feeds(db, {feed_id: articles_data})
 
-    # If there's nothing to process, return early
-    if not articles_data:
-        return {
-            "new_articles_count": 0,
-            "existing_articles_count": 0,
-            "new_relationships_count": 0,
-        }
-
-    # 1) Ensure the feed exists
-    feed_query = select(Feed).where(Feed.id == feed_id)
-    feed = (await db.execute(feed_query)).scalars().first()
-    if not feed:
-        raise ValueError(f"Feed with ID {feed_id} does not exist.")
-
-    # -------------------------------------------------------------------------
-    # Deduplicate `articles_data` by link to ensure we only upsert one row
-    # per unique link.
-    # If you want to keep the *last* instance of a given link instead of the
-    # first, you can iterate in reversed(...) or adjust logic accordingly.
-    # -------------------------------------------------------------------------
-    unique_links = set()
-    deduplicated_articles: list[ArticleCreate] = []
-    for article in articles_data:
-        if article.link not in unique_links:
-            deduplicated_articles.append(article)
-            unique_links.add(article.link)
-    # Now `deduplicated_articles` has only one entry per link
+async def bulk_associate_articles_with_feeds(
+    db: AsyncSession, articles_by_feed: dict[int, list[ArticleCreate]]
+) -> dict:
+    """
+    Same as bulk_associate_articles_with_feed, for the articles of several feeds
+    at once (e.g. an OPML import), committed together in one transaction.
+    Counts are summed over the feeds.
 
-    # 2) Extract the incoming links
-    incoming_links = [str(a.link) for a in deduplicated_articles]
+    Raises ValueError if one of the feeds does not exist.
+    """
+    counts = _empty_counts()
+    try:
+        for feed_id, articles_data in articles_by_feed.items():
+            if not articles_data:
+                continue
+            feed_counts = _empty_counts()
+            try:
+                await _associate_articles(db, feed_id, deduplicate_articles(articles_data), feed_counts)
+            except IntegrityError as e:
+                # The feed_articles foreign key is the only constraint that can fail here
+                raise ValueError(f"Feed with ID {feed_id} does not exist.") from e
+            for key, value in feed_counts.items():
+                counts[key] += value
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
 
-    # 3) Check existing links in the DB for counting new vs. existing
-    existing_links_query = select(Article.link).where(Article.link.in_(incoming_links))
-    existing_links_in_db = set((await db.execute(existing_links_query)).scalars().all())
+    return counts
 
-    # 4) Convert ArticleCreate items to dict for bulk insert
-    article_dicts = [item.model_dump() for item in deduplicated_articles]
+def build_staged_upsert_statement(staging):
+    """
+    The same upsert and count statement as build_upsert_statement, reading
+    the articles from a COPY staging table instead of a JSONB parameter. Articles staged
+    for several feeds are upserted once.
+    """
+    article_columns = list(ArticleCreate.model_fields)
+    # One row per link: ON CONFLICT DO UPDATE can't touch the same row twice
+    source = (
+        select(*(staging.c[name] for name in article_columns))
+        .distinct(staging.c.link)
+        .order_by(staging.c.link)
+    )
+    return _upsert_counts_select(_article_upsert_cte(pg_insert(Article).from_select(article_columns, source)))
 
-    # 5) Upsert (insert on conflict do update) Articles
-    stmt = (
-        pg_insert(Article)
-        .values(article_dicts)
-        .on_conflict_do_update(
-            constraint="articles_link_key",  # or index_elements=["link"]
-            set_={
-                "title":        pg_insert(Article).excluded.title,
-                # "published_at": pg_insert(Article).excluded.published_at,
-                "updated_at":   pg_insert(Article).excluded.updated_at,
-                "author":       pg_insert(Article).excluded.author,
-                "summary":      pg_insert(Article).excluded.summary,
-                "content":      pg_insert(Article).excluded.content,
-                "image_url":    pg_insert(Article).excluded.image_url,
-                "categories":   pg_insert(Article).excluded.categories,
-                # Possibly also update is_favorited, is_read, etc.
-            },
+def build_staged_link_statement(staging):
+    """
+    The same link and count statement as build_link_statement, linking the
+    staged articles to the feed of their staging row (the feed_id column).
+    """
+    staged_links = select(staging.c.link).distinct().subquery("staged_links")
+    article_ids = (
+        select(Article.id, Article.link, Article.is_read, Article.is_favorited)
+        .join(staged_links, staged_links.c.link == Article.link)
+        .cte("article_ids")
+    )
+    linked = (
+        pg_insert(FeedArticles)
+        .from_select(
+            ["feed_id", "article_id"],
+            select(staging.c.feed_id, article_ids.c.id)
+            .join(article_ids, article_ids.c.link == staging.c.link)
+            .distinct(),
         )
-        .returning(Article.id, Article.link)
+        .on_conflict_do_nothing(index_elements=["feed_id", "article_id"])
+        .returning(FeedArticles.feed_id, FeedArticles.article_id)
+        .cte("linked")
     )
+    return _link_counts_select(article_ids, linked)
 
-    result = await db.execute(stmt)
-    await db.commit()
-
-    rows = result.fetchall()  # list of (id, link)
-    link_to_id = {r.link: r.id for r in rows}
+async def copy_associate_articles_with_feeds(
+    db: AsyncSession, articles_by_feed: dict[int, list[ArticleCreate]]
+) -> dict:
+    """
+    COPY based variant of bulk_associate_articles_with_feeds for large imports.
 
-    # 6) Count how many new vs. how many updated
-    new_articles_count = sum(1 for link in link_to_id if link not in existing_links_in_db)
-    existing_articles_count = len(link_to_id) - new_articles_count
+    All articles are streamed into a temporary staging table with COPY (no bind
+    parameters, no statement to compile), then merged into articles and
+    feed_articles with set-based statements, in a single transaction.
 
-    # 7) Insert into feed_articles table with ON CONFLICT DO NOTHING
-    feed_article_values = [
-        {"feed_id": feed_id, "article_id": link_to_id[link]}
-        for link in link_to_id
+    Raises ValueError if one of the feeds does not exist.
+    """
+    article_columns = list(ArticleCreate.model_fields)
+    records = [
+        (*to_record(article.model_dump(), article_columns), feed_id)
+        for feed_id, articles_data in articles_by_feed.items()
+        for article in deduplicate_articles(articles_data)
     ]
-    stmt_feed_articles = (
-        pg_insert(FeedArticles)
-        .values(feed_article_values)
-        .on_conflict_do_nothing(index_elements=["feed_id", "article_id"])
-        .returning(FeedArticles.article_id)
-    )
-    result_feed_articles = await db.execute(stmt_feed_articles)
-    await db.commit()
+    if not records:
+        return _empty_counts()
 
-    new_relationship_article_ids = result_feed_articles.scalars().all()
-    new_relationships_count = len(new_relationship_article_ids)
+    try:
+        staging = await copy_to_staging(
+            db, Article.__table__, article_columns, records, extra_columns={"feed_id": "integer"}
+        )
+        upsert_row = (await db.execute(build_staged_upsert_statement(staging))).one()
+        link_row = (await db.execute(build_staged_link_statement(staging))).one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise ValueError("One of the feeds does not exist.") from e
+    except Exception:
+        await db.rollback()
+        raise
 
-    return {
-        "new_articles_count": new_articles_count,
-        "existing_articles_count": existing_articles_count,
-        "new_relationships_count": new_relationships_count,
-    }
+    counts = _empty_counts()
+    _add_counts(counts, upsert_row, link_row)
+    counts["existing_articles_count"] = counts["updated_articles_count"] + counts["unchanged_articles_count"]
+    return counts
@@ -0,0 +1,51 @@
+from typing import Any, Iterable
+from pydantic import AnyUrl
+from sqlalchemy import Table, column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def to_record(values: dict[str, Any], columns: list[str]) -> tuple:
+    """
+    Turns a row dict into a COPY record in the order of `columns`.
+    asyncpg encodes COPY values by their Postgres type, so pydantic URLs become plain strings.
+    """
+    return tuple(
+        str(values[name]) if isinstance(values[name], AnyUrl) else values[name]
+        for name in columns
+    )
+
+async def copy_to_staging(
+    db: AsyncSession,
+    target: Table,
+    columns: list[str],
+    records: Iterable[tuple],
+    extra_columns: dict[str, str] | None = None,
+) -> Any:
+    """
+    Creates a temporary staging table with the given columns of `target` (same types,
+    no constraints) and loads the records into it with COPY, through asyncpg's
+    copy_records_to_table.
+
+    The staging table is dropped when the transaction commits, so the caller
+    merges it into the real table and commits in the same transaction.
+    `extra_columns` maps additional staging-only column names to their SQL type.
+
+    Returns a lightweight table() construct for the staging table, to build the merge with.
+    """
+    staging_name = f"staging_{target.name}"
+    column_list = ", ".join(f'"{name}"' for name in columns)
+    # This first statement also opens the transaction that COPY then runs in
+    await db.execute(text(
+        f'CREATE TEMP TABLE {staging_name} ON COMMIT DROP AS '
+        f'SELECT {column_list} FROM {target.name} WITH NO DATA'
+    ))
+    for name, sql_type in (extra_columns or {}).items():
+        await db.execute(text(f'ALTER TABLE {staging_name} ADD COLUMN "{name}" {sql_type}'))
+
+    all_columns = [*columns, *(extra_columns or {})]
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging_name, records=records, columns=all_columns
+    )
+
+    return table(staging_name, *(column(name) for name in all_columns))
@@ -0,0 +1,90 @@
+import json
+from typing import Any, Literal
+from cachetools import TTLCache
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from ...core.config import settings
+
+CountMode = Literal["exact", "estimated", "capped", "none"]
+
+# Search parameters that only select the page, not the matching rows
+PAGE_FIELDS = {"limit", "offset", "cursor", "order_by", "count"}
+
+# (namespace, mode, filter signature) -> count, for the approximate counts only
+_count_cache: TTLCache = TTLCache(
+    maxsize=settings.search_count_cache_size, ttl=settings.search_count_cache_seconds
+)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a select, keeping its bound parameters."""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def filter_signature(params: Any) -> str:
+    """
+    A stable key for the filters of a search, ignoring the PAGE_FIELDS.
+    """
+    return json.dumps(params.model_dump(exclude=PAGE_FIELDS), sort_keys=True, default=str)
+
+
+async def _estimate_rows(db: AsyncSession, filtered: Select) -> int:
+    """The planner's row estimate for the query, without running it."""
+    plan = await db.scalar(_Explain(filtered))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession, filtered: Select, mode: CountMode, namespace: str, signature: str
+) -> tuple[int | None, bool]:
+    """
+    Counts the rows of `filtered` (a select of the matching ids, without ordering
+    or paging) the way `mode` asks:
+
+    - exact: a real count
+    - estimated: the planner's estimate from table statistics, nearly free
+    - capped: a real count that stops at search_count_cap
+    - none: no count at all
+
+    Approximate results (estimated, and capped counts that hit the cap) are cached
+    for search_count_cache_seconds per (namespace, mode, signature), so scrolling
+    through the pages of a large search only counts once. Exact results are never
+    cached: they would go stale as soon as an article is read or favorited.
+
+    Returns (count or None, whether the count is approximate).
+    """
+    if mode == "none":
+        return None, False
+
+    if mode == "exact":
+        return await db.scalar(select(func.count()).select_from(filtered.subquery())), False
+
+    key = (namespace, mode, signature)
+    cached = _count_cache.get(key)
+    if cached is not None:
+        return cached, True
+
+    if mode == "estimated":
+        count = await _estimate_rows(db, filtered)
+    else:
+        cap = settings.search_count_cap
+        count = await db.scalar(select(func.count()).select_from(filtered.limit(cap + 1).subquery()))
+        if count <= cap:
+            return count, False
+        count = cap
+
+    _count_cache[key] = count
+    return count, True
@@ -1,10 +1,16 @@
-from sqlalchemy import distinct, func, select
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.article import Article
 from ..models.feed_articles import FeedArticles
 from ...schemas.article import ArticleCreate, ArticleUpdate, ArticleSearchParams
 from .crud_feed import get_feed_by_id
+from .counting import count_rows, filter_signature
+from .crud_counters import apply_feed_deltas, article_delta_columns
+from . import text_search
+from .filters import contains, flag_is
+from .pagination import decode_cursor, keyset_order, keyset_paginate, next_page_cursor, null_tail
 
 async def create_article(db: AsyncSession, article_in: ArticleCreate) -> Article:
     """Create a single Article"""
@@ -33,14 +39,13 @@ async def associate_article_with_feed(db: AsyncSession, feed_id: int, article_da
     # Create or retrieve the article
     article = await create_or_get_article(db, article_data)
 
-    # Associate the article with the feed using ORM
+    # Associate the article with the feed, without loading the feed's articles
     feed = await get_feed_by_id(db, feed_id)
     if not feed:
         raise ValueError(f"Feed with ID {feed_id} does not exist.")
 
-    if article not in feed.articles:
-        feed.articles.append(article)
-        await db.commit()
+    await _link_articles_to_feed(db, feed_id, [article.id])
+    await db.commit()
 
     return article
 
@@ -60,25 +65,60 @@ async def associate_new_articles_with_feed(
     if not feed:
         raise ValueError(f"Feed with ID {feed_id} does not exist.")
 
-    associated_articles = []
     db_articles = [Article(**article_in.model_dump()) for article_in in articles_data]
     db.add_all(db_articles)
+    await db.flush()
 
-    for article in db_articles:
-
-        # Associate the article with the feed
-        if article not in feed.articles:
-            feed.articles.append(article)
-            associated_articles.append(article)
+    # Associate the articles with the feed
+    await _link_articles_to_feed(db, feed_id, [article.id for article in db_articles])
 
     # Commit the changes to the database
     await db.commit()
 
-    return associated_articles
+    return db_articles
+
+async def _link_articles_to_feed(db: AsyncSession, feed_id: int, article_ids: list[int]) -> None:
+    """Inserts the feed_articles rows that don't exist yet, and counts the newly linked articles."""
+    if not article_ids:
+        return
+    linked = (
+        pg_insert(FeedArticles)
+        .values([{"feed_id": feed_id, "article_id": article_id} for article_id in article_ids])
+        .on_conflict_do_nothing(index_elements=["feed_id", "article_id"])
+        .returning(FeedArticles.feed_id, FeedArticles.article_id)
+        .cte("linked")
+    )
+    deltas = (
+        select(linked.c.feed_id, *article_delta_columns(Article.is_read, Article.is_favorited))
+        .join(Article, Article.id == linked.c.article_id)
+        .group_by(linked.c.feed_id)
+        .cte("article_deltas")
+    )
+    await apply_feed_deltas(db, deltas)
+
+def _article_flag_deltas(article_id: int, total: int, unread: int, favorited: int):
+    """Counter deltas for every feed of the article."""
+    return (
+        select(
+            FeedArticles.feed_id,
+            literal(total).label("total_articles"),
+            literal(unread).label("unread_articles"),
+            literal(favorited).label("favorited_articles"),
+        )
+        .where(FeedArticles.article_id == article_id)
+        .cte("article_deltas")
+    )
 
 async def update_article(db: AsyncSession, db_article: Article, article_data: ArticleUpdate) -> Article:
+    was_read, was_favorited = db_article.is_read, db_article.is_favorited
     for field, value in article_data.model_dump(exclude_unset=True).items():
         setattr(db_article, field, value)
+
+    # Marking read or (un)favoriting moves the counters of the article's feeds
+    unread = int(was_read) - int(db_article.is_read)
+    favorited = int(db_article.is_favorited) - int(was_favorited)
+    if unread or favorited:
+        await apply_feed_deltas(db, _article_flag_deltas(db_article.id, 0, unread, favorited))
     await db.commit()
     await db.refresh(db_article)
     return db_article
@@ -94,24 +134,35 @@ async def get_articles_by_feed_id(db: AsyncSession, feed_id: int, limit: int = 1
     result = await db.execute(query)
     return result.scalars().all()
 
-async def get_articles(db: AsyncSession, params: ArticleSearchParams) -> tuple[list[Article], int]:
+async def get_articles(
+    db: AsyncSession, params: ArticleSearchParams
+) -> tuple[list[Article], int | None, bool, str | None]:
     """
     Search articles with pagination and return the total count, resolving column ambiguities.
 
+    Pages are either selected with offset, or with the keyset cursor returned
+    with the previous page (which stays fast however deep the page is).
+    The total count is computed as params.count asks (see counting.count_rows).
+    With params.q, articles are matched with full-text search and come with
+    their relevance `rank` and a highlighted `headline`.
+
     :param db: Database session
     :param params: Search parameters
-    :return: Tuple of (paginated articles, total count)
+    :return: Tuple of (paginated articles, total count or None, whether the count is
+        approximate, cursor to the next page or None)
+    :raises InvalidCursorError: if params.cursor is not a valid cursor for params.order_by
+    :raises ValueError: if ordering by relevance without params.q
     """
     # Alias for Article to ensure column uniqueness
     article_alias = aliased(Article)
 
-    # Base query selecting only Article columns
+    # Base query selecting only Article columns (the search document is never returned)
     query = select(
-        *[getattr(article_alias, col) for col in Article.__table__.columns.keys()]
+        *[getattr(article_alias, col) for col in Article.__table__.columns.keys() if col != "search_vector"]
     )
 
-    # Base query for total count (no pagination or sorting)
-    total_query = select(func.count(distinct(article_alias.id)))
+    # Matching ids for the total count (no pagination or sorting)
+    count_query = select(article_alias.id)
 
     # Join FeedArticles for feed filtering
     if params.feed_ids:
@@ -120,49 +171,82 @@ async def get_articles(db: AsyncSession, params: ArticleSearchParams) -> tuple[l
             FeedArticles.article_id == article_alias.id
         ).where(FeedArticles.feed_id.in_(params.feed_ids))
 
-        total_query = total_query.join(
+        # An article can belong to several of the feeds
+        count_query = count_query.join(
             FeedArticles,
             FeedArticles.article_id == article_alias.id
-        ).where(FeedArticles.feed_id.in_(params.feed_ids))
+        ).where(FeedArticles.feed_id.in_(params.feed_ids)).distinct()
+
+    # Full-text search on title, summary and content, with relevance and highlighted snippets
+    search_rank = None
+    if params.q:
+        ts_query = text_search.web_search_query(params.q)
+        search_rank = text_search.rank(article_alias.search_vector, ts_query)
+        snippet = text_search.headline(func.coalesce(article_alias.summary, article_alias.content), ts_query)
+        query = query.add_columns(search_rank.label("rank"), snippet.label("headline"))
+        query = query.where(text_search.matches(article_alias.search_vector, ts_query))
+        count_query = count_query.where(text_search.matches(article_alias.search_vector, ts_query))
+    elif params.order_by == "relevance":
+        raise ValueError("order_by=relevance needs a search query (q).")
 
     # Apply filters based on search parameters
     if params.title:
-        query = query.where(article_alias.title.ilike(f"%{params.title}%"))
-        total_query = total_query.where(article_alias.title.ilike(f"%{params.title}%"))
+        query = query.where(contains(article_alias.title, params.title))
+        count_query = count_query.where(contains(article_alias.title, params.title))
 
     if params.author:
-        query = query.where(article_alias.author.ilike(f"%{params.author}%"))
-        total_query = total_query.where(article_alias.author.ilike(f"%{params.author}%"))
+        query = query.where(contains(article_alias.author, params.author))
+        count_query = count_query.where(contains(article_alias.author, params.author))
 
     if params.is_favorited is not None:
-        query = query.where(article_alias.is_favorited == params.is_favorited)
-        total_query = total_query.where(article_alias.is_favorited == params.is_favorited)
+        query = query.where(flag_is(article_alias.is_favorited, params.is_favorited))
+        count_query = count_query.where(flag_is(article_alias.is_favorited, params.is_favorited))
 
     if params.is_read is not None:
-        query = query.where(article_alias.is_read == params.is_read)
-        total_query = total_query.where(article_alias.is_read == params.is_read)
-
-    # Sorting for the paginated query
-    if params.order_by == "created_at":
-        query = query.order_by(article_alias.created_at.desc())
-    elif params.order_by == "last_updated":
-        query = query.order_by(article_alias.last_updated.desc())
-    elif params.order_by == "published_at":
-        query = query.order_by(article_alias.published_at.desc())
-    elif params.order_by == "updated_at":
-        query = query.order_by(article_alias.updated_at.desc())
-
-    # Pagination for the paginated query
-    paginated_query = query.limit(params.limit).offset(params.offset)
+        query = query.where(flag_is(article_alias.is_read, params.is_read))
+        count_query = count_query.where(flag_is(article_alias.is_read, params.is_read))
+
+    # Sorting for the paginated query: most relevant or newest first, NULLs last, id as tie-breaker
+    if params.order_by == "relevance":
+        sort_column, sort_key = search_rank, "rank"
+    else:
+        sort_column, sort_key = getattr(article_alias, params.order_by), params.order_by
+    query = query.order_by(*keyset_order(sort_column, article_alias.id, descending=True))
+
+    # Pagination: seek past the cursor if there is one, otherwise use offset.
+    # One extra row is fetched to know whether there is a next page.
+    tail_query = None
+    if params.cursor:
+        cursor_value, cursor_id = decode_cursor(params.cursor, params.order_by, sort_column)
+        tail_query = null_tail(query, sort_column, cursor_value)
+        query = keyset_paginate(query, sort_column, article_alias.id, True, cursor_value, cursor_id)
+    else:
+        query = query.offset(params.offset)
+    paginated_query = query.limit(params.limit + 1)
 
     # Execute queries
     result = await db.execute(paginated_query)
-    total_count = await db.scalar(total_query)
+    rows = result.all()
+    if tail_query is not None and len(rows) <= params.limit:
+        # The seek ran out of rows: the page goes on with the NULL sort keys
+        tail = await db.execute(tail_query.limit(params.limit + 1 - len(rows)))
+        rows += tail.all()
+    total_count, approximate = await count_rows(
+        db, count_query, params.count, "articles", filter_signature(params)
+    )
 
-    # Map query results to Article objects
-    articles = [Article(**row._asdict()) for row in result]
+    rows, next_cursor = next_page_cursor(rows, params.limit, params.order_by, sort_key)
 
-    return articles, total_count
+    # Map query results to Article objects, with the search rank and snippet when searching
+    articles = []
+    for row in rows:
+        values = row._asdict()
+        rank, snippet = values.pop("rank", None), values.pop("headline", None)
+        article = Article(**values)
+        article.rank, article.headline = rank, snippet
+        articles.append(article)
+
+    return articles, total_count, approximate, next_cursor
 
 
 async def get_article_by_link(db: AsyncSession, link: str) -> Article | None:
@@ -178,22 +262,7 @@ async def get_article_by_id(db: AsyncSession, id: int) -> Article | None:
 async def delete_article_by_id(db: AsyncSession, article_id: int) -> None:
     article = await get_article_by_id(db, article_id)
     if article:
+        deltas = _article_flag_deltas(article.id, -1, -int(not article.is_read), -int(article.is_favorited))
+        await apply_feed_deltas(db, deltas)
         await db.delete(article)
         await db.commit()
-
-async def get_article_counts_for_feeds(db: AsyncSession, feed_ids: list[int]) -> dict[int, int]:
-    """
-    Calculate the number of articles for each feed in the provided list of feed IDs.
-
-    :param db: Database session
-    :param feed_ids: List of feed IDs
-    :return: Dictionary mapping feed ID to article count
-    """
-    query = (
-        select(FeedArticles.feed_id, func.count(FeedArticles.article_id).label("article_count"))
-        .where(FeedArticles.feed_id.in_(feed_ids))
-        .group_by(FeedArticles.feed_id)
-    )
-
-    result = await db.execute(query)
-    return {row.feed_id: row.article_count for row in result.all()}
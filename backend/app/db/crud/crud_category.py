@@ -1,11 +1,15 @@
 # crud_category.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from typing import List
+from sqlalchemy import Integer, String, any_, bindparam, select, delete, func, true
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 
-from ..models.category import Category
+from ..models.category import Category, FeedCategory, ChannelCategory
 from ..models.feed import Feed
 from ..models.channel import Channel
+from .bulk_operations import bulk_insert
+from .crud_counters import CATEGORY_COUNTERS, mark_categories_stale
+from .filters import similarity, text_filter
 from ...schemas.category import CategoryCreate, CategoryUpdate
 
 async def create_category(db: AsyncSession, category_in: CategoryCreate) -> Category:
@@ -39,13 +43,96 @@ async def get_category_by_name(db: AsyncSession, name: str) -> Category | None:
     return result.scalars().first()
 
 
-async def get_all_categories(db: AsyncSession) -> List[Category]:
+async def get_all_categories(db: AsyncSession, name: str | None = None, fuzzy: bool = False) -> list[dict]:
     """
-    Retrieve all categories.
+    Retrieve all categories, or those whose name contains `name`, by name.
+    With fuzzy, names similar to `name` are matched too, best matches first.
+
+    Each category comes with the number and ids of its feeds and channels,
+    aggregated per membership table before joining, so the query returns
+    one row per category whatever the number of members, and with its stored
+    article and video counters (see crud_counters.refresh_category_counters).
+    """
+    feed_members = (
+        select(
+            FeedCategory.category_id,
+            func.count().label("feed_count"),
+            func.array_agg(aggregate_order_by(FeedCategory.feed_id, FeedCategory.feed_id)).label("feed_ids"),
+        )
+        .group_by(FeedCategory.category_id)
+        .subquery()
+    )
+    channel_members = (
+        select(
+            ChannelCategory.category_id,
+            func.count().label("channel_count"),
+            func.array_agg(aggregate_order_by(ChannelCategory.channel_id, ChannelCategory.channel_id)).label("channel_ids"),
+        )
+        .group_by(ChannelCategory.category_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Category.id,
+            Category.name,
+            feed_members.c.feed_count,
+            feed_members.c.feed_ids,
+            channel_members.c.channel_count,
+            channel_members.c.channel_ids,
+            *(getattr(Category, name) for name in CATEGORY_COUNTERS),
+        )
+        .outerjoin(feed_members, feed_members.c.category_id == Category.id)
+        .outerjoin(channel_members, channel_members.c.category_id == Category.id)
+    )
+    if name:
+        query = query.where(text_filter(Category.name, name, fuzzy))
+        if fuzzy:
+            query = query.order_by(similarity(Category.name, name).desc())
+    query = query.order_by(Category.name)
+
+    result = await db.execute(query)
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "feed_count": row.feed_count or 0,
+            "feed_ids": row.feed_ids or [],
+            "channel_count": row.channel_count or 0,
+            "channel_ids": row.channel_ids or [],
+            **{name: getattr(row, name) for name in CATEGORY_COUNTERS},
+        }
+        for row in result.all()
+    ]
+
+
+async def get_or_create_categories(db: AsyncSession, names: list[str]) -> dict[str, int]:
     """
-    query = select(Category)
+    Makes sure a category exists for each of the given names.
+    Returns a mapping of name -> category id.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    stmt = pg_insert(Category).on_conflict_do_nothing(index_elements=["name"])
+    await bulk_insert(db, stmt, [{"name": name} for name in names])
+    await db.commit()
+
+    query = select(Category.id, Category.name).where(Category.name.in_(names))
     result = await db.execute(query)
-    return result.unique().scalars().all()
+    return {row.name: row.id for row in result.all()}
+
+
+async def bulk_add_feeds_to_categories(db: AsyncSession, pairs: list[tuple[int, int]]) -> None:
+    """
+    Adds many (feed_id, category_id) memberships at once, skipping existing ones.
+    """
+    if not pairs:
+        return
+    stmt = pg_insert(FeedCategory).on_conflict_do_nothing(index_elements=["feed_id", "category_id"])
+    await bulk_insert(db, stmt, [{"feed_id": feed_id, "category_id": category_id} for feed_id, category_id in pairs])
+    await mark_categories_stale(db, [category_id for _, category_id in pairs])
+    await db.commit()
 
 
 async def update_category(db: AsyncSession, category_id: int, category_in: CategoryUpdate) -> Category:
@@ -77,98 +164,162 @@ async def delete_category(db: AsyncSession, category_id: int) -> None:
     await db.commit()
 
 
-async def add_feed_to_category(db: AsyncSession, category_id: int, feed_id: int) -> Category:
-    """
-    Add a feed to a category (many-to-many).
-    Returns the updated Category object.
-    """
-    db_category = await get_category_by_id(db, category_id)
-    if not db_category:
-        raise ValueError(f"Category with ID {category_id} does not exist.")
-
-    query_feed = select(Feed).where(Feed.id == feed_id)
-    result_feed = await db.execute(query_feed)
-    db_feed = result_feed.scalars().first()
+async def _member_error(db: AsyncSession, category_id: int, member_name: str, member_id) -> ValueError:
+    """The ValueError for a membership write that hit a foreign key: says which side doesn't exist."""
+    if not await get_category_by_id(db, category_id):
+        return ValueError(f"Category with ID {category_id} does not exist.")
+    return ValueError(f"{member_name} with ID {member_id} does not exist.")
 
-    if not db_feed:
-        raise ValueError(f"Feed with ID {feed_id} does not exist.")
-
-    if db_feed not in db_category.feeds:
-        db_category.feeds.append(db_feed)
 
+async def add_feed_to_category(db: AsyncSession, category_id: int, feed_id: int) -> bool:
+    """
+    Add a feed to a category (many-to-many), with a single INSERT.
+    Returns False if the feed already was in the category.
+    Raises ValueError if the category or the feed doesn't exist.
+    """
+    stmt = (
+        pg_insert(FeedCategory)
+        .values(feed_id=feed_id, category_id=category_id)
+        .on_conflict_do_nothing(index_elements=["feed_id", "category_id"])
+    )
+    try:
+        result = await db.execute(stmt)
+        if result.rowcount:
+            await mark_categories_stale(db, [category_id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise await _member_error(db, category_id, "Feed", feed_id)
+    return result.rowcount > 0
+
+
+async def remove_feed_from_category(db: AsyncSession, category_id: int, feed_id: int) -> bool:
+    """
+    Remove a feed from a category (many-to-many), with a single DELETE.
+    Returns False if the feed wasn't in the category.
+    """
+    stmt = delete(FeedCategory).where(FeedCategory.category_id == category_id, FeedCategory.feed_id == feed_id)
+    result = await db.execute(stmt)
+    if result.rowcount:
+        await mark_categories_stale(db, [category_id])
     await db.commit()
-    await db.refresh(db_category)
-    await db.refresh(db_feed)
-    return db_category
+    return result.rowcount > 0
 
 
-async def remove_feed_from_category(db: AsyncSession, category_id: int, feed_id: int) -> Category:
+async def add_channel_to_category(db: AsyncSession, category_id: int, channel_id: str) -> bool:
     """
-    Remove a feed from a category (many-to-many).
-    Returns the updated Category object.
+    Add a channel to a category (many-to-many), with a single INSERT.
+    Returns False if the channel already was in the category.
+    Raises ValueError if the category or the channel doesn't exist.
     """
-    db_category = await get_category_by_id(db, category_id)
-    if not db_category:
-        raise ValueError(f"Category with ID {category_id} does not exist.")
-
-    query_feed = select(Feed).where(Feed.id == feed_id)
-    result_feed = await db.execute(query_feed)
-    db_feed = result_feed.scalars().first()
-
-    if not db_feed:
-        raise ValueError(f"Feed with ID {feed_id} does not exist.")
-
-    if db_feed in db_category.feeds:
-        db_category.feeds.remove(db_feed)
-
+    stmt = (
+        pg_insert(ChannelCategory)
+        .values(channel_id=channel_id, category_id=category_id)
+        .on_conflict_do_nothing(index_elements=["channel_id", "category_id"])
+    )
+    try:
+        result = await db.execute(stmt)
+        if result.rowcount:
+            await mark_categories_stale(db, [category_id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise await _member_error(db, category_id, "Channel", channel_id)
+    return result.rowcount > 0
+
+
+async def remove_channel_from_category(db: AsyncSession, category_id: int, channel_id: str) -> bool:
+    """
+    Remove a channel from a category (many-to-many), with a single DELETE.
+    Returns False if the channel wasn't in the category.
+    """
+    stmt = delete(ChannelCategory).where(
+        ChannelCategory.category_id == category_id, ChannelCategory.channel_id == channel_id
+    )
+    result = await db.execute(stmt)
+    if result.rowcount:
+        await mark_categories_stale(db, [category_id])
     await db.commit()
-    await db.refresh(db_category)
-    return db_category
+    return result.rowcount > 0
 
 
-async def add_channel_to_category(db: AsyncSession, category_id: int, channel_id: int) -> Category:
+async def assign_feeds_to_categories(db: AsyncSession, feed_ids: list[int], category_ids: list[int]) -> int:
     """
-    Add a channel to a category (many-to-many).
-    Returns the updated Category object.
+    Adds every given feed to every given category in one INSERT .. SELECT.
+    Ids that don't exist and existing memberships are skipped.
+    Returns the number of memberships created.
     """
-    db_category = await get_category_by_id(db, category_id)
-    if not db_category:
-        raise ValueError(f"Category with ID {category_id} does not exist.")
-
-    query_channel = select(Channel).where(Channel.id == channel_id)
-    result_channel = await db.execute(query_channel)
-    db_channel = result_channel.scalars().first()
-
-    if not db_channel:
-        raise ValueError(f"Channel with ID {channel_id} does not exist.")
-
-    if db_channel not in db_category.channels:
-        db_category.channels.append(db_channel)
-
+    feeds = bindparam("feed_ids", feed_ids, type_=ARRAY(Integer))
+    categories = bindparam("category_ids", category_ids, type_=ARRAY(Integer))
+    pairs = (
+        select(Feed.id, Category.id)
+        .join(Category, true())  # every pair
+        .where(Feed.id == any_(feeds), Category.id == any_(categories))
+    )
+    stmt = (
+        pg_insert(FeedCategory)
+        .from_select(["feed_id", "category_id"], pairs)
+        .on_conflict_do_nothing(index_elements=["feed_id", "category_id"])
+    )
+    result = await db.execute(stmt)
+    if result.rowcount:
+        await mark_categories_stale(db, category_ids)
     await db.commit()
-    await db.refresh(db_category)
-    return db_category
+    return result.rowcount
 
 
-async def remove_channel_from_category(db: AsyncSession, category_id: int, channel_id: int) -> Category:
+async def unassign_feeds_from_categories(db: AsyncSession, feed_ids: list[int], category_ids: list[int]) -> int:
     """
-    Remove a channel from a category (many-to-many).
-    Returns the updated Category object.
+    Removes every given feed from every given category in one DELETE.
+    Returns the number of memberships removed.
     """
-    db_category = await get_category_by_id(db, category_id)
-    if not db_category:
-        raise ValueError(f"Category with ID {category_id} does not exist.")
+    stmt = delete(FeedCategory).where(
+        FeedCategory.feed_id == any_(bindparam("feed_ids", feed_ids, type_=ARRAY(Integer))),
+        FeedCategory.category_id == any_(bindparam("category_ids", category_ids, type_=ARRAY(Integer))),
+    )
+    result = await db.execute(stmt)
+    if result.rowcount:
+        await mark_categories_stale(db, category_ids)
+    await db.commit()
+    return result.rowcount
 
-    query_channel = select(Channel).where(Channel.id == channel_id)
-    result_channel = await db.execute(query_channel)
-    db_channel = result_channel.scalars().first()
 
-    if not db_channel:
-        raise ValueError(f"Channel with ID {channel_id} does not exist.")
+async def assign_channels_to_categories(db: AsyncSession, channel_ids: list[str], category_ids: list[int]) -> int:
+    """
+    Adds every given channel to every given category in one INSERT .. SELECT.
+    Ids that don't exist and existing memberships are skipped.
+    Returns the number of memberships created.
+    """
+    channels = bindparam("channel_ids", channel_ids, type_=ARRAY(String))
+    categories = bindparam("category_ids", category_ids, type_=ARRAY(Integer))
+    pairs = (
+        select(Channel.id, Category.id)
+        .join(Category, true())  # every pair
+        .where(Channel.id == any_(channels), Category.id == any_(categories))
+    )
+    stmt = (
+        pg_insert(ChannelCategory)
+        .from_select(["channel_id", "category_id"], pairs)
+        .on_conflict_do_nothing(index_elements=["channel_id", "category_id"])
+    )
+    result = await db.execute(stmt)
+    if result.rowcount:
+        await mark_categories_stale(db, category_ids)
+    await db.commit()
+    return result.rowcount
 
-    if db_channel in db_category.channels:
-        db_category.channels.remove(db_channel)
 
+async def unassign_channels_from_categories(db: AsyncSession, channel_ids: list[str], category_ids: list[int]) -> int:
+    """
+    Removes every given channel from every given category in one DELETE.
+    Returns the number of memberships removed.
+    """
+    stmt = delete(ChannelCategory).where(
+        ChannelCategory.channel_id == any_(bindparam("channel_ids", channel_ids, type_=ARRAY(String))),
+        ChannelCategory.category_id == any_(bindparam("category_ids", category_ids, type_=ARRAY(Integer))),
+    )
+    result = await db.execute(stmt)
+    if result.rowcount:
+        await mark_categories_stale(db, category_ids)
     await db.commit()
-    await db.refresh(db_category)
-    return db_category
+    return result.rowcount
@@ -6,7 +6,9 @@ from sqlalchemy.orm import selectinload
 
 # Import your models
 from ..models.channel import Channel
-from ..models.category import Category
+from ..models.category import Category, ChannelCategory
+from .crud_counters import mark_categories_stale
+from .filters import text_filter
 # Import your Pydantic schemas (example names)
 from ...schemas.channel import ChannelCreate, ChannelUpdate, ChannelSearchParams
 
@@ -39,11 +41,25 @@ async def get_all_channels(db: AsyncSession) -> list[Channel]:
     result = await db.execute(query)
     return result.scalars().all()
 
+async def get_category_channels(db: AsyncSession, category_id: int) -> list[Channel]:
+    """
+    Return the channels of a category, by title.
+    """
+    query = (
+        select(Channel)
+        .options(selectinload(Channel.categories).lazyload("*"))
+        .join(ChannelCategory, ChannelCategory.channel_id == Channel.id)
+        .where(ChannelCategory.category_id == category_id)
+        .order_by(Channel.title)
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
 async def get_channels(db: AsyncSession, params: ChannelSearchParams) -> list[Channel]:
     """
     Return all channels matching the given search params in the database
     """
-    query = select(Channel).options(selectinload(Channel.categories))  # 🔹 Explicitly load categories
+    query = select(Channel).options(selectinload(Channel.categories).lazyload("*"))  # 🔹 Explicitly load categories, and only them
 
     # If filtering by multiple categories
     if params.categories and len(params.categories) > 0:
@@ -54,7 +70,7 @@ async def get_channels(db: AsyncSession, params: ChannelSearchParams) -> list[Ch
         )
     
     if params.title:
-        query = query.where(Channel.title.ilike(f"%{params.title}%"))
+        query = query.where(text_filter(Channel.title, params.title, params.fuzzy))
 
     if params.order_by == "title":
         query = query.order_by(Channel.title.asc())
@@ -96,5 +112,6 @@ async def delete_channel(db: AsyncSession, channel_id: str) -> None:
     Delete a channel by its ID. 
     All related videos (if cascade='all, delete-orphan' is set) will be deleted automatically.
     """
+    await mark_categories_stale(db, select(ChannelCategory.category_id).where(ChannelCategory.channel_id == channel_id))
     await db.execute(delete(Channel).where(Channel.id == channel_id))
     await db.commit()
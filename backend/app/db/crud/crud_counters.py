@@ -0,0 +1,251 @@
+# crud_counters.py
+#
+# Feeds, channels and categories carry denormalized counters, so lists and
+# the sidebar read them off the row instead of aggregating articles and videos:
+#
+#   feeds       total_articles, unread_articles, favorited_articles
+#   channels    total_videos, favorited_videos
+#   categories  all five, over the distinct articles of the member feeds
+#
+# The write paths keep the feed and channel counters current with deltas, in
+# the same statement or transaction as the change itself. Those writes don't
+# touch the category rows, which many feeds share and which would serialize
+# the refresh workers: they queue the categories in stale_categories, and
+# refresh_category_counters recounts them in a short transaction of its own,
+# on every scheduler tick. reconcile_counters recomputes everything and fixes
+# whatever drifted (concurrent deltas, writes done outside the app).
+from sqlalchemy import CTE, Integer, Select, cast, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.article import Article
+from ..models.category import Category, ChannelCategory, FeedCategory, StaleCategory
+from ..models.channel import Channel
+from ..models.feed import Feed
+from ..models.feed_articles import FeedArticles
+from ..models.video import Video
+
+ARTICLE_COUNTERS = ("total_articles", "unread_articles", "favorited_articles")
+VIDEO_COUNTERS = ("total_videos", "favorited_videos")
+CATEGORY_COUNTERS = ARTICLE_COUNTERS + VIDEO_COUNTERS
+
+
+def _signed(expression, sign: int):
+    return expression if sign > 0 else -expression
+
+
+def article_delta_columns(is_read, is_favorited, sign: int = 1) -> list:
+    """
+    The article counter deltas, as aggregates over a set of articles grouped by feed:
+    sign=1 for articles added to the feed, -1 for articles leaving it.
+    """
+    return [
+        _signed(func.count(), sign).label("total_articles"),
+        _signed(func.count().filter(is_read.is_(False)), sign).label("unread_articles"),
+        _signed(func.count().filter(is_favorited.is_(True)), sign).label("favorited_articles"),
+    ]
+
+
+def video_delta_columns(is_favorited, sign: int = 1) -> list:
+    """The video counter deltas, as aggregates over a set of videos grouped by channel."""
+    return [
+        _signed(func.count(), sign).label("total_videos"),
+        _signed(func.count().filter(is_favorited.is_(True)), sign).label("favorited_videos"),
+    ]
+
+
+def _added(model, deltas, counters: tuple[str, ...]) -> dict:
+    return {name: getattr(model, name) + cast(deltas.c[name], Integer) for name in counters}
+
+
+def _stale_categories_cte(category_column, member_column, member_ids, name: str) -> CTE:
+    """INSERT CTE queueing the categories of the given members in stale_categories."""
+    categories = select(category_column).where(member_column.in_(select(member_ids)))
+    return (
+        insert(StaleCategory)
+        .from_select(["category_id"], categories)
+        .returning(StaleCategory.category_id)
+        .cte(name)
+    )
+
+
+def feed_counter_cte(deltas: CTE) -> CTE:
+    """
+    CTEs adding `deltas` (rows of feed_id and the article counter deltas, see
+    article_delta_columns) to the feeds and queueing the feeds' categories for
+    a recount. Attach the returned CTE to the statement with add_cte().
+    """
+    feeds = (
+        update(Feed)
+        .where(Feed.id == deltas.c.feed_id)
+        # last_updated is about the feed itself, not its articles
+        .values(**_added(Feed, deltas, ARTICLE_COUNTERS), last_updated=Feed.last_updated)
+        .returning(Feed.id)
+        .cte("feed_counters")
+    )
+    return _stale_categories_cte(FeedCategory.category_id, FeedCategory.feed_id, feeds.c.id, "stale_feed_categories")
+
+
+def channel_counter_cte(deltas: CTE) -> CTE:
+    """
+    CTEs adding `deltas` (rows of channel_id and the video counter deltas,
+    see video_delta_columns) to the channels and queueing their categories.
+    """
+    channels = (
+        update(Channel)
+        .where(Channel.id == deltas.c.channel_id)
+        .values(**_added(Channel, deltas, VIDEO_COUNTERS), last_updated=Channel.last_updated)
+        .returning(Channel.id)
+        .cte("channel_counters")
+    )
+    return _stale_categories_cte(ChannelCategory.category_id, ChannelCategory.channel_id, channels.c.id, "stale_channel_categories")
+
+
+async def apply_feed_deltas(db: AsyncSession, deltas: CTE) -> None:
+    """Applies article counter deltas to the feeds. Does not commit."""
+    await db.execute(select(func.count()).select_from(feed_counter_cte(deltas)))
+
+
+async def apply_channel_deltas(db: AsyncSession, deltas: CTE) -> None:
+    """Applies video counter deltas to the channels. Does not commit."""
+    await db.execute(select(func.count()).select_from(channel_counter_cte(deltas)))
+
+
+async def mark_categories_stale(db: AsyncSession, category_ids: list[int] | Select) -> None:
+    """
+    Queues categories for a recount, given as ids or as a SELECT of category ids:
+    for the writes that change memberships. Does not commit.
+    """
+    if isinstance(category_ids, Select):
+        stmt = insert(StaleCategory).from_select(["category_id"], category_ids)
+    elif category_ids:
+        stmt = insert(StaleCategory).values([{"category_id": category_id} for category_id in set(category_ids)])
+    else:
+        return
+    await db.execute(stmt)
+
+
+def _category_counts(*where) -> Select:
+    """
+    The actual counters of the categories matching `where`: an article in several
+    feeds of a category counts once. A video belongs to a single channel.
+    """
+    articles = (
+        select(
+            FeedCategory.category_id,
+            func.count(FeedArticles.article_id.distinct()).label("total_articles"),
+            func.count(FeedArticles.article_id.distinct()).filter(Article.is_read.is_(False)).label("unread_articles"),
+            func.count(FeedArticles.article_id.distinct()).filter(Article.is_favorited.is_(True)).label("favorited_articles"),
+        )
+        .join(FeedArticles, FeedArticles.feed_id == FeedCategory.feed_id)
+        .join(Article, Article.id == FeedArticles.article_id)
+        .where(FeedCategory.category_id.in_(select(Category.id).where(*where)))
+        .group_by(FeedCategory.category_id)
+        .subquery()
+    )
+    videos = (
+        select(ChannelCategory.category_id, *video_delta_columns(Video.is_favorited))
+        .join(Video, Video.channel_id == ChannelCategory.channel_id)
+        .where(ChannelCategory.category_id.in_(select(Category.id).where(*where)))
+        .group_by(ChannelCategory.category_id)
+        .subquery()
+    )
+    return (
+        select(
+            Category.id,
+            *(func.coalesce(articles.c[name], 0).label(name) for name in ARTICLE_COUNTERS),
+            *(func.coalesce(videos.c[name], 0).label(name) for name in VIDEO_COUNTERS),
+        )
+        .outerjoin(articles, articles.c.category_id == Category.id)
+        .outerjoin(videos, videos.c.category_id == Category.id)
+        .where(*where)
+    )
+
+
+async def _recount_categories(db: AsyncSession, *where) -> int:
+    """
+    Writes the actual counters of the categories matching `where` where they differ.
+    Returns the number of categories written. Does not commit.
+    """
+    # Locking the rows in id order first: two recounts of overlapping categories
+    # wait for one another instead of deadlocking. The UPDATE then runs on a
+    # snapshot taken after the lock, so it sees what the other one committed.
+    await db.execute(select(Category.id).where(*where).order_by(Category.id).with_for_update())
+    actual = _category_counts(*where).subquery("actual")
+    result = await db.execute(
+        update(Category)
+        .where(Category.id == actual.c.id, _differs(Category, actual, CATEGORY_COUNTERS))
+        .values(**{name: actual.c[name] for name in CATEGORY_COUNTERS})
+    )
+    return result.rowcount
+
+
+async def refresh_category_counters(db: AsyncSession) -> int:
+    """
+    Recounts the categories queued in stale_categories, in its own short transaction.
+    Queue entries locked by another refresh running at the same time are left to it.
+
+    Returns the number of categories whose counters changed.
+    """
+    claimed = select(StaleCategory.id).with_for_update(skip_locked=True)
+    result = await db.execute(
+        delete(StaleCategory).where(StaleCategory.id.in_(claimed)).returning(StaleCategory.category_id)
+    )
+    category_ids = sorted(set(result.scalars()))
+    refreshed = await _recount_categories(db, Category.id.in_(category_ids)) if category_ids else 0
+    await db.commit()
+    return refreshed
+
+
+def _differs(model, actual, counters: tuple[str, ...]):
+    return or_(*(getattr(model, name) != actual.c[name] for name in counters))
+
+
+async def reconcile_counters(db: AsyncSession) -> dict[str, int]:
+    """
+    Recomputes the feed, channel and category counters from the articles and
+    videos. Only rows that drifted are written.
+
+    A delta committed while this runs can be overwritten by the recount
+    (it's computed from the statement's snapshot); the next run fixes that.
+
+    Returns the number of rows fixed per table.
+    """
+    article_counts = (
+        select(
+            FeedArticles.feed_id,
+            *article_delta_columns(Article.is_read, Article.is_favorited),
+        )
+        .join(Article, Article.id == FeedArticles.article_id)
+        .group_by(FeedArticles.feed_id)
+        .subquery()
+    )
+    feeds_actual = (
+        select(Feed.id, *(func.coalesce(article_counts.c[name], 0).label(name) for name in ARTICLE_COUNTERS))
+        .outerjoin(article_counts, article_counts.c.feed_id == Feed.id)
+        .subquery("actual")
+    )
+    feeds_fixed = await db.execute(
+        update(Feed)
+        .where(Feed.id == feeds_actual.c.id, _differs(Feed, feeds_actual, ARTICLE_COUNTERS))
+        .values(**{name: feeds_actual.c[name] for name in ARTICLE_COUNTERS}, last_updated=Feed.last_updated)
+    )
+
+    video_counts = (
+        select(Video.channel_id, *video_delta_columns(Video.is_favorited))
+        .group_by(Video.channel_id)
+        .subquery()
+    )
+    channels_actual = (
+        select(Channel.id, *(func.coalesce(video_counts.c[name], 0).label(name) for name in VIDEO_COUNTERS))
+        .outerjoin(video_counts, video_counts.c.channel_id == Channel.id)
+        .subquery("actual")
+    )
+    channels_fixed = await db.execute(
+        update(Channel)
+        .where(Channel.id == channels_actual.c.id, _differs(Channel, channels_actual, VIDEO_COUNTERS))
+        .values(**{name: channels_actual.c[name] for name in VIDEO_COUNTERS}, last_updated=Channel.last_updated)
+    )
+    categories_fixed = await _recount_categories(db)
+    await db.commit()
+
+    return {"feeds": feeds_fixed.rowcount, "channels": channels_fixed.rowcount, "categories": categories_fixed}
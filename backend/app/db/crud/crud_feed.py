@@ -1,33 +1,120 @@
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
-from ..models.feed import Feed
+from ..models.feed import Feed, FEED_STATUS_ACTIVE, FEED_STATUS_PARKED, FEED_STATUS_GONE
 from ..models.article import Article
 from ..models.feed_articles import FeedArticles
-from ..models.category import Category
+from ..models.category import Category, FeedCategory
+from .bulk_operations import chunk_by_params
+from .crud_counters import mark_categories_stale
+from .filters import contains, text_filter
 from ...schemas.feed import FeedCreate, FeedUpdate, FeedSearchParams
 
+def _feed_load_options() -> tuple:
+    """
+    How feeds are loaded for the API: with their categories (one extra query for
+    the whole list) and nothing else. Feed.articles is never loaded, and the
+    categories' own collections stay unloaded.
+    """
+    return (selectinload(Feed.categories).lazyload("*"),)
+
 async def create_feed(db: AsyncSession, feed_in: FeedCreate) -> Feed:
-    db_feed: Feed = Feed(**feed_in.model_dump())
+    # Entry links are only stored once the articles are in, see record_feed_fetch
+    db_feed: Feed = Feed(**feed_in.model_dump(exclude={"entry_links"}))
     db.add(db_feed)
     await db.commit()
     await db.refresh(db_feed)
     return db_feed
 
 async def get_feed_by_url(db: AsyncSession, url: str) -> Feed | None:
-    query = select(Feed).where(Feed.url == url)
+    query = select(Feed).options(*_feed_load_options()).where(Feed.url == url)
     result = await db.execute(query)
     return result.scalars().first()
 
+async def get_existing_feed_urls(db: AsyncSession, urls: list[str]) -> set[str]:
+    """
+    Returns which of the given URLs already belong to a feed, in a single query.
+    """
+    if not urls:
+        return set()
+    query = select(Feed.url).where(Feed.url.in_(urls))
+    result = await db.execute(query)
+    return set(result.scalars().all())
+
+async def bulk_create_feeds(db: AsyncSession, feeds: list[dict]) -> dict[str, int]:
+    """
+    Inserts many feeds at once. Feeds whose URL is already taken are skipped.
+
+    Returns a mapping of URL -> id for the feeds that were actually inserted.
+    """
+    created: dict[str, int] = {}
+    for chunk in chunk_by_params(feeds, len(Feed.__table__.columns)):
+        stmt = (
+            pg_insert(Feed)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(Feed.id, Feed.url)
+        )
+        result = await db.execute(stmt)
+        created.update({row.url: row.id for row in result.all()})
+    await db.commit()
+    return created
+
+async def get_feed_outlines(db: AsyncSession) -> list[tuple[str, str, str | None, str | None]]:
+    """
+    Returns (name, url, link, category name) rows for every feed, one row per
+    category the feed belongs to. Only the columns needed for an OPML export are loaded.
+    """
+    query = (
+        select(Feed.name, Feed.url, Feed.link, Category.name.label("category"))
+        .outerjoin(FeedCategory, FeedCategory.feed_id == Feed.id)
+        .outerjoin(Category, Category.id == FeedCategory.category_id)
+        .order_by(Category.name.nulls_first(), Feed.name)
+    )
+    result = await db.execute(query)
+    return [(row.name, row.url, row.link, row.category) for row in result.all()]
+
 async def get_feed_by_id(db: AsyncSession, id: int) -> Feed | None:
-    query = select(Feed).where(Feed.id == id)
+    query = select(Feed).options(*_feed_load_options()).where(Feed.id == id)
     result = await db.execute(query)
     return result.scalars().first()
 
 async def get_all_feeds(db: AsyncSession) -> list[Feed] | None:
-    query = select(Feed)
+    query = select(Feed).options(*_feed_load_options())
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_category_feeds(db: AsyncSession, category_id: int) -> list[Feed]:
+    """
+    Returns the feeds of a category, by name.
+    """
+    query = (
+        select(Feed)
+        .options(*_feed_load_options())
+        .join(FeedCategory, FeedCategory.feed_id == Feed.id)
+        .where(FeedCategory.category_id == category_id)
+        .order_by(Feed.name)
+    )
     result = await db.execute(query)
-    return result.unique().scalars().all()
+    return result.scalars().all()
+
+async def get_all_feed_ids(db: AsyncSession) -> list[int]:
+    query = select(Feed.id)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_feed_schedule(db: AsyncSession, feed_ids: list[int] | None = None) -> list[tuple[int, datetime | None]]:
+    """
+    Returns (feed_id, next_fetch_at) pairs of active feeds, for all feeds or only the given ones.
+    Parked and gone feeds are never scheduled.
+    """
+    query = select(Feed.id, Feed.next_fetch_at).where(Feed.status == FEED_STATUS_ACTIVE)
+    if feed_ids is not None:
+        query = query.where(Feed.id.in_(feed_ids))
+    result = await db.execute(query)
+    return [(row.id, row.next_fetch_at) for row in result.all()]
 
 async def update_feed(db: AsyncSession, feed_id: int, feed_update: FeedUpdate) -> Feed:
     db_feed = await get_feed_by_id(db, feed_id)
@@ -42,11 +129,154 @@ async def update_feed(db: AsyncSession, feed_id: int, feed_update: FeedUpdate) -
     await db.refresh(db_feed)
     return db_feed
 
+async def record_feed_fetch(
+    db: AsyncSession,
+    feed_id: int,
+    not_modified: bool,
+    next_fetch_at: datetime,
+    refresh_interval: int,
+    etag: str | None = None,
+    modified: str | None = None,
+    url: str | None = None,
+    entries_watermark: datetime | None = None,
+    entry_links: list[str] | None = None,
+) -> None:
+    """
+    Records the outcome of a successful conditional fetch on the feed, along with
+    when it should be fetched next. Any failure streak is reset.
+
+    - A 304 only bumps last_checked_at and the not-modified counter.
+    - A full fetch also stores the new ETag / Last-Modified validators.
+    - If the feed permanently moved, its stored URL is rewritten.
+    - The entries watermark only ever moves forward.
+    - The entry links of the document are stored once its articles are in,
+      for the next refresh to skip them (see parse_article_entries).
+    """
+    now = datetime.now(timezone.utc)
+    schedule = {
+        "next_fetch_at": next_fetch_at,
+        "refresh_interval": refresh_interval,
+        "status": FEED_STATUS_ACTIVE,
+        "consecutive_failures": 0,
+    }
+    if url:
+        schedule["url"] = url
+    if entries_watermark:
+        # GREATEST ignores NULLs, so this also works for the first refresh
+        schedule["entries_watermark"] = func.greatest(Feed.entries_watermark, entries_watermark)
+    if entry_links is not None:
+        schedule["entry_links"] = entry_links
+    if not_modified:
+        values = {
+            **schedule,
+            "last_checked_at": now,
+            "not_modified_count": Feed.not_modified_count + 1,
+            # Keep last_updated as is, nothing changed on the feed
+            "last_updated": Feed.last_updated,
+        }
+    else:
+        values = {
+            **schedule,
+            "last_checked_at": now,
+            "full_fetch_count": Feed.full_fetch_count + 1,
+            "etag": etag,
+            "modified": modified,
+            "last_updated": now,
+        }
+
+    await db.execute(update(Feed).where(Feed.id == feed_id).values(**values))
+    await db.commit()
+
+
+async def record_feed_failure(
+    db: AsyncSession,
+    feed_id: int,
+    error: str,
+    next_fetch_at: datetime,
+    park: bool,
+) -> None:
+    """
+    Records a failed fetch: bumps the failure streak, stores the error and
+    pushes the next fetch back. Parked feeds are no longer scheduled.
+    """
+    values = {
+        "consecutive_failures": Feed.consecutive_failures + 1,
+        "last_error": error,
+        "last_error_at": datetime.now(timezone.utc),
+        "next_fetch_at": next_fetch_at,
+        "last_updated": Feed.last_updated,
+    }
+    if park:
+        values["status"] = FEED_STATUS_PARKED
+
+    await db.execute(update(Feed).where(Feed.id == feed_id).values(**values))
+    await db.commit()
+
+
+async def retire_feed(db: AsyncSession, feed_id: int, error: str) -> None:
+    """
+    Marks a feed as gone (410) so it is never fetched again.
+    """
+    values = {
+        "status": FEED_STATUS_GONE,
+        "last_error": error,
+        "last_error_at": datetime.now(timezone.utc),
+        "next_fetch_at": None,
+        "last_updated": Feed.last_updated,
+    }
+    await db.execute(update(Feed).where(Feed.id == feed_id).values(**values))
+    await db.commit()
+
+
+async def record_websub_request(
+    db: AsyncSession, feed_id: int, hub: str, topic: str, secret: str
+) -> None:
+    """
+    Stores the hub, topic and secret of a WebSub subscription request.
+    The lease is only set once the hub verifies our intent.
+    """
+    values = {
+        "websub_hub": hub,
+        "websub_topic": topic,
+        "websub_secret": secret,
+        "websub_requested_at": datetime.now(timezone.utc),
+        "last_updated": Feed.last_updated,
+    }
+    await db.execute(update(Feed).where(Feed.id == feed_id).values(**values))
+    await db.commit()
+
+
+async def record_websub_lease(db: AsyncSession, feed_id: int, lease_expires_at: datetime | None) -> None:
+    """
+    Stores when the verified WebSub lease expires (None once unsubscribed).
+    """
+    values = {
+        "websub_lease_expires_at": lease_expires_at,
+        "last_updated": Feed.last_updated,
+    }
+    await db.execute(update(Feed).where(Feed.id == feed_id).values(**values))
+    await db.commit()
+
+
+async def record_feed_push(db: AsyncSession, feed_id: int, entries_watermark: datetime | None) -> None:
+    """
+    Records content pushed by a WebSub hub. Unlike a fetch, the schedule and
+    the HTTP validators are left alone.
+    """
+    values = {"last_updated": datetime.now(timezone.utc)}
+    if entries_watermark:
+        values["entries_watermark"] = func.greatest(Feed.entries_watermark, entries_watermark)
+    await db.execute(update(Feed).where(Feed.id == feed_id).values(**values))
+    await db.commit()
+
 
 async def delete_feed(db: AsyncSession, feed_id: int) -> None:
     """
     Deletes a feed and any orphaned articles (articles with no associated feeds).
     """
+    # Its categories lose the feed's articles
+    await mark_categories_stale(db, select(FeedCategory.category_id).where(FeedCategory.feed_id == feed_id))
+
     # Delete the feed
     await db.execute(delete(Feed).where(Feed.id == feed_id))
 
@@ -67,7 +297,7 @@ async def delete_feed(db: AsyncSession, feed_id: int) -> None:
 
 async def get_feeds(db: AsyncSession, params: FeedSearchParams) -> list[Feed]:
     # Start with distinct feeds to avoid duplicates if a feed matches multiple categories
-    query = select(Feed).options(selectinload(Feed.categories)).distinct()
+    query = select(Feed).options(*_feed_load_options()).distinct()
 
     # If filtering by multiple categories
     if params.categories and len(params.categories) > 0:
@@ -79,16 +309,16 @@ async def get_feeds(db: AsyncSession, params: FeedSearchParams) -> list[Feed]:
 
     # (Optional) If you want to keep the old single `category` field:
     if params.category:
-        query = query.where(Feed.category.ilike(f"%{params.category}%"))
+        query = query.where(contains(Feed.category, params.category))
 
     if params.name:
-        query = query.where(Feed.name.ilike(f"%{params.name}%"))
+        query = query.where(text_filter(Feed.name, params.name, params.fuzzy))
 
     if params.description:
-        query = query.where(Feed.description.ilike(f"%{params.description}%"))
+        query = query.where(contains(Feed.description, params.description))
 
     if params.author:
-        query = query.where(Feed.author.ilike(f"%{params.author}%"))
+        query = query.where(text_filter(Feed.author, params.author, params.fuzzy))
 
     # Order By
     if params.order_by == "name":
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from typing import Literal
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.feed import Feed
+from ..models.feed_fetch_log import FeedFetchLog
+
+async def record_fetch_log(db: AsyncSession, values: dict) -> None:
+    """
+    Stores one refresh attempt. `values` holds FeedFetchLog columns.
+    """
+    await db.execute(insert(FeedFetchLog).values(**values))
+    await db.commit()
+
+async def purge_fetch_log(db: AsyncSession, older_than: timedelta) -> int:
+    """
+    Deletes log rows older than `older_than`.
+    """
+    stmt = delete(FeedFetchLog).where(FeedFetchLog.fetched_at < func.now() - older_than)
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+def _percentile(fraction: float, column):
+    return func.percentile_cont(fraction).within_group(column)
+
+async def get_fetch_stats(
+    db: AsyncSession, group_by: Literal["feed", "host"], since: datetime, limit: int
+) -> list[dict]:
+    """
+    Aggregates the fetch log since `since`, per feed or per host, slowest first
+    (by p95 of the total fetch time).
+    """
+    metrics = [
+        func.count().label("attempts"),
+        func.count().filter(FeedFetchLog.error.is_not(None)).label("errors"),
+        func.count().filter(FeedFetchLog.not_modified).label("not_modified"),
+        func.coalesce(func.sum(FeedFetchLog.bytes_downloaded), 0).label("bytes_downloaded"),
+        func.coalesce(func.sum(FeedFetchLog.new_items), 0).label("new_items"),
+        func.coalesce(func.sum(FeedFetchLog.updated_items), 0).label("updated_items"),
+        _percentile(0.5, FeedFetchLog.total_ms).label("total_ms_p50"),
+        _percentile(0.95, FeedFetchLog.total_ms).label("total_ms_p95"),
+        _percentile(0.5, FeedFetchLog.connect_ms).label("connect_ms_p50"),
+        _percentile(0.95, FeedFetchLog.connect_ms).label("connect_ms_p95"),
+        _percentile(0.5, FeedFetchLog.ttfb_ms).label("ttfb_ms_p50"),
+        _percentile(0.95, FeedFetchLog.ttfb_ms).label("ttfb_ms_p95"),
+        _percentile(0.5, FeedFetchLog.parse_ms).label("parse_ms_p50"),
+        _percentile(0.95, FeedFetchLog.parse_ms).label("parse_ms_p95"),
+        _percentile(0.5, FeedFetchLog.upsert_ms).label("upsert_ms_p50"),
+        _percentile(0.95, FeedFetchLog.upsert_ms).label("upsert_ms_p95"),
+    ]
+
+    if group_by == "feed":
+        query = (
+            select(FeedFetchLog.feed_id, Feed.name, Feed.url, *metrics)
+            .join(Feed, Feed.id == FeedFetchLog.feed_id)
+            .group_by(FeedFetchLog.feed_id, Feed.name, Feed.url)
+        )
+    else:
+        query = select(FeedFetchLog.host, *metrics).group_by(FeedFetchLog.host)
+
+    query = (
+        query
+        .where(FeedFetchLog.fetched_at >= since)
+        .order_by(_percentile(0.95, FeedFetchLog.total_ms).desc().nulls_last())
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
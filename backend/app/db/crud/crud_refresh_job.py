@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import case, delete, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from ..models.feed import Feed, FEED_STATUS_ACTIVE
+from ..models.refresh_job import (
+    RefreshJob,
+    REFRESH_JOB_PENDING,
+    REFRESH_JOB_RUNNING,
+    REFRESH_JOB_DONE,
+    REFRESH_JOB_FAILED,
+)
+
+ACTIVE_JOB_WHERE = RefreshJob.status.in_([REFRESH_JOB_PENDING, REFRESH_JOB_RUNNING])
+# Literal predicate of the uq_refresh_jobs_active_feed partial index, so
+# ON CONFLICT can infer the index (bound parameters can't be matched)
+ACTIVE_JOB_INDEX_WHERE = text("status IN ('pending', 'running')")
+
+async def enqueue_refresh_jobs(db: AsyncSession, feed_ids: list[int], scheduled: bool = False) -> list[int]:
+    """
+    Queues a refresh for each of the given feeds. Feeds that already have a
+    pending or running job are skipped.
+
+    `scheduled` marks jobs queued because the feeds came due. A feed's existing
+    job is then marked scheduled too, so it isn't throttled like a user's refresh.
+
+    Returns the ids of the jobs that were queued (or marked scheduled).
+    """
+    if not feed_ids:
+        return []
+    stmt = pg_insert(RefreshJob).values([{"feed_id": feed_id, "scheduled": scheduled} for feed_id in feed_ids])
+    if scheduled:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["feed_id"], index_where=ACTIVE_JOB_INDEX_WHERE, set_={"scheduled": True}
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["feed_id"], index_where=ACTIVE_JOB_INDEX_WHERE)
+    stmt = stmt.returning(RefreshJob.id)
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.scalars().all()
+
+async def enqueue_due_feeds(db: AsyncSession, limit: int, hold_for: timedelta) -> list[int]:
+    """
+    Queues a refresh for up to `limit` active feeds whose next_fetch_at has passed
+    (or was never set), most overdue first.
+
+    The feeds' next_fetch_at is pushed `hold_for` into the future, so they aren't
+    picked again while their job waits. The worker stores the real next fetch time.
+    Rows are locked with SKIP LOCKED, so several API processes can run this at once.
+
+    Returns the ids of the queued feeds.
+    """
+    now = datetime.now(timezone.utc)
+    due_query = (
+        select(Feed.id)
+        .where(
+            Feed.status == FEED_STATUS_ACTIVE,
+            or_(Feed.next_fetch_at.is_(None), Feed.next_fetch_at <= now),
+        )
+        .order_by(Feed.next_fetch_at.asc().nulls_first())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    feed_ids = (await db.execute(due_query)).scalars().all()
+    if not feed_ids:
+        await db.commit()
+        return []
+
+    await db.execute(
+        update(Feed)
+        .where(Feed.id.in_(feed_ids))
+        .values(next_fetch_at=now + hold_for, last_updated=Feed.last_updated)
+    )
+    await enqueue_refresh_jobs(db, feed_ids, scheduled=True)
+    return feed_ids
+
+async def claim_refresh_jobs(db: AsyncSession, worker_id: str, limit: int) -> list[tuple[int, int, bool]]:
+    """
+    Claims up to `limit` pending jobs for the given worker.
+
+    FOR UPDATE SKIP LOCKED lets concurrent workers claim disjoint jobs without
+    waiting on each other.
+
+    Returns (job_id, feed_id, scheduled) tuples.
+    """
+    claimable = (
+        select(RefreshJob.id)
+        .where(RefreshJob.status == REFRESH_JOB_PENDING, RefreshJob.run_after <= func.now())
+        .order_by(RefreshJob.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(RefreshJob)
+        .where(RefreshJob.id.in_(claimable.scalar_subquery()))
+        .values(
+            status=REFRESH_JOB_RUNNING,
+            locked_by=worker_id,
+            locked_at=func.now(),
+            attempts=RefreshJob.attempts + 1,
+        )
+        .returning(RefreshJob.id, RefreshJob.feed_id, RefreshJob.scheduled)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return [(row.id, row.feed_id, row.scheduled) for row in result.all()]
+
+async def finish_refresh_job(db: AsyncSession, job_id: int, error: str | None = None) -> None:
+    """
+    Marks a claimed job as done. `error` records why the refresh itself failed,
+    which is tracked (and backed off) on the feed, so the job is not retried.
+    """
+    values = {
+        "status": REFRESH_JOB_DONE,
+        "locked_by": None,
+        "locked_at": None,
+        "finished_at": func.now(),
+        "last_error": error,
+    }
+    await db.execute(update(RefreshJob).where(RefreshJob.id == job_id).values(**values))
+    await db.commit()
+
+async def retry_refresh_job(
+    db: AsyncSession, job_id: int, error: str, max_attempts: int, retry_after: timedelta
+) -> None:
+    """
+    Puts a job that crashed back in the queue after `retry_after`,
+    or marks it failed once it used up its `max_attempts`.
+    """
+    can_retry = RefreshJob.attempts < max_attempts
+    values = {
+        "status": case((can_retry, REFRESH_JOB_PENDING), else_=REFRESH_JOB_FAILED),
+        "run_after": case((can_retry, func.now() + retry_after), else_=RefreshJob.run_after),
+        "finished_at": case((can_retry, None), else_=func.now()),
+        "locked_by": None,
+        "locked_at": None,
+        "last_error": error,
+    }
+    await db.execute(update(RefreshJob).where(RefreshJob.id == job_id).values(**values))
+    await db.commit()
+
+async def requeue_stale_jobs(db: AsyncSession, stale_after: timedelta) -> int:
+    """
+    Puts jobs back in the queue whose worker has held them longer than
+    `stale_after`, most likely because the worker died.
+    """
+    stmt = (
+        update(RefreshJob)
+        .where(
+            RefreshJob.status == REFRESH_JOB_RUNNING,
+            RefreshJob.locked_at < func.now() - stale_after,
+        )
+        .values(status=REFRESH_JOB_PENDING, locked_by=None, locked_at=None)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+async def purge_finished_jobs(db: AsyncSession, older_than: timedelta) -> int:
+    """
+    Deletes done and failed jobs that finished more than `older_than` ago.
+    """
+    stmt = delete(RefreshJob).where(
+        RefreshJob.status.in_([REFRESH_JOB_DONE, REFRESH_JOB_FAILED]),
+        RefreshJob.finished_at < func.now() - older_than,
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+async def get_refresh_job(db: AsyncSession, job_id: int) -> RefreshJob | None:
+    query = select(RefreshJob).where(RefreshJob.id == job_id)
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def get_active_job_for_feed(db: AsyncSession, feed_id: int) -> RefreshJob | None:
+    query = select(RefreshJob).where(RefreshJob.feed_id == feed_id, ACTIVE_JOB_WHERE)
+    result = await db.execute(query)
+    return result.scalars().first()
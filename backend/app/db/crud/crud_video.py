@@ -1,11 +1,20 @@
 # crud_video.py
 
+from datetime import datetime, timezone
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, distinct
+from sqlalchemy import select, delete, func, literal
 from sqlalchemy.orm import aliased
 from sqlalchemy.dialects.postgresql import insert
 
 from ..models.video import Video
+from .bulk_operations import chunk_by_params
+from .copy_loader import copy_to_staging, to_record
+from .counting import count_rows, filter_signature
+from .crud_counters import apply_channel_deltas, channel_counter_cte, video_delta_columns
+from . import text_search
+from .filters import contains, flag_is, text_filter
+from .pagination import decode_cursor, keyset_order, keyset_paginate, next_page_cursor, null_tail
 
 from ...schemas.video import VideoCreate, VideoUpdate, VideoSearchParams
 
@@ -16,26 +25,90 @@ async def create_video(db: AsyncSession, video_in: VideoCreate) -> Video:
     """
     db_video = Video(**video_in.model_dump())
     db.add(db_video)
+    await db.flush()
+    await apply_channel_deltas(db, _video_deltas(db_video.channel_id, 1, int(db_video.is_favorited)))
     await db.commit()
     await db.refresh(db_video)
     return db_video
 
+def _video_deltas(channel_id: str, total: int, favorited: int):
+    """Counter deltas for one channel."""
+    return select(
+        literal(channel_id).label("channel_id"),
+        literal(total).label("total_videos"),
+        literal(favorited).label("favorited_videos"),
+    ).cte("video_deltas")
+
+def _video_row(video_in: VideoCreate, now: datetime) -> dict:
+    """A video's row with the model's defaults spelled out (see _counted_video_insert)."""
+    return {"is_favorited": False, "created_at": now, "last_updated": now, **video_in.model_dump()}
+
+def _counted_video_insert(insert_stmt):
+    """
+    Turns an INSERT .. ON CONFLICT DO NOTHING into videos into a statement that
+    also bumps the counters of the channels by the videos actually inserted,
+    and returns how many that was. The rows must come with every column
+    (see _video_row): SQLAlchemy doesn't reliably fill in Python-side column
+    defaults for an INSERT nested in a CTE next to other DML, and would send
+    NULLs instead.
+    """
+    inserted = insert_stmt.returning(Video.channel_id, Video.is_favorited).cte("inserted")
+    deltas = (
+        select(inserted.c.channel_id, *video_delta_columns(inserted.c.is_favorited))
+        .group_by(inserted.c.channel_id)
+        .cte("video_deltas")
+    )
+    return select(func.count()).select_from(inserted).add_cte(channel_counter_cte(deltas))
+
 async def create_videos(db: AsyncSession, videos_in: list[VideoCreate]) -> None:
     """
-    Bulk create new Video records and avoid duplicates with ON CONFLICT DO NOTHING
+    Bulk create new Video records and avoid duplicates with ON CONFLICT DO NOTHING.
+    Any number of videos can be passed: they're inserted in chunks that stay
+    below the bind parameter limit, each one statement that also updates the
+    channel counters (see _counted_video_insert).
     """
     if not videos_in:
         return
-    
-
-    db_videos = [video_in.model_dump() for video_in in videos_in]
-    stmt = insert(Video).values(db_videos)
-    stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
 
-    await db.execute(stmt)
+    now = datetime.now(timezone.utc)
+    db_videos = [_video_row(video_in, now) for video_in in videos_in]
+    for chunk in chunk_by_params(db_videos, len(Video.__table__.columns)):
+        stmt = _counted_video_insert(insert(Video).values(chunk).on_conflict_do_nothing(index_elements=["id"]))
+        await db.execute(stmt)
     await db.commit()
 
 
+async def copy_videos(db: AsyncSession, videos_in: list[VideoCreate]) -> int:
+    """
+    Bulk loads videos for large backfills: the rows are streamed into a temporary
+    staging table with COPY, then merged into videos with a single
+    INSERT .. SELECT .. ON CONFLICT DO NOTHING, in one transaction.
+
+    Returns the number of videos that were actually inserted.
+    """
+    if not videos_in:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    rows = [_video_row(video_in, now) for video_in in videos_in]
+    columns = list(rows[0])
+    records = [to_record(row, columns) for row in rows]
+    try:
+        staging = await copy_to_staging(db, Video.__table__, columns, records)
+        stmt = _counted_video_insert(
+            insert(Video)
+            .from_select(columns, select(*(staging.c[name] for name in columns)))
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        inserted = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    return inserted
+
+
 async def get_video_by_id(db: AsyncSession, video_id: str) -> Video | None:
     """
     Retrieve a single Video by its YT video ID.
@@ -62,65 +135,106 @@ async def get_all_videos(db: AsyncSession) -> list[Video]:
     result = await db.execute(query)
     return result.scalars().all()
 
-async def get_videos(db: AsyncSession, params: VideoSearchParams) -> tuple[list[Video], int]:
+async def get_videos(
+    db: AsyncSession, params: VideoSearchParams
+) -> tuple[list[Video], int | None, bool, str | None]:
     """
     Retrieve videos matching the given search parameters and return paginated results along with the total count.
-    - Filter by channel_ids, title, description, is_favorited
-    - Order by created_at, last_updated, published_at, or title
-    - Support pagination via limit & offset
+    - Filter by channel_ids, title (typo-tolerant with fuzzy), description, is_favorited
+    - Full-text search title and description with q, adding each video's relevance `rank`
+      and a highlighted `headline`
+    - Order by created_at, last_updated, published_at, title, or relevance (with q only)
+    - Support pagination via limit & offset, or via the keyset cursor returned with the previous page
+    - Count the total as params.count asks (exact, estimated, capped or none, see counting.count_rows)
+    - Returns the videos, the total count, whether that count is approximate,
+      and the cursor to the next page (None on the last page)
+
+    Raises InvalidCursorError if params.cursor is not a valid cursor for params.order_by,
+    and ValueError if ordering by relevance without q.
     """
 
     # Alias to ensure clarity in column selection
     video_alias = aliased(Video)
 
-    # Base query to fetch videos
+    # Base query to fetch videos (the search document is never returned)
     query = select(
-        *[getattr(video_alias, col) for col in Video.__table__.columns.keys()]
+        *[getattr(video_alias, col) for col in Video.__table__.columns.keys() if col != "search_vector"]
     )
 
-    # Base query to count total matching videos (without pagination)
-    total_query = select(func.count(distinct(video_alias.id)))
+    # Matching ids to count the total (without pagination)
+    count_query = select(video_alias.id)
 
     # 1) Apply filters
+    search_rank = None
+    if params.q:
+        ts_query = text_search.web_search_query(params.q)
+        search_rank = text_search.rank(video_alias.search_vector, ts_query)
+        snippet = text_search.headline(func.coalesce(video_alias.description, video_alias.title), ts_query)
+        query = query.add_columns(search_rank.label("rank"), snippet.label("headline"))
+        query = query.where(text_search.matches(video_alias.search_vector, ts_query))
+        count_query = count_query.where(text_search.matches(video_alias.search_vector, ts_query))
+    elif params.order_by == "relevance":
+        raise ValueError("order_by=relevance needs a search query (q).")
+
     if params.channel_ids:
         query = query.where(video_alias.channel_id.in_(params.channel_ids))
-        total_query = total_query.where(video_alias.channel_id.in_(params.channel_ids))
+        count_query = count_query.where(video_alias.channel_id.in_(params.channel_ids))
 
     if params.title:
-        query = query.where(video_alias.title.ilike(f"%{params.title}%"))
-        total_query = total_query.where(video_alias.title.ilike(f"%{params.title}%"))
+        query = query.where(text_filter(video_alias.title, params.title, params.fuzzy))
+        count_query = count_query.where(text_filter(video_alias.title, params.title, params.fuzzy))
 
     if params.description:
-        query = query.where(video_alias.description.ilike(f"%{params.description}%"))
-        total_query = total_query.where(video_alias.description.ilike(f"%{params.description}%"))
+        query = query.where(contains(video_alias.description, params.description))
+        count_query = count_query.where(contains(video_alias.description, params.description))
 
     if params.is_favorited is not None:
-        query = query.where(video_alias.is_favorited == params.is_favorited)
-        total_query = total_query.where(video_alias.is_favorited == params.is_favorited)
-
-    # 2) Sorting based on user preference
-    if params.order_by == "created_at":
-        query = query.order_by(video_alias.created_at.desc())
-    elif params.order_by == "last_updated":
-        query = query.order_by(video_alias.last_updated.desc())
-    elif params.order_by == "published_at":
-        query = query.order_by(video_alias.published_at.desc())
-    elif params.order_by == "title":
-        query = query.order_by(video_alias.title.asc())
+        query = query.where(flag_is(video_alias.is_favorited, params.is_favorited))
+        count_query = count_query.where(flag_is(video_alias.is_favorited, params.is_favorited))
+
+    # 2) Sorting based on user preference (titles A-Z, dates newest first, most relevant first),
+    #    NULLs last and id as tie-breaker
+    if params.order_by == "relevance":
+        sort_column, sort_key = search_rank, "rank"
     else:
-        query = query.order_by(video_alias.published_at.desc())  # Default order
+        sort_column, sort_key = getattr(video_alias, params.order_by), params.order_by
+    descending = params.order_by != "title"
+    query = query.order_by(*keyset_order(sort_column, video_alias.id, descending))
 
-    # 3) Apply Pagination
-    paginated_query = query.limit(params.limit).offset(params.offset)
+    # 3) Apply Pagination: seek past the cursor if there is one, otherwise use offset.
+    #    One extra row is fetched to know whether there is a next page.
+    tail_query = None
+    if params.cursor:
+        cursor_value, cursor_id = decode_cursor(params.cursor, params.order_by, sort_column)
+        tail_query = null_tail(query, sort_column, cursor_value)
+        query = keyset_paginate(query, sort_column, video_alias.id, descending, cursor_value, cursor_id)
+    else:
+        query = query.offset(params.offset)
+    paginated_query = query.limit(params.limit + 1)
 
     # 4) Execute Queries
     result = await db.execute(paginated_query)
-    total_count = await db.scalar(total_query)
+    rows = result.all()
+    if tail_query is not None and len(rows) <= params.limit:
+        # The seek ran out of rows: the page goes on with the NULL sort keys
+        tail = await db.execute(tail_query.limit(params.limit + 1 - len(rows)))
+        rows += tail.all()
+    total_count, approximate = await count_rows(
+        db, count_query, params.count, "videos", filter_signature(params)
+    )
+
+    rows, next_cursor = next_page_cursor(rows, params.limit, params.order_by, sort_key)
 
-    # Convert results to Video objects
-    videos = [Video(**row._asdict()) for row in result]
+    # Convert results to Video objects, with the search rank and snippet when searching
+    videos = []
+    for row in rows:
+        values = row._asdict()
+        rank, snippet = values.pop("rank", None), values.pop("headline", None)
+        video = Video(**values)
+        video.rank, video.headline = rank, snippet
+        videos.append(video)
 
-    return videos, total_count
+    return videos, total_count, approximate, next_cursor
 
 async def update_video(db: AsyncSession, video_id: str, video_update: VideoUpdate) -> Video:
     """
@@ -130,10 +244,14 @@ async def update_video(db: AsyncSession, video_id: str, video_update: VideoUpdat
     if not db_video:
         raise ValueError(f"Video with ID {video_id} does not exist.")
     
+    was_favorited = db_video.is_favorited
     update_data = video_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_video, field, value)
-    
+
+    favorited = int(db_video.is_favorited) - int(was_favorited)
+    if favorited:
+        await apply_channel_deltas(db, _video_deltas(db_video.channel_id, 0, favorited))
     await db.commit()
     await db.refresh(db_video)
     return db_video
@@ -143,5 +261,11 @@ async def delete_video(db: AsyncSession, video_id: str) -> None:
     """
     Delete a single video by its ID.
     """
-    await db.execute(delete(Video).where(Video.id == video_id))
+    deleted = delete(Video).where(Video.id == video_id).returning(Video.channel_id, Video.is_favorited).cte("deleted")
+    deltas = (
+        select(deleted.c.channel_id, *video_delta_columns(deleted.c.is_favorited, sign=-1))
+        .group_by(deleted.c.channel_id)
+        .cte("video_deltas")
+    )
+    await apply_channel_deltas(db, deltas)
     await db.commit()
@@ -0,0 +1,45 @@
+from sqlalchemy import false, func, true
+from sqlalchemy.sql.elements import ColumnElement
+
+# Not a backslash, whose quoting depends on standard_conforming_strings
+LIKE_ESCAPE = "/"
+
+def escape_like(term: str) -> str:
+    """Escapes the LIKE wildcards in a user supplied term, so % and _ match literally."""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+def flag_is(column: ColumnElement[bool], value: bool) -> ColumnElement[bool]:
+    """
+    column = true/false with the boolean written into the SQL rather than bound.
+    With a parameter (column = $1) Postgres can't prove a partial index predicate
+    such as WHERE is_read = false, and won't use the index under a generic plan.
+    """
+    return column == (true() if value else false())
+
+def contains(column: ColumnElement, term: str) -> ColumnElement[bool]:
+    """
+    Case-insensitive substring match, column ILIKE '%term%'.
+    On a column with a trigram (gin_trgm_ops) index this is an index scan
+    for terms of 3 characters or more.
+    """
+    return column.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE)
+
+def similar(column: ColumnElement, term: str) -> ColumnElement[bool]:
+    """
+    Typo-tolerant match: some word sequence of the column is similar enough to the term
+    (pg_trgm word_similarity over pg_trgm.word_similarity_threshold, 0.6 by default).
+    Uses the same trigram index.
+    """
+    return column.op("%>")(term)
+
+def similarity(column: ColumnElement, term: str) -> ColumnElement[float]:
+    """How well the term matches the column, from 0 to 1, to rank fuzzy matches."""
+    return func.word_similarity(term, column)
+
+def text_filter(column: ColumnElement, term: str, fuzzy: bool = False) -> ColumnElement[bool]:
+    """The filter for a text search parameter: similar() when fuzzy, contains() otherwise."""
+    return similar(column, term) if fuzzy else contains(column, term)
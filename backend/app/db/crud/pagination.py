@@ -0,0 +1,105 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+from sqlalchemy import DateTime, Select, and_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidCursorError(ValueError):
+    """The pagination cursor is malformed or was issued for another sort order."""
+    pass
+
+
+def encode_cursor(order_by: str, value: Any, row_id: Any) -> str:
+    """
+    Builds an opaque cursor pointing just past the row with the given sort value and id.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"o": order_by, "v": value, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str, sort_column: InstrumentedAttribute) -> tuple[Any, Any]:
+    """
+    Decodes a cursor made by encode_cursor into its (sort value, id).
+
+    Raises InvalidCursorError if the cursor can't be decoded or belongs to another order_by.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_order_by, value, row_id = payload["o"], payload["v"], payload["i"]
+        if value is not None and isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor.")
+
+    if cursor_order_by != order_by:
+        raise InvalidCursorError("The pagination cursor was issued for another order_by.")
+    return value, row_id
+
+
+def keyset_order(sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, descending: bool) -> list:
+    """
+    The ORDER BY matching keyset_paginate: the sort key with NULLs last, then id as tie-breaker,
+    so every row has a stable position.
+    """
+    if descending:
+        return [sort_column.desc().nulls_last(), id_column.desc()]
+    return [sort_column.asc().nulls_last(), id_column.asc()]
+
+
+def keyset_paginate(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    descending: bool,
+    cursor_value: Any,
+    cursor_id: Any,
+) -> Select:
+    """
+    Restricts the query to the rows after the cursor position (value, id) in
+    keyset_order, so the database seeks straight to the page instead of
+    sorting and skipping every row before it like OFFSET does.
+
+    When the cursor value isn't NULL, the rows with a NULL sort key (which come
+    last) are left out: OR-ing them in would keep Postgres from reading the
+    index as a range. null_tail fetches them once the seek runs out of rows.
+    """
+    if cursor_value is None:
+        # Already among the NULLs, which come last: only the id decides
+        after_id = id_column < cursor_id if descending else id_column > cursor_id
+        return query.where(and_(sort_column.is_(None), after_id))
+
+    row = tuple_(sort_column, id_column)
+    after = row < tuple_(cursor_value, cursor_id) if descending else row > tuple_(cursor_value, cursor_id)
+    return query.where(after)
+
+
+def null_tail(query: Select, sort_column: InstrumentedAttribute, cursor_value: Any) -> Select | None:
+    """
+    The rows with a NULL sort key that keyset_paginate left out for a non-NULL
+    cursor value, to be fetched (in keyset_order) when the page it returned is
+    short. None if there are no such rows to fetch.
+    """
+    if cursor_value is None:
+        return None
+    # Computed sort keys (like a search rank) don't say whether they can be NULL
+    if not getattr(sort_column.expression, "nullable", True):
+        return None
+    return query.where(sort_column.is_(None))
+
+
+def next_page_cursor(rows: list, limit: int, order_by: str, sort_key: str, id_key: str = "id") -> tuple[list, str | None]:
+    """
+    Given up to limit + 1 fetched rows, returns the page (the first `limit` rows)
+    and the cursor to the next page, or None when this was the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(order_by, getattr(last, sort_key), getattr(last, id_key))
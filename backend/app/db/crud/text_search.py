@@ -0,0 +1,28 @@
+from sqlalchemy import REAL, func
+from sqlalchemy.sql.elements import ColumnElement
+
+# Text search configuration of the search_vector columns (see the Article and Video models)
+TS_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+def web_search_query(q: str) -> ColumnElement:
+    """
+    Parses a user query with web search syntax: plain words are ANDed,
+    "quoted phrases", `or` and -excluded words are supported, and it never fails on bad input.
+    """
+    return func.websearch_to_tsquery(TS_CONFIG, q)
+
+def matches(search_vector: ColumnElement, ts_query: ColumnElement) -> ColumnElement[bool]:
+    """vector @@ query, which is answered by the GIN index on the search_vector column."""
+    return search_vector.bool_op("@@")(ts_query)
+
+def rank(search_vector: ColumnElement, ts_query: ColumnElement) -> ColumnElement[float]:
+    """
+    Cover density relevance (how close the matched words are, weighted by the
+    title/body weights of the vector), divided by 1 + log(document length).
+    """
+    return func.ts_rank_cd(search_vector, ts_query, 1, type_=REAL)
+
+def headline(document: ColumnElement, ts_query: ColumnElement) -> ColumnElement[str]:
+    """Fragments of the document around the matches, with the matched words in <mark> tags."""
+    return func.ts_headline(TS_CONFIG, document, ts_query, HEADLINE_OPTIONS)
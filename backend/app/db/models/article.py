@@ -1,12 +1,31 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, ForeignKey, DateTime, ARRAY
+from sqlalchemy import String, Text, ForeignKey, DateTime, ARRAY, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from datetime import datetime, timezone
 from ..base import Base
 
 class Article(Base):
     __tablename__ = 'articles'
-    
+    __table_args__ = (
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        # Sort keys of the article search, in the order crud_article.get_articles uses
+        # (newest first, NULLs last, id as tie-breaker), so pages are read off the index
+        Index("ix_articles_created_at_id", text("created_at DESC NULLS LAST"), text("id DESC")),
+        Index("ix_articles_published_at_id", text("published_at DESC NULLS LAST"), text("id DESC")),
+        Index("ix_articles_updated_at_id", text("updated_at DESC NULLS LAST"), text("id DESC")),
+        Index("ix_articles_last_updated_id", text("last_updated DESC NULLS LAST"), text("id DESC")),
+        # Unread and favorite lists, which only cover part of the table
+        Index(
+            "ix_articles_unread_created_at", text("created_at DESC NULLS LAST"), text("id DESC"),
+            postgresql_where=text("is_read = false"),
+        ),
+        Index(
+            "ix_articles_favorited_created_at", text("created_at DESC NULLS LAST"), text("id DESC"),
+            postgresql_where=text("is_favorited = true"),
+        ),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(nullable=False)
     link: Mapped[str] = mapped_column(unique=True, nullable=False)
@@ -17,9 +36,25 @@ class Article(Base):
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     image_url: Mapped[str | None] = mapped_column(nullable=True)
     categories: Mapped[list[str] | None] = mapped_column(ARRAY(String))
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     is_favorited: Mapped[bool] = mapped_column(default=False)
     is_read: Mapped[bool] = mapped_column(default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False)
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc), nullable=False)
+    # Full-text search document, maintained by Postgres. Deferred so it's never loaded with the article.
+    # Content is capped so that huge pages stay under the tsvector size limit.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+            "setweight(to_tsvector('english', left(coalesce(content, ''), 200000)), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
-    feeds: Mapped[list["Feed"]] = relationship("Feed", secondary="feed_articles", back_populates="articles", lazy="selectin") # type: ignore
+    # Never loaded implicitly, see Feed.articles
+    feeds: Mapped[list["Feed"]] = relationship( # type: ignore
+        "Feed", secondary="feed_articles", back_populates="articles", lazy="raise_on_sql", passive_deletes=True
+    )
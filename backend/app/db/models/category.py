@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import BigInteger, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..base import Base
@@ -6,12 +6,19 @@ from ..base import Base
 
 class FeedCategory(Base):
     __tablename__ = "feed_categories"
+    # The primary key starts with feed_id, this one serves the members of a category
+    __table_args__ = (
+        Index("ix_feed_categories_category_id", "category_id"),
+    )
 
-    feed_id: Mapped[int] = mapped_column(ForeignKey("feeds.id"), primary_key=True)
-    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), primary_key=True)
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feeds.id", ondelete="CASCADE"), primary_key=True)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
 
 class ChannelCategory(Base):
     __tablename__ = "channel_categories"
+    __table_args__ = (
+        Index("ix_channel_categories_category_id", "category_id"),
+    )
 
     channel_id: Mapped[str] = mapped_column(ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True)
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
@@ -19,10 +26,42 @@ class ChannelCategory(Base):
 
 class Category(Base):
     __tablename__ = "categories"
+    # Trigram index for substring (ilike) and similarity search
+    __table_args__ = (
+        Index("ix_categories_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(unique=True, nullable=False)
+    # Denormalized counters over the distinct articles of the member feeds and
+    # the videos of the member channels, recounted from stale_categories
+    # (see crud_counters.refresh_category_counters)
+    total_articles: Mapped[int] = mapped_column(default=0, server_default="0")
+    unread_articles: Mapped[int] = mapped_column(default=0, server_default="0")
+    favorited_articles: Mapped[int] = mapped_column(default=0, server_default="0")
+    total_videos: Mapped[int] = mapped_column(default=0, server_default="0")
+    favorited_videos: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    # Members are never loaded with the category: list them with
+    # crud_category.get_category_feeds / get_category_channels.
+    # Membership rows are removed by ON DELETE CASCADE.
+    feeds: Mapped[list["Feed"]] = relationship( # type: ignore
+        "Feed", secondary="feed_categories", back_populates="categories", lazy="raise_on_sql", passive_deletes=True
+    )
+    channels: Mapped[list["Channel"]] = relationship( # type: ignore
+        "Channel", secondary="channel_categories", back_populates="categories", lazy="raise_on_sql", passive_deletes=True
+    )
+
+
 
-    feeds: Mapped[list["Feed"]] = relationship("Feed", secondary="feed_categories", back_populates="categories", lazy="joined") # type: ignore
-    channels: Mapped[list["Channel"]] = relationship("Channel", secondary="channel_categories", back_populates="categories", lazy="joined") # type: ignore
+class StaleCategory(Base):
+    """
+    A category whose counters need a recount, queued by the writes that change
+    its members' counters or its members. Rows are only ever inserted and then
+    deleted by crud_counters.refresh_category_counters, so queueing a category
+    never waits on another transaction: no unique key, no foreign key.
+    """
+    __tablename__ = "stale_categories"
 
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    category_id: Mapped[int] = mapped_column(nullable=False)
@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import DateTime, Text
+from sqlalchemy import DateTime, Text, Index
 from datetime import datetime, timezone
 from ..base import Base
 
 class Channel(Base):
     __tablename__ = "channels"
+    # Trigram index for substring (ilike) and similarity search
+    __table_args__ = (
+        Index("ix_channels_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
 
     id: Mapped[str] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -14,6 +18,9 @@ class Channel(Base):
     thumbnail_url: Mapped[str | None] = mapped_column(nullable=True)
     category: Mapped[str | None] = mapped_column(nullable=True)
     is_favorited: Mapped[bool] = mapped_column(default=False)
+    # Video counters, maintained by crud_counters (and reconciled periodically)
+    total_videos: Mapped[int] = mapped_column(default=0, server_default="0")
+    favorited_videos: Mapped[int] = mapped_column(default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False)
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc), nullable=False)
 
@@ -23,4 +30,7 @@ class Channel(Base):
         cascade="all, delete-orphan"
     )
 
-    categories: Mapped[list["Category"]] = relationship("Category", secondary="channel_categories", back_populates="channels", lazy="joined") # type: ignore
\ No newline at end of file
+    # A separate query per batch of channels instead of a join that repeats every channel row per category
+    categories: Mapped[list["Category"]] = relationship( # type: ignore
+        "Category", secondary="channel_categories", back_populates="channels", lazy="selectin", passive_deletes=True
+    )
\ No newline at end of file
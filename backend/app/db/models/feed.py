@@ -1,10 +1,23 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import DateTime, Text
+from sqlalchemy import DateTime, String, Text, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime, timezone
 from ..base import Base
 
+FEED_STATUS_ACTIVE = "active"
+FEED_STATUS_PARKED = "parked"  # kept failing, no longer scheduled
+FEED_STATUS_GONE = "gone"  # the server answered 410 Gone
+
 class Feed(Base):
     __tablename__ = "feeds"
+    # Trigram indexes for substring (ilike) and similarity search
+    __table_args__ = (
+        Index("ix_feeds_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_feeds_author_trgm", "author", postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"}),
+        # Sort keys of crud_feed.get_feeds
+        Index("ix_feeds_name", "name"),
+        Index("ix_feeds_created_at", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(nullable=False)
@@ -18,10 +31,36 @@ class Feed(Base):
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc), nullable=False)
     modified: Mapped[str | None] = mapped_column(nullable=True)
     etag: Mapped[str | None] = mapped_column(nullable=True)
+    last_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    not_modified_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    full_fetch_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    next_fetch_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    refresh_interval: Mapped[int | None] = mapped_column(nullable=True)  # seconds
+    status: Mapped[str] = mapped_column(default=FEED_STATUS_ACTIVE, server_default=FEED_STATUS_ACTIVE)
+    consecutive_failures: Mapped[int] = mapped_column(default=0, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_error_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    entries_watermark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Links of the entries of the last ingested document, see parse_article_entries
+    entry_links: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
+    websub_hub: Mapped[str | None] = mapped_column(nullable=True)
+    websub_topic: Mapped[str | None] = mapped_column(nullable=True)
+    websub_secret: Mapped[str | None] = mapped_column(nullable=True)
+    websub_requested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    websub_lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     is_favorited: Mapped[bool] = mapped_column(default=False)
+    # Article counters, maintained by crud_counters (and reconciled periodically)
+    total_articles: Mapped[int] = mapped_column(default=0, server_default="0")
+    unread_articles: Mapped[int] = mapped_column(default=0, server_default="0")
+    favorited_articles: Mapped[int] = mapped_column(default=0, server_default="0")
 
+    # Never loaded implicitly (a feed can have many thousands of articles): query
+    # articles through crud_article instead. feed_articles rows are removed by ON DELETE CASCADE.
     articles: Mapped[list["Article"]] = relationship( # type: ignore
-        "Article", secondary="feed_articles", back_populates="feeds", lazy="selectin"
+        "Article", secondary="feed_articles", back_populates="feeds", lazy="raise_on_sql", passive_deletes=True
     )
 
-    categories: Mapped[list["Category"]] = relationship("Category", secondary="feed_categories", back_populates="feeds", lazy="joined") # type: ignore
\ No newline at end of file
+    # A separate query per batch of feeds instead of a join that repeats every feed row per category
+    categories: Mapped[list["Category"]] = relationship( # type: ignore
+        "Category", secondary="feed_categories", back_populates="feeds", lazy="selectin", passive_deletes=True
+    )
\ No newline at end of file
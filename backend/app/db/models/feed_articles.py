@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..base import Base
@@ -6,6 +6,11 @@ from ..base import Base
 # Define the association table for the many-to-many relationship
 class FeedArticles(Base):
     __tablename__ = "feed_articles"
+    # The primary key starts with feed_id, this one serves lookups by article
+    # (orphan detection, the feeds of an article)
+    __table_args__ = (
+        Index("ix_feed_articles_article_id", "article_id"),
+    )
 
     feed_id: Mapped[int] = mapped_column(ForeignKey("feeds.id", ondelete="CASCADE"), primary_key=True)
     article_id: Mapped[int] = mapped_column(ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, Text
+from sqlalchemy.sql import func
+from datetime import datetime
+from ..base import Base
+
+class FeedFetchLog(Base):
+    """
+    One row per feed refresh attempt, with its timings (in milliseconds), size and outcome.
+    Rows older than feed_fetch_log_retention_days are purged daily.
+    """
+    __tablename__ = "feed_fetch_log"
+    __table_args__ = (
+        Index("ix_feed_fetch_log_feed_id_fetched_at", "feed_id", "fetched_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feeds.id", ondelete="CASCADE"), nullable=False)
+    host: Mapped[str] = mapped_column(nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    status_code: Mapped[int | None] = mapped_column(nullable=True)
+    not_modified: Mapped[bool] = mapped_column(default=False, server_default="false")
+    bytes_downloaded: Mapped[int | None] = mapped_column(nullable=True)
+    connect_ms: Mapped[float | None] = mapped_column(Float, nullable=True)  # includes DNS
+    tls_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ttfb_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    parse_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    upsert_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    new_items: Mapped[int] = mapped_column(default=0, server_default="0")
+    updated_items: Mapped[int] = mapped_column(default=0, server_default="0")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, Index, Text, text
+from sqlalchemy.sql import func
+from datetime import datetime
+from ..base import Base
+
+REFRESH_JOB_PENDING = "pending"
+REFRESH_JOB_RUNNING = "running"
+REFRESH_JOB_DONE = "done"
+REFRESH_JOB_FAILED = "failed"  # gave up after refresh_job_max_attempts
+
+class RefreshJob(Base):
+    """
+    A feed refresh waiting for (or claimed by) a refresh worker.
+    Workers claim jobs with FOR UPDATE SKIP LOCKED, so any number of them can share the queue.
+    """
+    __tablename__ = "refresh_jobs"
+    __table_args__ = (
+        # At most one queued or running job per feed
+        Index(
+            "uq_refresh_jobs_active_feed",
+            "feed_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        Index("ix_refresh_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    feed_id: Mapped[int] = mapped_column(ForeignKey("feeds.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[str] = mapped_column(default=REFRESH_JOB_PENDING, server_default=REFRESH_JOB_PENDING)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Queued by the scheduler because the feed came due, rather than asked for by a user
+    scheduled: Mapped[bool] = mapped_column(default=False, server_default="false")
+    locked_by: Mapped[str | None] = mapped_column(nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
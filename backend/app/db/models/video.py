@@ -1,10 +1,31 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import DateTime, Text, ForeignKey
+from sqlalchemy import DateTime, Text, ForeignKey, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime, timezone
 from ..base import Base
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        Index("ix_videos_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram index for substring (ilike) and similarity search on titles
+        Index("ix_videos_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        # Sort keys of the video search, in the order crud_video.get_videos uses
+        # (dates newest first, titles A-Z, NULLs last, id as tie-breaker)
+        Index("ix_videos_published_at_id", text("published_at DESC NULLS LAST"), text("id DESC")),
+        Index("ix_videos_created_at_id", text("created_at DESC NULLS LAST"), text("id DESC")),
+        Index("ix_videos_last_updated_id", text("last_updated DESC NULLS LAST"), text("id DESC")),
+        Index("ix_videos_title_id", "title", "id"),
+        # A channel's videos, newest first
+        Index(
+            "ix_videos_channel_id_published_at_id", "channel_id", text("published_at DESC NULLS LAST"), text("id DESC")
+        ),
+        # Favorites, which only cover part of the table
+        Index(
+            "ix_videos_favorited_published_at", text("published_at DESC NULLS LAST"), text("id DESC"),
+            postgresql_where=text("is_favorited = true"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -14,6 +35,16 @@ class Video(Base):
     is_favorited: Mapped[bool] = mapped_column(default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False)
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc), nullable=False)
+    # Full-text search document, maintained by Postgres. Deferred so it's never loaded with the video.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     channel_id: Mapped[str] = mapped_column(ForeignKey("channels.id", ondelete="CASCADE"), nullable=False)
 
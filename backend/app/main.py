@@ -9,8 +9,10 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from .core.config import settings
 from .db.session import sessionmanager
-from .routers import articles, feeds, youtube, categories
-from .utils.utils import scheduled_refresh_feeds
+from .routers import articles, feeds, youtube, categories, websub
+from .utils.feedfetch import feed_fetcher
+from .utils.parse_pool import parse_pool
+from .services.feed_scheduler import feed_scheduler
 
 
 logging.basicConfig(stream=sys.stdout, level=logging.DEBUG if settings.debug_logs else logging.INFO)
@@ -27,17 +29,38 @@ async def lifespan(app: FastAPI):
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
     scheduler = AsyncIOScheduler()
+    # Each feed is refreshed on its own adaptive schedule. This job only queues
+    # the ones that are due, the refresh workers (python -m app.worker) run them.
     scheduler.add_job(
-        scheduled_refresh_feeds,
+        feed_scheduler.run_due,
+        "interval",
+        seconds=settings.feed_scheduler_tick_seconds,
+        name="feed_scheduler",
+        max_instances=1,
+        coalesce=True
+    )
+    scheduler.add_job(
+        feed_scheduler.refresh_category_counters,
+        "interval",
+        seconds=settings.feed_scheduler_tick_seconds,
+        name="refresh_category_counters",
+        max_instances=1,
+        coalesce=True
+    )
+    scheduler.add_job(
+        feed_scheduler.purge_fetch_log,
         "cron",
-        hour="0,6,12,18",
-        name="daily_feeds_refresh",
-        misfire_grace_time=3600,
+        hour=3,
+        name="purge_fetch_log",
+        coalesce=True
+    )
+    scheduler.add_job(
+        feed_scheduler.reconcile_counters,
+        "cron",
+        hour=4,
+        name="reconcile_counters",
         coalesce=True
     )
-
-    # job to quickly test scheduled_refresh_feeds
-    # scheduler.add_job(scheduled_refresh_feeds, "interval", minutes=1)
 
 
     scheduler.start()
@@ -46,6 +69,10 @@ async def lifespan(app: FastAPI):
 
     scheduler.shutdown()
 
+    # Close pooled feed connections
+    await feed_fetcher.close()
+    parse_pool.shutdown()
+
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
@@ -64,6 +91,7 @@ app.include_router(feeds.router)
 app.include_router(articles.router)
 app.include_router(youtube.router)
 app.include_router(categories.router)
+app.include_router(websub.router)
 
 @app.get("/")
 async def root():
@@ -12,8 +12,18 @@ router = APIRouter(
 
 @router.get("/search", response_model=ArticleSearchResponse)
 async def get_articles(db_session: DBSessionDep, article_search_query: Annotated[ArticleSearchParams, Query()]):
-    articles, total_count = await crud_article.get_articles(db_session, article_search_query)
-    return ArticleSearchResponse(articles=articles, total_count=total_count)
+    try:
+        articles, total_count, approximate, next_cursor = await crud_article.get_articles(
+            db_session, article_search_query
+        )
+    except ValueError as e:  # includes InvalidCursorError
+        raise HTTPException(status_code=400, detail=str(e))
+    return ArticleSearchResponse(
+        articles=articles,
+        total_count=total_count,
+        total_count_approximate=approximate,
+        next_cursor=next_cursor,
+    )
 
 @router.patch("/{article_id}", response_model=ArticleOut)
 async def update_article(db_session: DBSessionDep, article_id: int, article_update: ArticleUpdate):
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Annotated
-from ..schemas.category import CategoryCreate, CategoryOut, CategoryUpdate, UpdateFeedCategory, UpdateChannelCategory
+from ..schemas.category import (
+    CategoryCreate, CategoryOut, CategorySummaryOut, CategoryUpdate, UpdateFeedCategory, UpdateChannelCategory,
+    BulkFeedCategories, BulkChannelCategories,
+)
+from ..schemas.channel import ChannelOut
+from ..schemas.feed import FeedOut
 from ..dependencies import DBSessionDep
-from ..db.crud import crud_category
+from ..db.crud import crud_category, crud_channel, crud_feed
 
 
 router = APIRouter(
@@ -10,9 +15,21 @@ router = APIRouter(
     tags=["categories"]
 )
 
-@router.get("/", response_model=list[CategoryOut])
-async def get_all_categories(db_session: DBSessionDep):
-    return await crud_category.get_all_categories(db_session)
+@router.get("/", response_model=list[CategorySummaryOut])
+async def get_all_categories(db_session: DBSessionDep, name: str | None = None, fuzzy: bool = False):
+    return await crud_category.get_all_categories(db_session, name, fuzzy)
+
+@router.get("/{category_id}/feeds", response_model=list[FeedOut])
+async def get_category_feeds(db_session: DBSessionDep, category_id: int):
+    if not await crud_category.get_category_by_id(db_session, category_id):
+        raise HTTPException(status_code=404, detail="Category not found.")
+    return await crud_feed.get_category_feeds(db_session, category_id)
+
+@router.get("/{category_id}/channels", response_model=list[ChannelOut])
+async def get_category_channels(db_session: DBSessionDep, category_id: int):
+    if not await crud_category.get_category_by_id(db_session, category_id):
+        raise HTTPException(status_code=404, detail="Category not found.")
+    return await crud_channel.get_category_channels(db_session, category_id)
 
 @router.post("/create", response_model=CategoryOut)
 async def create_category(db_session: DBSessionDep, new_cat: CategoryCreate):
@@ -28,7 +45,10 @@ async def add_feed_to_category(db_session: DBSessionDep, ids: UpdateFeedCategory
     feed_id = ids.feed_id
     category_id = ids.category_id
 
-    await crud_category.add_feed_to_category(db_session, category_id, feed_id)
+    try:
+        await crud_category.add_feed_to_category(db_session, category_id, feed_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return { "message": "added feed to category" }
 
 @router.post("/removeFeed")
@@ -44,7 +64,10 @@ async def add_channel_to_category(db_session: DBSessionDep, ids: UpdateChannelCa
     channel_id = ids.channel_id
     category_id = ids.category_id
 
-    await crud_category.add_channel_to_category(db_session, category_id, channel_id)
+    try:
+        await crud_category.add_channel_to_category(db_session, category_id, channel_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return { "message": "added channel to category" }
 
 @router.post("/removeChannel")
@@ -55,6 +78,26 @@ async def remove_channel_from_category(db_session: DBSessionDep, ids: UpdateChan
     await crud_category.remove_channel_from_category(db_session, category_id, channel_id)
     return { "message": "removed channel from category" }
 
+@router.post("/addFeeds")
+async def add_feeds_to_categories(db_session: DBSessionDep, ids: BulkFeedCategories):
+    added = await crud_category.assign_feeds_to_categories(db_session, ids.feed_ids, ids.category_ids)
+    return { "message": "added feeds to categories", "added": added }
+
+@router.post("/removeFeeds")
+async def remove_feeds_from_categories(db_session: DBSessionDep, ids: BulkFeedCategories):
+    removed = await crud_category.unassign_feeds_from_categories(db_session, ids.feed_ids, ids.category_ids)
+    return { "message": "removed feeds from categories", "removed": removed }
+
+@router.post("/addChannels")
+async def add_channels_to_categories(db_session: DBSessionDep, ids: BulkChannelCategories):
+    added = await crud_category.assign_channels_to_categories(db_session, ids.channel_ids, ids.category_ids)
+    return { "message": "added channels to categories", "added": added }
+
+@router.post("/removeChannels")
+async def remove_channels_from_categories(db_session: DBSessionDep, ids: BulkChannelCategories):
+    removed = await crud_category.unassign_channels_from_categories(db_session, ids.channel_ids, ids.category_ids)
+    return { "message": "removed channels from categories", "removed": removed }
+
 
 
 
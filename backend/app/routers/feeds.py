@@ -1,11 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Annotated
+from fastapi import APIRouter, HTTPException, Query, UploadFile
+from fastapi.responses import Response
+from typing import Annotated, Literal
+from datetime import datetime, timezone, timedelta
 
-from ..schemas.feed import FeedAdd, FeedOut, FeedUpdate, FeedSearchParams
+from ..schemas.feed import FeedAdd, FeedOut, FeedUpdate, FeedSearchParams, OpmlImportReport
+from ..schemas.refresh_job import RefreshJobOut
+from ..schemas.fetch_log import FetchStatsOut
 from ..dependencies import DBSessionDep
-from ..db.crud import crud_feed
-from ..services.feed_service import handle_feed_addition, handle_refresh_feed
-from ..utils.utils import enrich_feeds
+from ..db.crud import crud_feed, crud_fetch_log, crud_refresh_job
+from ..services.feed_service import handle_feed_addition, handle_enqueue_refresh
+from ..services.opml_service import handle_opml_import, handle_opml_export
 
 
 router = APIRouter(
@@ -25,6 +29,32 @@ async def add_new_feed(new_feed: FeedAdd, db_session: DBSessionDep):
     feed = await handle_feed_addition(new_feed, db_session)
     return feed
 
+@router.post("/opml", response_model=OpmlImportReport)
+async def import_opml(file: UploadFile, db_session: DBSessionDep):
+    return await handle_opml_import(await file.read(), db_session)
+
+@router.get("/opml")
+async def export_opml(db_session: DBSessionDep):
+    content = await handle_opml_export(db_session)
+    return Response(
+        content=content,
+        media_type="text/x-opml",
+        headers={"Content-Disposition": 'attachment; filename="feeds.opml"'}
+    )
+
+@router.get("/fetch-stats", response_model=list[FetchStatsOut])
+async def get_fetch_stats(
+    db_session: DBSessionDep,
+    group_by: Literal["feed", "host"] = "feed",
+    hours: Annotated[int, Query(gt=0, le=24 * 90)] = 24,
+    limit: Annotated[int, Query(gt=0, le=500)] = 50,
+):
+    """
+    p50/p95 fetch timings per feed or per host over the last `hours`, slowest (p95) first.
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return await crud_fetch_log.get_fetch_stats(db_session, group_by, since, limit)
+
 @router.get("/search", response_model=list[FeedOut])
 async def get_feeds(db_session: DBSessionDep, feed_search_query: Annotated[FeedSearchParams, Query()]):
     feeds = await crud_feed.get_feeds(db_session, feed_search_query)
@@ -48,6 +78,13 @@ async def delete_feed(feed_id: int, db_session: DBSessionDep):
     await crud_feed.delete_feed(db_session, feed_id)
     return { "message": "feed deleted" }
 
-@router.post("/{feed_id}/refresh")
+@router.post("/{feed_id}/refresh", status_code=202)
 async def refresh_feed_by_id(feed_id: int, db_session: DBSessionDep):
-    return await handle_refresh_feed(feed_id, db_session)
+    return await handle_enqueue_refresh(feed_id, db_session)
+
+@router.get("/refresh-jobs/{job_id}", response_model=RefreshJobOut)
+async def get_refresh_job(job_id: int, db_session: DBSessionDep):
+    job = await crud_refresh_job.get_refresh_job(db_session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Refresh job not found.")
+    return job
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Header, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+from typing import Annotated
+
+from ..core.config import settings
+from ..dependencies import DBSessionDep
+from ..services import websub_service
+
+
+router = APIRouter(
+    prefix="/websub",
+    tags=["websub"]
+)
+
+@router.get("/{feed_id}", response_class=PlainTextResponse)
+async def verify_subscription(
+    feed_id: int,
+    db_session: DBSessionDep,
+    mode: Annotated[str, Query(alias="hub.mode")],
+    topic: Annotated[str, Query(alias="hub.topic")],
+    challenge: Annotated[str, Query(alias="hub.challenge")],
+    lease_seconds: Annotated[int | None, Query(alias="hub.lease_seconds")] = None,
+):
+    return await websub_service.verify_intent(db_session, feed_id, mode, topic, challenge, lease_seconds)
+
+@router.post("/{feed_id}", status_code=202)
+async def receive_push(
+    feed_id: int,
+    request: Request,
+    db_session: DBSessionDep,
+    x_hub_signature: Annotated[str | None, Header()] = None,
+):
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > settings.feed_max_body_bytes:
+            raise HTTPException(status_code=413, detail="Pushed content is too large.")
+
+    await websub_service.handle_push(db_session, feed_id, bytes(body), x_hub_signature)
+    return Response(status_code=202)
@@ -62,10 +62,20 @@ async def refresh_channel_by_id(db_session: DBSessionDep, ytapi: YouTubeAPIDep,
 
 @router.get("/videos/", response_model=VideoSearchResponse)
 async def get_videos(db_session: DBSessionDep, video_search_query: Annotated[VideoSearchParams, Query()]):
-    videos, total_count = await crud_video.get_videos(db_session, video_search_query)
+    try:
+        videos, total_count, approximate, next_cursor = await crud_video.get_videos(
+            db_session, video_search_query
+        )
+    except ValueError as e:  # includes InvalidCursorError
+        raise HTTPException(status_code=400, detail=str(e))
     if not videos:
         return []
-    return VideoSearchResponse(videos=videos, total_count=total_count)
+    return VideoSearchResponse(
+        videos=videos,
+        total_count=total_count,
+        total_count_approximate=approximate,
+        next_cursor=next_cursor,
+    )
 
 @router.patch("/videos/{video_id}", response_model=VideoOut)
 async def update_video_by_id(db_session: DBSessionDep, video_id: str, video_update: VideoUpdate):
@@ -15,7 +15,7 @@ class ArticleBase(BaseSchema):
     updated_at: datetime | None = None
 
 class ArticleCreate(ArticleBase):
-    pass
+    content_hash: str | None = None
 
 class ArticleUpdate(ArticleBase):
     title: str | None = None
@@ -35,6 +35,9 @@ class ArticleOut(ArticleBase):
     is_read: bool
     created_at: datetime
     last_updated: datetime
+    # Only set by searches with q
+    rank: float | None = None
+    headline: str | None = None
 
     model_config = {
         "from_attributes": True
@@ -43,13 +46,18 @@ class ArticleOut(ArticleBase):
 class ArticleSearchParams(BaseModel):
     limit: int = Field(100, gt=0, le=100)
     offset: int = Field(0, ge=0)
+    cursor: str | None = None  # next_cursor of the previous page, replaces offset
+    count: Literal["exact", "estimated", "capped", "none"] = "exact"
     feed_ids: list[int] = []
     title: str | None = None
     author: str | None = None
     is_favorited: bool | None = None
     is_read: bool | None = None
-    order_by: Literal["created_at", "last_updated", "published_at", "updated_at"] = "created_at"
+    q: str | None = None  # full-text search, web search syntax
+    order_by: Literal["created_at", "last_updated", "published_at", "updated_at", "relevance"] = "created_at"
 
 class ArticleSearchResponse(BaseSchema):
     articles: list[ArticleOut]
-    total_count: int
\ No newline at end of file
+    total_count: int | None = None
+    total_count_approximate: bool = False  # estimated, or capped at search_count_cap
+    next_cursor: str | None = None
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from .base import BaseSchema
 
 class CategoryBase(BaseSchema):
@@ -13,6 +13,17 @@ class CategoryUpdate(BaseModel):
 class CategoryOut(CategoryBase):
     id: int
 
+class CategorySummaryOut(CategoryOut):
+    feed_count: int = 0
+    feed_ids: list[int] = []
+    channel_count: int = 0
+    channel_ids: list[str] = []
+    total_articles: int = 0
+    unread_articles: int = 0
+    favorited_articles: int = 0
+    total_videos: int = 0
+    favorited_videos: int = 0
+
 class UpdateFeedCategory(BaseSchema):
     category_id: int
     feed_id: int
@@ -20,4 +31,14 @@ class UpdateFeedCategory(BaseSchema):
 class UpdateChannelCategory(BaseSchema):
     category_id: int
     channel_id: str
+
+class BulkFeedCategories(BaseSchema):
+    """Every feed of feed_ids, in every category of category_ids."""
+    feed_ids: list[int] = Field(min_length=1)
+    category_ids: list[int] = Field(min_length=1)
+
+class BulkChannelCategories(BaseSchema):
+    """Every channel of channel_ids, in every category of category_ids."""
+    channel_ids: list[str] = Field(min_length=1)
+    category_ids: list[int] = Field(min_length=1)
     
\ No newline at end of file
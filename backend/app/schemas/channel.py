@@ -24,6 +24,7 @@ class ChannelOut(ChannelBase):
     last_updated: datetime
     is_favorited: bool
     total_videos: int = 0
+    favorited_videos: int = 0
     categories: list[CategoryOut] = []
 
 class ChannelUpdate(BaseModel):
@@ -33,6 +34,7 @@ class ChannelUpdate(BaseModel):
 
 class ChannelSearchParams(BaseModel):
     title: str | None = None
+    fuzzy: bool = False  # typo-tolerant title matching
     categories: list[str] = []
     order_by: Literal["created_at", "last_updated", "title"] = "title"
     limit: int = Field(100, gt=0, le=100)
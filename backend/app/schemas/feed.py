@@ -25,15 +25,31 @@ class FeedUpdate(BaseModel):
     is_favorited: bool | None = None
 
 class FeedCreate(FeedBase):
-    pass
+    entries_watermark: datetime | None = None
+    entry_links: list[str] | None = None
+    websub_hub: str | None = None
+    websub_topic: str | None = None
 
 class FeedOut(FeedBase):
     id: int
     created_at: datetime
     last_updated: datetime
     total_articles: int = 0
+    unread_articles: int = 0
+    favorited_articles: int = 0
     categories: list[CategoryOut] = []
     is_favorited: bool
+    last_checked_at: datetime | None = None
+    not_modified_count: int = 0
+    full_fetch_count: int = 0
+    next_fetch_at: datetime | None = None
+    refresh_interval: int | None = None
+    status: str = "active"
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    last_error_at: datetime | None = None
+    websub_hub: str | None = None
+    websub_lease_expires_at: datetime | None = None
 
     model_config = {
         "from_attributes": True
@@ -45,6 +61,22 @@ class FeedSearchParams(BaseModel):
     categories: list[str] = []
     description: str | None = None
     author: str | None = None
+    fuzzy: bool = False  # typo-tolerant name and author matching
     order_by: Literal["created_at", "last_updated", "name"] = "name"
     limit: int = Field(100, gt=0, le=100)
-    offset: int = Field(0, ge=0)
\ No newline at end of file
+    offset: int = Field(0, ge=0)
+
+class OpmlImportResult(BaseModel):
+    url: str
+    status: Literal["added", "exists", "duplicate", "failed"]
+    feed_id: int | None = None
+    articles: int = 0
+    detail: str | None = None
+
+class OpmlImportReport(BaseModel):
+    added: int = 0
+    exists: int = 0
+    duplicate: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    results: list[OpmlImportResult] = []
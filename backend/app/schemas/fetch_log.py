@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+class FetchStatsOut(BaseModel):
+    feed_id: int | None = None
+    name: str | None = None
+    url: str | None = None
+    host: str | None = None
+    attempts: int
+    errors: int
+    not_modified: int
+    bytes_downloaded: int
+    new_items: int
+    updated_items: int
+    total_ms_p50: float | None = None
+    total_ms_p95: float | None = None
+    connect_ms_p50: float | None = None
+    connect_ms_p95: float | None = None
+    ttfb_ms_p50: float | None = None
+    ttfb_ms_p95: float | None = None
+    parse_ms_p50: float | None = None
+    parse_ms_p95: float | None = None
+    upsert_ms_p50: float | None = None
+    upsert_ms_p95: float | None = None
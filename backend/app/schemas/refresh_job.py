@@ -0,0 +1,12 @@
+from datetime import datetime
+from .base import BaseSchema
+
+class RefreshJobOut(BaseSchema):
+    id: int
+    feed_id: int
+    status: str
+    run_after: datetime
+    attempts: int
+    created_at: datetime
+    finished_at: datetime | None = None
+    last_error: str | None = None
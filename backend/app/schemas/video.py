@@ -18,6 +18,9 @@ class VideoOut(VideoBase):
     created_at: datetime
     last_updated: datetime
     is_favorited: bool
+    # Only set by searches with q
+    rank: float | None = None
+    headline: str | None = None
 
 class VideoUpdate(BaseModel):
     title: str | None = None
@@ -27,12 +30,18 @@ class VideoUpdate(BaseModel):
 class VideoSearchParams(BaseModel):
     channel_ids: list[str] = []
     title: str | None = None
+    fuzzy: bool = False  # typo-tolerant title matching
     description: str | None = None
     is_favorited: bool | None = None
-    order_by: Literal["created_at", "last_updated", "published_at", "title"] = "published_at"
+    q: str | None = None  # full-text search, web search syntax
+    order_by: Literal["created_at", "last_updated", "published_at", "title", "relevance"] = "published_at"
     limit: int = Field(100, gt=0, le=100)
     offset: int = Field(0, ge=0)
+    cursor: str | None = None  # next_cursor of the previous page, replaces offset
+    count: Literal["exact", "estimated", "capped", "none"] = "exact"
 
 class VideoSearchResponse(BaseSchema):
     videos: list[VideoOut]
-    total_count: int
\ No newline at end of file
+    total_count: int | None = None
+    total_count_approximate: bool = False  # estimated, or capped at search_count_cap
+    next_cursor: str | None = None
\ No newline at end of file
@@ -0,0 +1,66 @@
+# app/services/feed_scheduler.py
+import logging
+from datetime import timedelta
+
+from ..core.config import settings
+from ..db.crud import crud_counters, crud_fetch_log, crud_refresh_job
+from ..db.session import sessionmanager
+
+logger = logging.getLogger(__name__)
+
+class FeedScheduler:
+    """
+    Refreshes every feed on its own schedule instead of all at once.
+
+    Each tick queues a refresh job for the feeds whose next_fetch_at has passed
+    (found through the next_fetch_at index). The refresh itself runs in the
+    refresh workers (python -m app.worker), which store the next_fetch_at that
+    the refresh computed. Since the schedule lives in the database, any number
+    of API processes can run the scheduler side by side.
+    """
+
+    async def run_due(self):
+        """
+        Queues the feeds that are due. Meant to be called periodically.
+        """
+        # Due feeds are held for the minimum interval while they wait for a worker.
+        # Feeds that failed or were skipped come back after that.
+        hold_for = timedelta(minutes=settings.feed_min_refresh_minutes)
+        async with sessionmanager.session() as db_session:
+            due = await crud_refresh_job.enqueue_due_feeds(
+                db_session, settings.feed_scheduler_batch_size, hold_for
+            )
+
+        if due:
+            logger.info("Queued refresh jobs for %d due feeds", len(due))
+
+    async def refresh_category_counters(self):
+        """
+        Recounts the categories whose members changed since the last run.
+        Meant to be called periodically, outside of the writes that queued them.
+        """
+        async with sessionmanager.session() as db_session:
+            await crud_counters.refresh_category_counters(db_session)
+
+    async def purge_fetch_log(self):
+        """
+        Deletes fetch telemetry older than feed_fetch_log_retention_days. Meant to run daily.
+        """
+        async with sessionmanager.session() as db_session:
+            purged = await crud_fetch_log.purge_fetch_log(
+                db_session, timedelta(days=settings.feed_fetch_log_retention_days)
+            )
+        logger.info("Purged %d fetch log rows", purged)
+
+    async def reconcile_counters(self):
+        """
+        Recomputes the feed, channel and category counters and fixes any drift
+        from the incremental updates. Meant to run daily.
+        """
+        async with sessionmanager.session() as db_session:
+            fixed = await crud_counters.reconcile_counters(db_session)
+        if any(fixed.values()):
+            logger.warning("Fixed drifted counters of %s", fixed)
+
+
+feed_scheduler = FeedScheduler()
@@ -1,12 +1,71 @@
 # app/services/feed_service.py
+import logging
+import random
+import statistics
+import time
+import httpx
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone, timedelta
+from urllib.parse import urlsplit
 
+from ..core.config import settings
+from ..utils.feedfetch import FetchStats, normalize_url
 from ..utils.feedparse import parse_feed
-from ..db.crud import crud_feed, crud_article, bulk_operations
+from ..db.crud import crud_feed, crud_article, crud_fetch_log, crud_refresh_job, bulk_operations
+from ..db.models.feed import FEED_STATUS_GONE
 from ..schemas.feed import FeedAdd, FeedOut, FeedCreate
 from ..schemas.article import ArticleCreate, ArticleUpdate
+from ..schemas.refresh_job import RefreshJobOut
+from . import websub_service
+
+logger = logging.getLogger(__name__)
+
+def compute_refresh_interval(
+    published_times: list[datetime], previous_interval: int | None, has_new_articles: bool
+) -> int:
+    """
+    Estimates how often a feed should be polled, in seconds.
+
+    - When new articles came in, the interval follows the feed's publishing
+      cadence (median gap between its most recent entries).
+    - When nothing new came in, the previous interval is stretched by 50%.
+    - The result is clamped to [feed_min_refresh_minutes, feed_max_refresh_minutes].
+    """
+    min_interval = settings.feed_min_refresh_minutes * 60
+    max_interval = settings.feed_max_refresh_minutes * 60
+    interval = previous_interval or settings.feed_default_refresh_minutes * 60
+
+    if not has_new_articles:
+        interval = int(interval * 1.5)
+    else:
+        recent = sorted(published_times, reverse=True)[:20]
+        gaps = [
+            (newer - older).total_seconds()
+            for newer, older in zip(recent, recent[1:])
+            if newer > older
+        ]
+        if gaps:
+            interval = int(statistics.median(gaps))
+
+    return max(min_interval, min(interval, max_interval))
+
+def compute_next_fetch_at(refresh_interval: int) -> datetime:
+    """
+    Schedules the next fetch one interval from now, with random jitter so feeds
+    polled at the same cadence don't all come due at the same moment.
+    """
+    jitter = refresh_interval * settings.feed_refresh_jitter
+    delay = refresh_interval + random.uniform(-jitter, jitter)
+    return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+def compute_backoff(consecutive_failures: int) -> int:
+    """
+    Exponential backoff in seconds after the given number of consecutive failures,
+    capped at feed_max_backoff_minutes.
+    """
+    backoff = settings.feed_failure_backoff_minutes * 60 * 2 ** max(consecutive_failures - 1, 0)
+    return min(backoff, settings.feed_max_backoff_minutes * 60)
 
 async def handle_feed_addition(new_feed: FeedAdd, db_session: AsyncSession) -> FeedOut:
     """
@@ -21,12 +80,11 @@ async def handle_feed_addition(new_feed: FeedAdd, db_session: AsyncSession) -> F
 
     # Parse feed and articles
     try:
-        parsed_feed, parsed_articles = parse_feed(url)
+        parsed_feed, parsed_articles = await parse_feed(url)
         if not parsed_feed:
             raise ValueError("error adding feed")
-    except ValueError as e:
-        print("here")
-        print(e)
+    except (ValueError, httpx.HTTPError) as e:
+        logger.info("Could not add feed %s: %s", url, e)
         raise HTTPException(status_code=400, detail=str(e))
 
     # Add category
@@ -36,33 +94,172 @@ async def handle_feed_addition(new_feed: FeedAdd, db_session: AsyncSession) -> F
     new_feed_data = await crud_feed.create_feed(db_session, feed_create)
     result = await bulk_operations.bulk_associate_articles_with_feed(db_session, new_feed_data.id, parsed_articles)
 
-    print(result)
+    logger.info("Added feed %s: %s", url, result)
+
+    # Schedule the first refresh based on how often the feed publishes
+    refresh_interval = compute_refresh_interval(
+        [a.published_at for a in parsed_articles if a.published_at], None, True
+    )
+    await crud_feed.record_feed_fetch(
+        db_session,
+        new_feed_data.id,
+        not_modified=False,
+        next_fetch_at=compute_next_fetch_at(refresh_interval),
+        refresh_interval=refresh_interval,
+        etag=parsed_feed.etag,
+        modified=parsed_feed.modified,
+        entries_watermark=parsed_feed.entries_watermark,
+        entry_links=parsed_feed.entry_links,
+    )
+    await db_session.refresh(new_feed_data)
+    await websub_service.ensure_subscription(db_session, new_feed_data, parsed_feed)
+    await db_session.refresh(new_feed_data)
 
     return FeedOut.model_validate(new_feed_data)
 
-async def handle_refresh_feed(feed_id: int, db_session: AsyncSession):
+async def record_refresh_failure(
+    db_session: AsyncSession, feed_id: int, previous_failures: int, error: str
+) -> None:
+    """
+    Backs the feed off exponentially and parks it once it failed
+    feed_park_after_failures times in a row.
+    """
+    failures = previous_failures + 1
+    park = failures >= settings.feed_park_after_failures
+    await crud_feed.record_feed_failure(
+        db_session,
+        feed_id,
+        error=error,
+        next_fetch_at=compute_next_fetch_at(compute_backoff(failures)),
+        park=park,
+    )
+    if park:
+        logger.warning("Parking feed %s after %d consecutive failures: %s", feed_id, failures, error)
+
+async def record_fetch_attempt(
+    db_session: AsyncSession,
+    feed_id: int,
+    url: str,
+    stats: FetchStats,
+    upsert_ms: float | None = None,
+    result: dict | None = None,
+    error: str | None = None,
+) -> None:
+    """
+    Writes the telemetry of one refresh attempt to the fetch log.
+    """
+    await crud_fetch_log.record_fetch_log(db_session, {
+        "feed_id": feed_id,
+        "host": urlsplit(url).netloc.lower(),
+        "status_code": stats.status_code,
+        "not_modified": stats.not_modified,
+        "bytes_downloaded": stats.bytes_downloaded,
+        "connect_ms": stats.connect_ms,
+        "tls_ms": stats.tls_ms,
+        "ttfb_ms": stats.ttfb_ms,
+        "total_ms": stats.total_ms,
+        "parse_ms": stats.parse_ms,
+        "upsert_ms": upsert_ms,
+        "new_items": result["new_articles_count"] if result else 0,
+        "updated_items": result["updated_articles_count"] if result else 0,
+        "error": error,
+    })
+
+async def handle_refresh_feed(feed_id: int, db_session: AsyncSession, scheduled: bool = False):
+    """
+    Fetches the feed and stores its new and updated articles.
+
+    Refreshes asked for by a user are skipped when the feed was checked less than
+    feed_min_refresh_minutes ago. Scheduled refreshes (the feed came due) always
+    fetch: the jitter on next_fetch_at can bring a feed due a little earlier, and
+    skipping it would leave it marked done without a fetch or a new next_fetch_at.
+    """
     feed = await crud_feed.get_feed_by_id(db_session, feed_id)
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found.")
+    if feed.status == FEED_STATUS_GONE:
+        raise HTTPException(status_code=410, detail="Feed is gone, it will no longer be refreshed.")
     now = datetime.now(timezone.utc)
-    if (now - feed.last_updated) < timedelta(hours=1):
+    last_checked = feed.last_checked_at or feed.last_updated
+    if not scheduled and (now - last_checked) < timedelta(minutes=settings.feed_min_refresh_minutes):
         return {
             "message": "Feed recently updated. No need to refresh."
         }
 
+    stats = FetchStats()
     try:
-        parsed_feed, parsed_articles = parse_feed(feed.url, feed.etag, feed.modified)
-        if not parsed_feed:
-            return {
-                "message": "Feed has no updates",
-                "feed": feed.url,
-                "new_articles": 0,
-                "updated_articles": 0
-            }
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    
+        parsed_feed, parsed_articles = await parse_feed(
+            feed.url, feed.etag, feed.modified, feed.entries_watermark, feed.entry_links, stats=stats
+        )
+    except (ValueError, httpx.HTTPError) as e:
+        # Timeouts often have an empty message
+        error = str(e) or type(e).__name__
+        await record_fetch_attempt(db_session, feed_id, feed.url, stats, error=error)
+        if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 410:
+            await crud_feed.retire_feed(db_session, feed_id, error)
+            raise HTTPException(status_code=410, detail="Feed is gone, it will no longer be refreshed.")
+        await record_refresh_failure(db_session, feed_id, feed.consecutive_failures, error)
+        raise HTTPException(status_code=400, detail=error)
+
+    if not parsed_feed:
+        # 304 Not Modified: nothing to parse or upsert
+        await record_fetch_attempt(db_session, feed_id, feed.url, stats)
+        refresh_interval = compute_refresh_interval([], feed.refresh_interval, False)
+        if websub_service.has_active_lease(feed):
+            refresh_interval = max(refresh_interval, settings.websub_fallback_refresh_minutes * 60)
+        await crud_feed.record_feed_fetch(
+            db_session,
+            feed_id,
+            not_modified=True,
+            next_fetch_at=compute_next_fetch_at(refresh_interval),
+            refresh_interval=refresh_interval,
+        )
+        return {
+            "message": "Feed has no updates",
+            "feed": feed.url,
+            "new_articles": 0,
+            "updated_articles": 0
+        }
+
+    # Follow permanent redirects, unless another feed already uses the new URL.
+    # The URLs are compared normalized: parse_feed's URL went through pydantic,
+    # which lowercases the host and adds a slash to a bare host, for instance.
+    new_url = str(parsed_feed.url)
+    if normalize_url(new_url) == normalize_url(feed.url) or await crud_feed.get_feed_by_url(db_session, new_url):
+        new_url = None
+    else:
+        logger.info("Feed %s moved from %s to %s", feed_id, feed.url, new_url)
+
+    upsert_start = time.perf_counter()
     response = await bulk_operations.bulk_associate_articles_with_feed(db_session, feed_id, parsed_articles)
+    upsert_ms = (time.perf_counter() - upsert_start) * 1000
+    await record_fetch_attempt(db_session, feed_id, feed.url, stats, upsert_ms, response)
+    # Known entries up to the watermark were skipped, so the previous
+    # watermark stands in for the newest entry we already had
+    published_times = [a.published_at for a in parsed_articles if a.published_at]
+    if feed.entries_watermark:
+        published_times.append(feed.entries_watermark)
+    refresh_interval = compute_refresh_interval(
+        published_times,
+        feed.refresh_interval,
+        response["new_articles_count"] > 0,
+    )
+    if websub_service.has_active_lease(feed):
+        # The hub pushes new content, polling is only a slow safety net
+        refresh_interval = max(refresh_interval, settings.websub_fallback_refresh_minutes * 60)
+    await crud_feed.record_feed_fetch(
+        db_session,
+        feed_id,
+        not_modified=False,
+        next_fetch_at=compute_next_fetch_at(refresh_interval),
+        refresh_interval=refresh_interval,
+        etag=parsed_feed.etag,
+        modified=parsed_feed.modified,
+        url=new_url,
+        entries_watermark=parsed_feed.entries_watermark,
+        entry_links=parsed_feed.entry_links,
+    )
+    await websub_service.ensure_subscription(db_session, feed, parsed_feed)
     
     return {
         "message": "Feed refreshed successfully.",
@@ -70,25 +267,32 @@ async def handle_refresh_feed(feed_id: int, db_session: AsyncSession):
         "response": response
     }
 
-async def handle_refresh_all_feeds(db_session: AsyncSession):
-    """Handles refreshing all subscribed RSS Feeds"""
-    feeds = await crud_feed.get_all_feeds(db_session)
-
-    results = []
-    for feed in feeds:
-        try:
-            refresh_result = await handle_refresh_feed(feed.id, db_session)
-            results.append(refresh_result)
-        except HTTPException as e:
-            results.append({
-                "feed": feed.url,
-                "message": str(e)
-            })
-    
+async def handle_enqueue_refresh(feed_id: int, db_session: AsyncSession) -> dict:
+    """
+    Queues a refresh of the feed for the refresh workers.
+    If the feed already has a queued or running refresh, that one is returned.
+    """
+    feed = await crud_feed.get_feed_by_id(db_session, feed_id)
+    if not feed:
+        raise HTTPException(status_code=404, detail="Feed not found.")
+    if feed.status == FEED_STATUS_GONE:
+        raise HTTPException(status_code=410, detail="Feed is gone, it will no longer be refreshed.")
+
+    await crud_refresh_job.enqueue_refresh_jobs(db_session, [feed_id])
+    job = await crud_refresh_job.get_active_job_for_feed(db_session, feed_id)
+
     return {
-        "message": "feeds refreshed",
-        "results": results
+        "message": "Feed refresh queued.",
+        "feed": feed_id,
+        "job": RefreshJobOut.model_validate(job) if job else None,
     }
-  
 
+async def handle_refresh_all_feeds(db_session: AsyncSession):
+    """Queues a refresh of all subscribed RSS Feeds"""
+    feed_ids = await crud_feed.get_all_feed_ids(db_session)
+    job_ids = await crud_refresh_job.enqueue_refresh_jobs(db_session, feed_ids)
 
+    return {
+        "message": "feed refreshes queued",
+        "queued": len(job_ids),
+    }
@@ -0,0 +1,172 @@
+# app/services/opml_service.py
+import asyncio
+import logging
+import time
+import httpx
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+
+from ..core.config import settings
+from ..db.crud import crud_feed, crud_category, bulk_operations
+from ..schemas.article import ArticleCreate
+from ..schemas.feed import FeedCreate, OpmlImportReport, OpmlImportResult
+from ..utils.feedparse import parse_feed
+from ..utils.opml import OpmlOutline, build_opml, parse_opml
+from .feed_service import compute_refresh_interval, compute_next_fetch_at
+
+logger = logging.getLogger(__name__)
+
+async def fetch_outlines(
+    outlines: list[OpmlOutline],
+) -> list[tuple[OpmlOutline, FeedCreate | None, list[ArticleCreate], str | None]]:
+    """
+    Downloads and parses the given feeds concurrently, at most
+    `feed_fetch_concurrency` at a time (per-host limits are enforced by the fetcher).
+
+    Returns (outline, parsed feed, parsed articles, error) for every outline.
+    """
+    semaphore = asyncio.Semaphore(settings.feed_fetch_concurrency)
+
+    async def fetch_one(outline: OpmlOutline):
+        async with semaphore:
+            try:
+                parsed_feed, parsed_articles = await parse_feed(outline.url)
+                if not parsed_feed:
+                    raise ValueError("error adding feed")
+                return outline, parsed_feed, parsed_articles, None
+            except (ValueError, httpx.HTTPError) as e:
+                return outline, None, [], str(e) or type(e).__name__
+
+    return await asyncio.gather(*(fetch_one(outline) for outline in outlines))
+
+async def handle_opml_import(content: bytes, db_session: AsyncSession) -> OpmlImportReport:
+    """
+    Imports every feed of an OPML document.
+
+    - All URLs are checked against the existing feeds in one query.
+    - New feeds are fetched and parsed concurrently.
+    - Feeds and categories are then written in large batches, and the articles
+      of all feeds are bulk loaded with COPY, instead of one feed (and several
+      commits) at a time.
+
+    Returns an outcome per URL, in the order of the document.
+    """
+    try:
+        outlines = parse_opml(content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    start = time.perf_counter()
+    results: dict[str, OpmlImportResult] = {}
+    report = OpmlImportReport()
+
+    # Skip URLs listed twice in the document and feeds we already have
+    unique_outlines: dict[str, OpmlOutline] = {}
+    duplicates: list[OpmlOutline] = []
+    for outline in outlines:
+        if outline.url in unique_outlines:
+            duplicates.append(outline)
+        else:
+            unique_outlines[outline.url] = outline
+
+    existing_urls = await crud_feed.get_existing_feed_urls(db_session, list(unique_outlines))
+    for url in existing_urls:
+        results[url] = OpmlImportResult(url=url, status="exists")
+
+    to_fetch = [outline for url, outline in unique_outlines.items() if url not in existing_urls]
+    fetched = await fetch_outlines(to_fetch)
+
+    # Build the feed rows, scheduled like a feed added on its own
+    now = datetime.now(timezone.utc)
+    feed_rows: list[dict] = []
+    parsed_by_url: dict[str, tuple[OpmlOutline, list[ArticleCreate]]] = {}
+    for outline, parsed_feed, parsed_articles, error in fetched:
+        if parsed_feed is None:
+            results[outline.url] = OpmlImportResult(url=outline.url, status="failed", detail=error)
+            continue
+
+        feed_url = str(parsed_feed.url)
+        if feed_url in parsed_by_url:
+            # Two URLs of the document redirect to the same feed
+            results[outline.url] = OpmlImportResult(url=outline.url, status="duplicate")
+            continue
+        parsed_by_url[feed_url] = (outline, parsed_articles)
+
+        refresh_interval = compute_refresh_interval(
+            [a.published_at for a in parsed_articles if a.published_at], None, True
+        )
+        feed_create = FeedCreate(category=outline.category, **parsed_feed.model_dump(exclude="category"))
+        if parsed_feed.name == "Unknown Feed" and outline.title:
+            feed_create.name = outline.title
+        feed_rows.append({
+            **feed_create.model_dump(exclude={"websub_hub", "websub_topic", "entry_links"}),
+            "link": outline.html_url,
+            "created_at": now,
+            "last_updated": now,
+            "last_checked_at": now,
+            "full_fetch_count": 1,
+            "refresh_interval": refresh_interval,
+            "next_fetch_at": compute_next_fetch_at(refresh_interval),
+        })
+
+    created = await crud_feed.bulk_create_feeds(db_session, feed_rows)
+
+    # Categories and memberships
+    category_ids = await crud_category.get_or_create_categories(
+        db_session,
+        [outline.category for url, (outline, _) in parsed_by_url.items() if url in created and outline.category],
+    )
+    await crud_category.bulk_add_feeds_to_categories(
+        db_session,
+        [
+            (created[url], category_ids[outline.category])
+            for url, (outline, _) in parsed_by_url.items()
+            if url in created and outline.category
+        ],
+    )
+
+    # Articles of all new feeds, bulk loaded with COPY
+    articles_by_feed = {
+        created[url]: parsed_articles
+        for url, (_, parsed_articles) in parsed_by_url.items()
+        if url in created
+    }
+    articles_result = await bulk_operations.copy_associate_articles_with_feeds(db_session, articles_by_feed)
+    logger.info("OPML import stored articles: %s", articles_result)
+
+    for feed_url, (outline, parsed_articles) in parsed_by_url.items():
+        if feed_url in created:
+            results[outline.url] = OpmlImportResult(
+                url=outline.url,
+                status="added",
+                feed_id=created[feed_url],
+                articles=len(parsed_articles),
+            )
+        else:
+            # Redirected to a feed that already exists (or was added meanwhile)
+            results[outline.url] = OpmlImportResult(url=outline.url, status="exists")
+
+    ordered = [results[url] for url in unique_outlines]
+    ordered += [OpmlImportResult(url=outline.url, status="duplicate") for outline in duplicates]
+    for result in ordered:
+        setattr(report, result.status, getattr(report, result.status) + 1)
+    report.results = ordered
+    report.elapsed_seconds = round(time.perf_counter() - start, 3)
+
+    logger.info(
+        "OPML import: %d added, %d existing, %d duplicates, %d failed in %.2fs",
+        report.added, report.exists, report.duplicate, report.failed, report.elapsed_seconds
+    )
+    return report
+
+async def handle_opml_export(db_session: AsyncSession) -> bytes:
+    """
+    Exports every feed as an OPML document, grouped by category.
+    """
+    rows = await crud_feed.get_feed_outlines(db_session)
+    outlines = [
+        OpmlOutline(url=url, title=name, category=category, html_url=link)
+        for name, url, link, category in rows
+    ]
+    return build_opml(outlines)
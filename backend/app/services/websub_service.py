@@ -0,0 +1,154 @@
+# app/services/websub_service.py
+import hashlib
+import hmac
+import logging
+import secrets
+import httpx
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone, timedelta
+
+from ..core.config import settings
+from ..db.crud import crud_feed, bulk_operations
+from ..db.models.feed import Feed, FEED_STATUS_GONE
+from ..schemas.article import ArticleCreate
+from ..schemas.feed import FeedCreate
+from ..utils.feedfetch import feed_fetcher
+from ..utils.feedparse import parse_feed_content
+from ..utils.parse_pool import parse_pool
+
+logger = logging.getLogger(__name__)
+
+# Renew the subscription when the lease has less than this left
+RENEWAL_MARGIN = timedelta(days=1)
+# Don't re-request a subscription the hub hasn't verified yet more often than this
+REQUEST_RETRY = timedelta(hours=1)
+
+SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+def websub_enabled() -> bool:
+    return bool(settings.websub_callback_base_url)
+
+def has_active_lease(feed: Feed) -> bool:
+    return bool(
+        feed.websub_lease_expires_at
+        and feed.websub_lease_expires_at > datetime.now(timezone.utc)
+    )
+
+def callback_url(feed_id: int) -> str:
+    return f"{settings.websub_callback_base_url.rstrip('/')}/websub/{feed_id}"
+
+async def ensure_subscription(db_session: AsyncSession, feed: Feed, parsed_feed: FeedCreate) -> None:
+    """
+    Subscribes to the feed's WebSub hub, or renews the subscription when the
+    lease is about to expire. Does nothing when WebSub is disabled or the feed
+    doesn't advertise a hub.
+
+    The hub confirms asynchronously by calling verify_intent, which is where
+    the lease gets stored.
+    """
+    hub, topic = parsed_feed.websub_hub, parsed_feed.websub_topic
+    if not websub_enabled() or not hub or not topic:
+        return
+
+    now = datetime.now(timezone.utc)
+    same_subscription = feed.websub_hub == hub and feed.websub_topic == topic
+    if same_subscription:
+        if feed.websub_lease_expires_at and feed.websub_lease_expires_at - now > RENEWAL_MARGIN:
+            return
+        if feed.websub_requested_at and now - feed.websub_requested_at < REQUEST_RETRY:
+            return
+
+    secret = feed.websub_secret if same_subscription and feed.websub_secret else secrets.token_hex(32)
+    data = {
+        "hub.mode": "subscribe",
+        "hub.topic": topic,
+        "hub.callback": callback_url(feed.id),
+        "hub.secret": secret,
+        "hub.lease_seconds": str(settings.websub_lease_seconds),
+    }
+    try:
+        response = await feed_fetcher.post(hub, data)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        # Polling keeps working, the subscription is retried on a later refresh
+        logger.warning("WebSub subscription to %s for feed %s failed: %s", hub, feed.id, e)
+        return
+
+    await crud_feed.record_websub_request(db_session, feed.id, hub, topic, secret)
+
+async def verify_intent(
+    db_session: AsyncSession,
+    feed_id: int,
+    mode: str,
+    topic: str,
+    challenge: str,
+    lease_seconds: int | None,
+) -> str:
+    """
+    Answers the hub's verification request and returns the challenge to echo.
+    """
+    feed = await crud_feed.get_feed_by_id(db_session, feed_id)
+
+    if mode == "unsubscribe":
+        # Confirm unsubscribing from feeds we no longer have
+        if feed is None or feed.websub_topic != topic:
+            return challenge
+        await crud_feed.record_websub_lease(db_session, feed_id, None)
+        return challenge
+
+    if mode != "subscribe" or feed is None or feed.status == FEED_STATUS_GONE or feed.websub_topic != topic:
+        raise HTTPException(status_code=404, detail="Unknown subscription.")
+
+    lease = lease_seconds or settings.websub_lease_seconds
+    await crud_feed.record_websub_lease(
+        db_session, feed_id, datetime.now(timezone.utc) + timedelta(seconds=lease)
+    )
+    logger.info("WebSub subscription for feed %s verified for %ss", feed_id, lease)
+    return challenge
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """
+    Checks the X-Hub-Signature header ("<algorithm>=<hex digest>") against the body.
+    """
+    if not signature or "=" not in signature:
+        return False
+    algorithm, digest = signature.split("=", 1)
+    hash_func = SIGNATURE_ALGORITHMS.get(algorithm.lower())
+    if hash_func is None:
+        return False
+    expected = hmac.new(secret.encode(), body, hash_func).hexdigest()
+    return hmac.compare_digest(expected, digest.lower())
+
+async def handle_push(db_session: AsyncSession, feed_id: int, body: bytes, signature: str | None) -> None:
+    """
+    Ingests content pushed by the hub, using the same parse and upsert path as a refresh.
+
+    Pushes with a missing or wrong signature are ignored. They are still
+    acknowledged, as the spec asks, so the hub doesn't keep retrying them.
+    """
+    feed = await crud_feed.get_feed_by_id(db_session, feed_id)
+    if feed is None or not feed.websub_secret or feed.status == FEED_STATUS_GONE:
+        return
+    if not verify_signature(feed.websub_secret, body, signature):
+        logger.warning("Ignoring WebSub push for feed %s with an invalid signature", feed_id)
+        return
+
+    try:
+        feed_record, article_records = await parse_pool.run(
+            parse_feed_content, body, feed.url, feed.etag, feed.modified, feed.entries_watermark, feed.entry_links
+        )
+    except ValueError as e:
+        logger.warning("Could not parse WebSub push for feed %s: %s", feed_id, e)
+        return
+
+    parsed_feed = FeedCreate.model_validate(feed_record)
+    parsed_articles = [ArticleCreate.model_validate(a) for a in article_records]
+    result = await bulk_operations.bulk_associate_articles_with_feed(db_session, feed_id, parsed_articles)
+    await crud_feed.record_feed_push(db_session, feed_id, parsed_feed.entries_watermark)
+    logger.info("WebSub push for feed %s: %s", feed_id, result)
@@ -78,37 +78,24 @@ async def fetch_playlist_page_async(
     response = await asyncio.to_thread(request.execute)
     return response
 
-async def background_handle_add_all_channel_uploads(uploads_id: str, ytapi: YouTubeAPI, batch_size: int = 500) -> int:
+async def background_handle_add_all_channel_uploads(uploads_id: str, ytapi: YouTubeAPI) -> int:
+    # Page through YouTube first, so the session is only held for the bulk load
+    videos = await fetch_all_channel_uploads(uploads_id, ytapi)
     async with sessionmanager.session() as db_session:
-        total_inserted = await handle_add_all_channel_uploads(
-            uploads_id,
-            db_session,
-            ytapi,
-            batch_size
-        )
-        return total_inserted
+        return await crud_video.copy_videos(db_session, videos)
 
-async def handle_add_all_channel_uploads(
-    uploads_id: str,
-    db_session: AsyncSession,
-    ytapi: YouTubeAPI,
-    batch_size: int = 500
-) -> int:
+async def fetch_all_channel_uploads(uploads_id: str, ytapi: YouTubeAPI) -> list[VideoCreate]:
     """
-    Asynchronously fetch *all* uploaded videos for a channel from YouTube
-    and store them in batches in the database.
+    Asynchronously fetch *all* uploaded videos for a channel from YouTube.
 
     - Uses pagination to handle large playlists.
     - Offloads blocking API calls to a thread (to_thread).
-    - Commits in chunks (batch_size) to reduce memory usage & partial commits.
-    - Returns total number of videos inserted.
 
     Raises HTTPException(404) if no items are found at all.
     """
 
     page_token = None
-    video_batch: list[VideoCreate] = []
-    total_inserted = 0
+    videos: list[VideoCreate] = []
     first_page = True
 
     while True:
@@ -128,7 +115,7 @@ async def handle_add_all_channel_uploads(
             )
         first_page = False
 
-        # 3) Convert each item to a VideoCreate for bulk insert
+        # 3) Convert each item to a VideoCreate for the bulk load
         for item in items:
             snippet = item.get("snippet", {})
             content_details = item.get("contentDetails", {})
@@ -147,25 +134,29 @@ async def handle_add_all_channel_uploads(
                 thumbnail_url=thumbnail_url,
                 published_at=datetime.fromisoformat(snippet.get("publishedAt").replace("Z", "+00:00")),
             )
-            video_batch.append(new_video)
-
-            # If we hit the batch_size, flush to DB
-            if len(video_batch) >= batch_size:
-                await crud_video.create_videos(db_session, video_batch)
-                total_inserted += len(video_batch)
-                video_batch.clear()
+            videos.append(new_video)
 
         # 4) Check for more pages
         page_token = response.get("nextPageToken")
         if not page_token:
             break  # no more pages
 
-    # 5) Insert any leftover videos in final batch
-    if video_batch:
-        await crud_video.create_videos(db_session, video_batch)
-        total_inserted += len(video_batch)
+    return videos
+
+async def handle_add_all_channel_uploads(
+    uploads_id: str,
+    db_session: AsyncSession,
+    ytapi: YouTubeAPI,
+) -> int:
+    """
+    Fetch *all* uploaded videos for a channel from YouTube and bulk load them
+    into the database with COPY (see crud_video.copy_videos).
+    Returns the number of videos inserted.
 
-    return total_inserted
+    Raises HTTPException(404) if no items are found at all.
+    """
+    videos = await fetch_all_channel_uploads(uploads_id, ytapi)
+    return await crud_video.copy_videos(db_session, videos)
 
 async def handle_update_channel_videos(channel_id: str, db_session: AsyncSession, ytapi: YouTubeAPI):
     """
@@ -201,4 +192,4 @@ async def handle_update_channel_videos(channel_id: str, db_session: AsyncSession
         )
         new_videos.append(new_video)
     
-    await crud_video.create_videos(new_videos)
\ No newline at end of file
+    await crud_video.create_videos(db_session, new_videos)
\ No newline at end of file
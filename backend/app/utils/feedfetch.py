@@ -0,0 +1,209 @@
+# feedfetch.py
+import asyncio
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from ..core.config import settings
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept": "application/xml,text/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    The form of a URL used to tell whether two URLs point to the same feed:
+    scheme and host lowercased, the default port and any trailing slash on the
+    path dropped, and the fragment (never sent to the server) left out.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    userinfo, _, hostport = parts.netloc.rpartition("@")
+    host, port = hostport.lower(), None
+    try:
+        port = parts.port
+    except ValueError:
+        pass
+    if port is not None:
+        host = host.rsplit(":", 1)[0]
+        if port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{port}"
+    elif host.endswith(":"):
+        host = host[:-1]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+    return urlunsplit((scheme, netloc, parts.path.rstrip("/"), parts.query, ""))
+
+
+class FeedDownloadError(ValueError):
+    """The feed body exceeded the size cap or the download took too long."""
+    pass
+
+
+@dataclass
+class FetchStats:
+    """
+    Timings (in milliseconds) and sizes of a single feed fetch, filled in along the way.
+
+    httpcore resolves the host name as part of opening the TCP connection, so
+    connect_ms includes DNS. connect_ms and tls_ms stay None when a pooled
+    connection was reused. ttfb_ms runs until the final response's headers came in.
+    """
+    status_code: int | None = None
+    not_modified: bool = False
+    bytes_downloaded: int | None = None
+    connect_ms: float | None = None
+    tls_ms: float | None = None
+    ttfb_ms: float | None = None
+    total_ms: float | None = None
+    parse_ms: float | None = None
+
+    def tracer(self, start: float):
+        """
+        Returns an httpx "trace" extension callback that records connection timings.
+        """
+        started: dict[str, float] = {}
+
+        async def trace(event_name: str, info: dict):
+            now = time.perf_counter()
+            if event_name.endswith(".started"):
+                started[event_name.removesuffix(".started")] = now
+            elif event_name == "connection.connect_tcp.complete":
+                self.connect_ms = (self.connect_ms or 0) + (now - started.get("connection.connect_tcp", now)) * 1000
+            elif event_name == "connection.start_tls.complete":
+                self.tls_ms = (self.tls_ms or 0) + (now - started.get("connection.start_tls", now)) * 1000
+            elif event_name.endswith("receive_response_headers.complete"):
+                self.ttfb_ms = (now - start) * 1000
+
+        return trace
+
+
+class FeedFetcher:
+    """
+    Shared async HTTP client for downloading feeds.
+
+    One pooled httpx.AsyncClient is reused for every request so connections
+    (and TLS sessions) are kept alive between fetches. The pool caps the total
+    number of open connections, and a semaphore per host keeps us from opening
+    too many connections against a single remote server.
+
+    Bodies are streamed and capped at max_body_bytes (after decompression), and
+    each download must finish within `deadline` seconds, so a huge or endless
+    response can't exhaust memory or hold a connection forever.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_per_host: int,
+        timeout: float,
+        deadline: float,
+        max_body_bytes: int,
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._timeout = httpx.Timeout(timeout)
+        self._max_per_host = max_per_host
+        self._deadline = deadline
+        self._max_body_bytes = max_body_bytes
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Lazily create the client so it is bound to the running event loop.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                limits=self._limits,
+                timeout=self._timeout,
+                follow_redirects=True,
+            )
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def get(
+        self, url: str, headers: dict[str, str] | None = None, stats: FetchStats | None = None
+    ) -> tuple[httpx.Response, bytes]:
+        """
+        GET the given URL through the shared pool, respecting the per-host limit.
+
+        Returns the (already closed) response along with its body.
+        Raises FeedDownloadError if the body is too large or the deadline passes.
+        If `stats` is given, the fetch's timings and size are recorded in it.
+        """
+        async with self._host_semaphore(url):
+            # Time spent waiting for the host semaphore doesn't count
+            start = time.perf_counter()
+            extensions = {"trace": stats.tracer(start)} if stats is not None else None
+            try:
+                async with asyncio.timeout(self._deadline):
+                    async with self._get_client().stream(
+                        "GET", url, headers=headers, extensions=extensions
+                    ) as response:
+                        if stats is not None:
+                            stats.status_code = response.status_code
+                        try:
+                            return response, await self._read_capped(response)
+                        finally:
+                            if stats is not None:
+                                stats.bytes_downloaded = response.num_bytes_downloaded
+            except TimeoutError:
+                raise FeedDownloadError(f"Downloading {url} took longer than {self._deadline}s")
+            finally:
+                if stats is not None:
+                    stats.total_ms = (time.perf_counter() - start) * 1000
+
+    async def post(self, url: str, data: dict[str, str]) -> httpx.Response:
+        """
+        POST a form to the given URL through the shared pool (used for WebSub hubs).
+        """
+        async with self._host_semaphore(url):
+            return await self._get_client().post(url, data=data)
+
+    async def _read_capped(self, response: httpx.Response) -> bytes:
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > self._max_body_bytes:
+            raise FeedDownloadError(
+                f"{response.url} is {content_length} bytes, over the {self._max_body_bytes} byte limit"
+            )
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > self._max_body_bytes:
+                raise FeedDownloadError(
+                    f"{response.url} is over the {self._max_body_bytes} byte limit"
+                )
+        return bytes(body)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._host_semaphores.clear()
+
+
+feed_fetcher = FeedFetcher(
+    max_connections=settings.feed_fetch_concurrency,
+    max_per_host=settings.feed_fetch_per_host,
+    timeout=settings.feed_fetch_timeout,
+    deadline=settings.feed_fetch_deadline,
+    max_body_bytes=settings.feed_max_body_bytes,
+)
@@ -1,10 +1,80 @@
-import requests
+import hashlib
+import logging
+import time
 import feedparser
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 
 from ..schemas.feed import FeedCreate
 from ..schemas.article import ArticleCreate
+from .feedfetch import FetchStats, feed_fetcher
+from .parse_pool import parse_pool
+
+logger = logging.getLogger(__name__)
+
+class _FirstImageFound(Exception):
+    pass
+
+class _FirstImageParser(HTMLParser):
+    """
+    Streams through HTML and stops at the first <img> tag, remembering its
+    attributes, position and raw text. No document tree is built.
+    """
+    def __init__(self):
+        super().__init__()
+        self.img_attrs: dict[str, str | None] | None = None
+        self.img_position: tuple[int, int] | None = None
+        self.img_text: str | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "img":
+            self.img_attrs = dict(attrs)
+            self.img_position = self.getpos()
+            self.img_text = self.get_starttag_text()
+            raise _FirstImageFound
+
+    # <img ... /> should be handled the same way as <img ...>
+    handle_startendtag = handle_starttag
+
+def _absolute_offset(text: str, lineno: int, column: int) -> int:
+    """Converts an HTMLParser (line, column) position into an index into text."""
+    offset = 0
+    for _ in range(lineno - 1):
+        offset = text.index("\n", offset) + 1
+    return offset + column
+
+def extract_and_remove_first_image(html_content: str | None) -> tuple[str | None, str | None]:
+    """
+    Finds the first <img> tag in the HTML and splices it out of the original text.
+
+    Like the BeautifulSoup version this replaces, only the very first <img> is
+    considered, and it must have a src attribute. Unlike BeautifulSoup the rest of
+    the HTML is returned untouched instead of being re-serialized.
+
+    Returns:
+        (image_src, updated_html): the image src, or None with the original HTML if none was found.
+    """
+    if not html_content or "<img" not in html_content.lower():
+        return None, html_content  # No image, and return original content
+
+    parser = _FirstImageParser()
+    try:
+        parser.feed(html_content)
+        parser.close()
+    except _FirstImageFound:
+        pass
+
+    if parser.img_attrs is None or not parser.img_attrs.get("src"):
+        return None, html_content
+
+    start = _absolute_offset(html_content, *parser.img_position)
+    tag_text = parser.img_text
+    if html_content.startswith(tag_text, start):
+        updated_html = html_content[:start] + html_content[start + len(tag_text):]
+    else:
+        updated_html = html_content.replace(tag_text, "", 1)
+
+    return parser.img_attrs["src"], updated_html
 
 def get_entry_image(entry):
     """
@@ -19,21 +89,6 @@ def get_entry_image(entry):
             updated_summary (str | None) - The summary with the first <img> removed if it was found in summary.
             updated_description (str | None) - The description with the first <img> removed if it was found in description.
     """
-    # Helper to find and remove the first <img> tag from HTML
-    def extract_and_remove_first_image(html_content: str | None):
-        if not html_content:
-            return None, html_content  # No image, and return original content
-
-        soup = BeautifulSoup(html_content, "html.parser")
-        img_tag = soup.find("img")
-        if img_tag and "src" in img_tag.attrs:
-            img_src = img_tag["src"]
-            # Remove the img tag from the document
-            img_tag.decompose()
-            # Return the img src and the updated HTML
-            return img_src, str(soup)
-        return None, html_content
-
     # ------------------------
     # 1. Check for media:content (common in Media RSS feeds)
     if "media_content" in entry:
@@ -101,6 +156,10 @@ def extract_feed_info(feed_info, url: str, etag: str | None, modified: str | Non
         feed_info.get("icon") or
         feed_info.get("logo")
     )
+    # WebSub: feeds that support push advertise their hub and canonical (self) URL
+    links = feed_info.get("links", [])
+    hub = next((link.get("href") for link in links if link.get("rel") == "hub"), None)
+    topic = next((link.get("href") for link in links if link.get("rel") == "self"), None)
     return FeedCreate(
         name=feed_info.get("title") or "Unknown Feed",
         url=url,
@@ -109,7 +168,9 @@ def extract_feed_info(feed_info, url: str, etag: str | None, modified: str | Non
         description=feed_info.get("subtitle"),
         image_url=image_url,
         etag=etag,
-        modified=modified
+        modified=modified,
+        websub_hub=hub,
+        websub_topic=(topic or url) if hub else None,
     )
 
 
@@ -128,9 +189,70 @@ def convert_to_utc(parsed_time) -> datetime:
         return naive_datetime.replace(tzinfo=timezone.utc)
     return None
 
-def parse_article_entries(entries: list[dict]) -> list[ArticleCreate]:
+def compute_content_hash(
+    title: str | None,
+    summary: str | None,
+    content: str | None,
+    image_url: str | None,
+    updated_at: datetime | None,
+) -> str:
+    """
+    Fingerprints the fields of an article that an upsert would overwrite,
+    so unchanged articles can be skipped on refresh.
+    """
+    parts = [
+        title or "",
+        summary or "",
+        content or "",
+        image_url or "",
+        updated_at.isoformat() if updated_at else "",
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+def get_entry_timestamp(entry) -> datetime | None:
+    """
+    Returns the most recent of an entry's published and updated times, if it has any.
+    """
+    timestamps = [
+        convert_to_utc(entry.get(key))
+        for key in ("published_parsed", "updated_parsed")
+        if entry.get(key)
+    ]
+    return max(timestamps) if timestamps else None
+
+def get_entries_watermark(entries: list[dict]) -> datetime | None:
+    """
+    Returns the newest entry timestamp in the feed, ignoring entries dated in the future
+    so a bad clock on the remote side can't hide articles published later.
+    """
+    now = datetime.now(timezone.utc)
+    timestamps = [
+        timestamp for timestamp in map(get_entry_timestamp, entries)
+        if timestamp is not None and timestamp <= now
+    ]
+    return max(timestamps) if timestamps else None
+
+def parse_article_entries(
+    entries: list[dict], watermark: datetime | None = None, known_links: set[str] | None = None
+) -> list[ArticleCreate]:
+    """
+    Builds ArticleCreate objects out of feed entries.
+
+    Entries that were already ingested are skipped without being built: their
+    link is in `known_links` (the entries of the previously ingested document)
+    and they are dated at or before the watermark (the newest entry time seen
+    then), so they didn't change since. Entries with a link we haven't seen are
+    always built, whatever their date and position: backdated posts, feeds not
+    sorted by date, entries that show up late. Entries without any date are
+    always built too.
+    """
     articles = []
     for entry in entries:
+        if watermark is not None and known_links and entry.get("link") in known_links:
+            entry_timestamp = get_entry_timestamp(entry)
+            if entry_timestamp is not None and entry_timestamp <= watermark:
+                continue
+
         image_url, summary, description = get_entry_image(entry)
         
         published_dt = entry.get("published_parsed")
@@ -139,56 +261,116 @@ def parse_article_entries(entries: list[dict]) -> list[ArticleCreate]:
         else:
             published_dt = datetime.now(timezone.utc)
 
+        title = entry.get("title") or "No Title"
+        updated_dt = convert_to_utc(entry.get("updated_parsed"))
+        summary = summary or description
+        content = entry.get("content", [{}])[0].get("value") if entry.get("content") else None
+
         article = ArticleCreate(
-            title=entry.get("title") or "No Title",
+            title=title,
             link=entry.get("link"),
             published_at=published_dt,
-            updated_at=convert_to_utc(entry.get("updated_parsed")),
+            updated_at=updated_dt,
             author=entry.get("author"),
-            summary=summary or description,
-            content=entry.get("content", [{}])[0].get("value") if entry.get("content") else None,
+            summary=summary,
+            content=content,
             image_url=image_url,
             categories=None, # TODO: add category handling
+            content_hash=compute_content_hash(title, summary, content, image_url, updated_dt),
         )
         articles.append(article)
 
     return articles
 
-def parse_feed(url: str, etag: str | None = None, modified: str | None = None) -> tuple[FeedCreate, list[ArticleCreate]] | tuple[None, None]:
+def parse_feed_content(
+    content: bytes,
+    url: str,
+    etag: str | None,
+    modified: str | None,
+    watermark: datetime | None = None,
+    known_links: list[str] | None = None,
+) -> tuple[dict, list[dict]]:
     """
-    Parses the given Feed URL using feedparser
+    Parses a downloaded feed document. This is the CPU-bound part of ingestion
+    and runs inside the parse pool.
+
+    Only plain dicts are returned to the parent process rather than feedparser's
+    FeedParserDict objects, to keep what gets pickled across processes small.
+
+    Returns:
+        (feed_record, article_records): the FeedCreate and ArticleCreate data as dicts
+    """
+    feed_data = feedparser.parse(content)
+
+    if feed_data.bozo:
+        logger.warning("Bozo exception parsing %s: %s", url, feed_data.bozo_exception)
+        raise ValueError(f"Error parsing feed from {url}: {feed_data.bozo_exception}")
+
+    feed = extract_feed_info(feed_data.feed, url, etag, modified)
+    feed.entries_watermark = get_entries_watermark(feed_data.entries)
+    feed.entry_links = [entry["link"] for entry in feed_data.entries if entry.get("link")]
+    articles = parse_article_entries(feed_data.entries, watermark, set(known_links or ()))
+
+    return feed.model_dump(), [article.model_dump() for article in articles]
+
+async def parse_feed(
+    url: str,
+    etag: str | None = None,
+    modified: str | None = None,
+    watermark: datetime | None = None,
+    known_links: list[str] | None = None,
+    stats: FetchStats | None = None,
+) -> tuple[FeedCreate, list[ArticleCreate]] | tuple[None, None]:
+    """
+    Downloads the given Feed URL through the shared async fetcher and parses it
+    using feedparser on the parse pool.
+
+    The stored validators are sent as If-None-Match / If-Modified-Since so the
+    server can answer 304 Not Modified instead of resending the whole document.
     
     Args:
         url (str): the url of the Feed
+        etag (str | None): the ETag returned by the previous fetch
+        modified (str | None): the Last-Modified value returned by the previous fetch
+        watermark (datetime | None): the newest entry time already ingested
+        known_links (list[str] | None): the entry links of the last ingested document; known
+            entries no newer than the watermark are skipped (see parse_article_entries)
+        stats (FetchStats | None): if given, receives the fetch and parse timings
         
     Returns:
-        FeedParsed: The parsed feed with parsed articles"""
+        FeedParsed: The parsed feed with parsed articles, or (None, None) if the feed was not modified.
+        The parsed feed's url is the new location if the feed was permanently redirected."""
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
     
-    response = requests.get(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Accept": "application/xml,text/xml;q=0.9,*/*;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            # "Accept-Language": "en-US,en;q=0.5",
-        }, 
-        timeout=15)
+    response, content = await feed_fetcher.get(url, headers=headers, stats=stats)
+    if response.status_code == 304:
+        if stats is not None:
+            stats.not_modified = True
+        return None, None
     response.raise_for_status()
 
-    feed_data = feedparser.parse(response.content)
-    
-    # print("feed parsed: ")
-    # print(feed_data)
+    # If every hop was a permanent redirect, the feed now lives at the final URL
+    if response.history and all(r.status_code in (301, 308) for r in response.history):
+        url = str(response.url)
 
-    if feed_data.bozo:
-        print("Bozo exception:", feed_data.bozo_exception)
-        raise ValueError(f"Error parsing feed from {url}: {feed_data.bozo_exception}")
-    
-    feed_info = feed_data.feed
-    new_etag = feed_data.get("etag")
-    new_modified = feed_data.get("modified")
-    entries_info = feed_data.entries
-    feed = extract_feed_info(feed_info, url, new_etag, new_modified)
-    articles = parse_article_entries(entries_info)
+    # feedparser only fills etag/modified when it downloads the feed itself,
+    # so the new validators have to come from the response headers.
+    new_etag = response.headers.get("ETag")
+    new_modified = response.headers.get("Last-Modified")
+
+    parse_start = time.perf_counter()
+    feed_record, article_records = await parse_pool.run(
+        parse_feed_content, content, url, new_etag, new_modified, watermark, known_links
+    )
+
+    feed = FeedCreate.model_validate(feed_record)
+    articles = [ArticleCreate.model_validate(record) for record in article_records]
+    if stats is not None:
+        stats.parse_ms = (time.perf_counter() - parse_start) * 1000
 
     return feed, articles
\ No newline at end of file
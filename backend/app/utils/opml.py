@@ -0,0 +1,82 @@
+# opml.py
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+
+@dataclass
+class OpmlOutline:
+    url: str
+    title: str | None = None
+    category: str | None = None
+    html_url: str | None = None
+
+
+def parse_opml(content: bytes) -> list[OpmlOutline]:
+    """
+    Extracts the feed outlines (the ones with an xmlUrl) from an OPML document.
+
+    Feeds nested inside a folder outline get the folder's title as category,
+    unless they carry their own `category` attribute. Only the first entry of
+    a comma separated category list is used, and leading slashes are dropped.
+
+    Raises ValueError if the document is not valid OPML.
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid OPML document: {e}")
+
+    body = root.find("body")
+    if root.tag != "opml" or body is None:
+        raise ValueError("Invalid OPML document: missing <opml> or <body> element")
+
+    outlines: list[OpmlOutline] = []
+
+    def walk(element: ET.Element, folder: str | None):
+        for outline in element.findall("outline"):
+            title = outline.get("title") or outline.get("text")
+            url = outline.get("xmlUrl")
+            if url:
+                category = outline.get("category")
+                if category:
+                    category = category.split(",")[0].strip().strip("/") or None
+                outlines.append(OpmlOutline(
+                    url=url.strip(),
+                    title=title,
+                    category=category or folder,
+                    html_url=outline.get("htmlUrl"),
+                ))
+            else:
+                walk(outline, title or folder)
+
+    walk(body, None)
+    return outlines
+
+
+def build_opml(outlines: list[OpmlOutline], title: str = "MyNetHome feeds") -> bytes:
+    """
+    Builds an OPML 2.0 document, with one folder outline per category.
+    """
+    root = ET.Element("opml", version="2.0")
+    head = ET.SubElement(root, "head")
+    ET.SubElement(head, "title").text = title
+    ET.SubElement(head, "dateCreated").text = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z")
+    body = ET.SubElement(root, "body")
+
+    folders: dict[str, ET.Element] = {}
+    for outline in outlines:
+        parent = body
+        if outline.category:
+            parent = folders.get(outline.category)
+            if parent is None:
+                parent = ET.SubElement(body, "outline", text=outline.category, title=outline.category)
+                folders[outline.category] = parent
+        name = outline.title or outline.url
+        attributes = {"type": "rss", "text": name, "title": name, "xmlUrl": outline.url}
+        if outline.html_url:
+            attributes["htmlUrl"] = outline.html_url
+        ET.SubElement(parent, "outline", attributes)
+
+    ET.indent(root)
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,46 @@
+# parse_pool.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from ..core.config import settings
+
+
+class ParsePoolManager:
+    """
+    Runs CPU-bound parsing work (feedparser, HTML scanning) on a process pool,
+    so large feeds are parsed on other cores and the event loop stays responsive.
+
+    With max_workers=0 the work runs inline instead, which is handy for debugging.
+    Functions submitted to the pool must be module-level and return picklable data.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self._max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # "spawn" avoids forking a process that already runs an event loop and threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._max_workers == 0:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+
+parse_pool = ParsePoolManager(max_workers=settings.feed_parse_workers)
@@ -0,0 +1,151 @@
+"""
+Refresh worker: claims feed refresh jobs from the Postgres queue and runs them.
+
+Run with `python -m app.worker`. Any number of workers can run side by side,
+on any machine that can reach the database; jobs are claimed with
+FOR UPDATE SKIP LOCKED so each one is handled by a single worker.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from datetime import timedelta
+
+from fastapi import HTTPException
+
+from .core.config import settings
+from .db.crud import crud_refresh_job
+from .db.session import sessionmanager
+from .services.feed_service import handle_refresh_feed
+from .utils.feedfetch import feed_fetcher
+from .utils.parse_pool import parse_pool
+
+logging.basicConfig(stream=sys.stdout, level=logging.DEBUG if settings.debug_logs else logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RefreshWorker:
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+        self._stopping = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(settings.feed_fetch_concurrency)
+        self._housekeeping_at = 0.0
+
+    def stop(self):
+        logger.info("Worker %s stopping after the current batch", self.worker_id)
+        self._stopping.set()
+
+    async def run_job(self, job_id: int, feed_id: int, scheduled: bool = False):
+        """
+        Refreshes one feed in its own session and records the job's outcome.
+        Jobs the scheduler queued skip the throttle on recently refreshed feeds.
+
+        A refresh that fails (bad status, unparsable feed...) is tracked and backed
+        off on the feed itself, so the job is simply done. Only unexpected
+        errors put the job back in the queue.
+        """
+        async with self._semaphore:
+            error = None
+            crashed = False
+            async with sessionmanager.session() as db_session:
+                try:
+                    await handle_refresh_feed(feed_id, db_session, scheduled=scheduled)
+                except HTTPException as e:
+                    error = str(e.detail)
+                except Exception as e:
+                    logger.exception("Unexpected error refreshing feed %s", feed_id)
+                    error = str(e) or type(e).__name__
+                    crashed = True
+
+            async with sessionmanager.session() as db_session:
+                if crashed:
+                    await crud_refresh_job.retry_refresh_job(
+                        db_session,
+                        job_id,
+                        error,
+                        max_attempts=settings.refresh_job_max_attempts,
+                        retry_after=timedelta(minutes=settings.feed_min_refresh_minutes),
+                    )
+                else:
+                    await crud_refresh_job.finish_refresh_job(db_session, job_id, error)
+
+    async def housekeeping(self):
+        """
+        Requeues jobs of workers that died and purges old finished jobs.
+        Runs at most once per refresh_job_stale_minutes.
+        """
+        interval = settings.refresh_job_stale_minutes * 60
+        if time.monotonic() - self._housekeeping_at < interval:
+            return
+        self._housekeeping_at = time.monotonic()
+
+        async with sessionmanager.session() as db_session:
+            requeued = await crud_refresh_job.requeue_stale_jobs(
+                db_session, timedelta(minutes=settings.refresh_job_stale_minutes)
+            )
+            purged = await crud_refresh_job.purge_finished_jobs(
+                db_session, timedelta(days=settings.refresh_job_retention_days)
+            )
+        if requeued or purged:
+            logger.info("Requeued %d stale refresh jobs, purged %d finished ones", requeued, purged)
+
+    async def run_batch(self) -> int:
+        """
+        Claims a batch of jobs and runs them concurrently.
+        Returns the number of jobs that were claimed.
+        """
+        async with sessionmanager.session() as db_session:
+            jobs = await crud_refresh_job.claim_refresh_jobs(
+                db_session, self.worker_id, settings.refresh_worker_batch_size
+            )
+        if not jobs:
+            return 0
+
+        start = time.perf_counter()
+        await asyncio.gather(*(self.run_job(*job) for job in jobs))
+        elapsed = time.perf_counter() - start
+        logger.info(
+            "Refreshed %d feeds in %.2fs (%.2f feeds/s)",
+            len(jobs), elapsed, len(jobs) / elapsed if elapsed > 0 else 0.0
+        )
+        return len(jobs)
+
+    async def run(self):
+        logger.info("Refresh worker %s started", self.worker_id)
+        while not self._stopping.is_set():
+            try:
+                await self.housekeeping()
+                claimed = await self.run_batch()
+            except Exception:
+                # e.g. the database went away, try again after the poll interval
+                logger.exception("Refresh worker %s failed to process a batch", self.worker_id)
+                claimed = 0
+
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), settings.refresh_worker_poll_seconds)
+                except TimeoutError:
+                    pass
+
+
+async def main():
+    worker = RefreshWorker(f"{socket.gethostname()}:{os.getpid()}")
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await feed_fetcher.close()
+        parse_pool.shutdown()
+        if sessionmanager._engine is not None:
+            await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,6 +9,8 @@ from app.db.models.feed_articles import FeedArticles
 from app.db.models.channel import Channel
 from app.db.models.video import Video
 from app.db.models.category import Category, FeedCategory, ChannelCategory
+from app.db.models.refresh_job import RefreshJob
+from app.db.models.feed_fetch_log import FeedFetchLog
 from app.core.config import settings
 
 # This is the Alembic Config object, which provides access to the .ini file values.
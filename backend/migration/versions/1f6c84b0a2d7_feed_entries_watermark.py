@@ -0,0 +1,26 @@
+"""feed entries watermark
+
+Revision ID: 1f6c84b0a2d7
+Revises: e58b0d2a6c94
+Create Date: 2026-10-17 13:37:58.120493
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6c84b0a2d7'
+down_revision: Union[str, None] = 'e58b0d2a6c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('entries_watermark', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'entries_watermark')
@@ -0,0 +1,41 @@
+"""trigram name indexes
+
+Revision ID: 2b9f6d04c8e1
+Revises: e8c15b3f7a40
+Create Date: 2026-10-17 16:02:13.874520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9f6d04c8e1'
+down_revision: Union[str, None] = 'e8c15b3f7a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('feeds', 'name'),
+    ('feeds', 'author'),
+    ('channels', 'title'),
+    ('categories', 'name'),
+    ('videos', 'title'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            f'ix_{table}_{column}_trgm', table, [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for table, column in reversed(TRIGRAM_INDEXES):
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table, postgresql_using='gin')
+    # The pg_trgm extension is left installed, other objects may use it
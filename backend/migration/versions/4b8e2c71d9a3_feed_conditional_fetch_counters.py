@@ -0,0 +1,30 @@
+"""feed conditional fetch counters
+
+Revision ID: 4b8e2c71d9a3
+Revises: 30dc2b7d88e5
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2c71d9a3'
+down_revision: Union[str, None] = '30dc2b7d88e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('feeds', sa.Column('not_modified_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('feeds', sa.Column('full_fetch_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'full_fetch_count')
+    op.drop_column('feeds', 'not_modified_count')
+    op.drop_column('feeds', 'last_checked_at')
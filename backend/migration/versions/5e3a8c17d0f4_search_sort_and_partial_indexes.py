@@ -0,0 +1,70 @@
+"""search sort and partial indexes
+
+Revision ID: 5e3a8c17d0f4
+Revises: 2b9f6d04c8e1
+Create Date: 2026-10-17 16:25:40.316287
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e3a8c17d0f4'
+down_revision: Union[str, None] = '2b9f6d04c8e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_feed_articles_article_id', 'feed_articles', ['article_id'], None),
+    ('ix_articles_created_at_id', 'articles', ['created_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_articles_published_at_id', 'articles', ['published_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_articles_updated_at_id', 'articles', ['updated_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_articles_last_updated_id', 'articles', ['last_updated DESC NULLS LAST', 'id DESC'], None),
+    ('ix_articles_unread_created_at', 'articles', ['created_at DESC NULLS LAST', 'id DESC'], 'is_read = false'),
+    ('ix_articles_favorited_created_at', 'articles', ['created_at DESC NULLS LAST', 'id DESC'], 'is_favorited = true'),
+    ('ix_videos_published_at_id', 'videos', ['published_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_videos_created_at_id', 'videos', ['created_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_videos_last_updated_id', 'videos', ['last_updated DESC NULLS LAST', 'id DESC'], None),
+    ('ix_videos_title_id', 'videos', ['title', 'id'], None),
+    ('ix_videos_channel_id_published_at_id', 'videos', ['channel_id', 'published_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_videos_favorited_published_at', 'videos', ['published_at DESC NULLS LAST', 'id DESC'], 'is_favorited = true'),
+    ('ix_feeds_name', 'feeds', ['name'], None),
+    ('ix_feeds_created_at', 'feeds', ['created_at DESC'], None),
+]
+
+
+def _invalid_indexes() -> set[str]:
+    # A failed or interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which IF NOT EXISTS would keep: those are dropped and built again
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+        ),
+        {"names": [name for name, *_ in INDEXES]},
+    )
+    return set(result.scalars())
+
+
+def upgrade() -> None:
+    # Built concurrently so the tables stay writable, which can't run in a transaction
+    with op.get_context().autocommit_block():
+        invalid = _invalid_indexes()
+        for name, table, columns, where in INDEXES:
+            if name in invalid:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(
+                name, table, [sa.text(column) for column in columns], unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
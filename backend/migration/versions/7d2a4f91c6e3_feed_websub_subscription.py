@@ -0,0 +1,34 @@
+"""feed websub subscription
+
+Revision ID: 7d2a4f91c6e3
+Revises: 1f6c84b0a2d7
+Create Date: 2026-10-17 14:05:12.384017
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a4f91c6e3'
+down_revision: Union[str, None] = '1f6c84b0a2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('websub_hub', sa.String(), nullable=True))
+    op.add_column('feeds', sa.Column('websub_topic', sa.String(), nullable=True))
+    op.add_column('feeds', sa.Column('websub_secret', sa.String(), nullable=True))
+    op.add_column('feeds', sa.Column('websub_requested_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('feeds', sa.Column('websub_lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'websub_lease_expires_at')
+    op.drop_column('feeds', 'websub_requested_at')
+    op.drop_column('feeds', 'websub_secret')
+    op.drop_column('feeds', 'websub_topic')
+    op.drop_column('feeds', 'websub_hub')
@@ -0,0 +1,37 @@
+"""category membership cascade
+
+Revision ID: 8c41e6b2f9d7
+Revises: 5e3a8c17d0f4
+Create Date: 2026-10-17 16:48:05.927133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e6b2f9d7'
+down_revision: Union[str, None] = '5e3a8c17d0f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a feed or a category removes its memberships, like channel_categories already does
+    op.drop_constraint('feed_categories_feed_id_fkey', 'feed_categories', type_='foreignkey')
+    op.drop_constraint('feed_categories_category_id_fkey', 'feed_categories', type_='foreignkey')
+    op.create_foreign_key('feed_categories_feed_id_fkey', 'feed_categories', 'feeds', ['feed_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('feed_categories_category_id_fkey', 'feed_categories', 'categories', ['category_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_feed_categories_category_id', 'feed_categories', ['category_id'], unique=False)
+    op.create_index('ix_channel_categories_category_id', 'channel_categories', ['category_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_channel_categories_category_id', table_name='channel_categories')
+    op.drop_index('ix_feed_categories_category_id', table_name='feed_categories')
+    op.drop_constraint('feed_categories_category_id_fkey', 'feed_categories', type_='foreignkey')
+    op.drop_constraint('feed_categories_feed_id_fkey', 'feed_categories', type_='foreignkey')
+    op.create_foreign_key('feed_categories_feed_id_fkey', 'feed_categories', 'feeds', ['feed_id'], ['id'])
+    op.create_foreign_key('feed_categories_category_id_fkey', 'feed_categories', 'categories', ['category_id'], ['id'])
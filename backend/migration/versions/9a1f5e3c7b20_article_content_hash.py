@@ -0,0 +1,26 @@
+"""article content hash
+
+Revision ID: 9a1f5e3c7b20
+Revises: 4b8e2c71d9a3
+Create Date: 2026-10-17 10:03:27.551842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1f5e3c7b20'
+down_revision: Union[str, None] = '4b8e2c71d9a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('articles', 'content_hash')
@@ -0,0 +1,27 @@
+"""feed entry links
+
+Revision ID: a3c9e5d1f7b2
+Revises: f1d27a9c53b8
+Create Date: 2026-10-17 18:04:12.730561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e5d1f7b2'
+down_revision: Union[str, None] = 'f1d27a9c53b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('entry_links', postgresql.ARRAY(sa.String()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'entry_links')
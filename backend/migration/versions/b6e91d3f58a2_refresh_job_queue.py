@@ -0,0 +1,43 @@
+"""refresh job queue
+
+Revision ID: b6e91d3f58a2
+Revises: 7d2a4f91c6e3
+Create Date: 2026-10-17 14:32:47.902611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e91d3f58a2'
+down_revision: Union[str, None] = '7d2a4f91c6e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('refresh_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feed_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), server_default='pending', nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['feed_id'], ['feeds.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_refresh_jobs_active_feed', 'refresh_jobs', ['feed_id'], unique=True, postgresql_where=sa.text("status IN ('pending', 'running')"))
+    op.create_index('ix_refresh_jobs_status_run_after', 'refresh_jobs', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_jobs_status_run_after', table_name='refresh_jobs')
+    op.drop_index('uq_refresh_jobs_active_feed', table_name='refresh_jobs', postgresql_where=sa.text("status IN ('pending', 'running')"))
+    op.drop_table('refresh_jobs')
@@ -0,0 +1,30 @@
+"""feed adaptive schedule
+
+Revision ID: c3d7a9e41f06
+Revises: 9a1f5e3c7b20
+Create Date: 2026-10-17 11:20:51.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d7a9e41f06'
+down_revision: Union[str, None] = '9a1f5e3c7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('next_fetch_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('feeds', sa.Column('refresh_interval', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_feeds_next_fetch_at'), 'feeds', ['next_fetch_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feeds_next_fetch_at'), table_name='feeds')
+    op.drop_column('feeds', 'refresh_interval')
+    op.drop_column('feeds', 'next_fetch_at')
@@ -0,0 +1,26 @@
+"""refresh job scheduled
+
+Revision ID: c7e2b4d9a1f3
+Revises: a3c9e5d1f7b2
+Create Date: 2026-10-17 18:37:51.204918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2b4d9a1f3'
+down_revision: Union[str, None] = 'a3c9e5d1f7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_jobs', sa.Column('scheduled', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('refresh_jobs', 'scheduled')
@@ -0,0 +1,49 @@
+"""feed fetch log
+
+Revision ID: d4a07c2e9b15
+Revises: b6e91d3f58a2
+Create Date: 2026-10-17 15:04:21.550938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a07c2e9b15'
+down_revision: Union[str, None] = 'b6e91d3f58a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('feed_fetch_log',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('feed_id', sa.Integer(), nullable=False),
+    sa.Column('host', sa.String(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('not_modified', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('bytes_downloaded', sa.Integer(), nullable=True),
+    sa.Column('connect_ms', sa.Float(), nullable=True),
+    sa.Column('tls_ms', sa.Float(), nullable=True),
+    sa.Column('ttfb_ms', sa.Float(), nullable=True),
+    sa.Column('total_ms', sa.Float(), nullable=True),
+    sa.Column('parse_ms', sa.Float(), nullable=True),
+    sa.Column('upsert_ms', sa.Float(), nullable=True),
+    sa.Column('new_items', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_items', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['feed_id'], ['feeds.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_feed_fetch_log_feed_id_fetched_at', 'feed_fetch_log', ['feed_id', 'fetched_at'], unique=False)
+    op.create_index(op.f('ix_feed_fetch_log_fetched_at'), 'feed_fetch_log', ['fetched_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feed_fetch_log_fetched_at'), table_name='feed_fetch_log')
+    op.drop_index('ix_feed_fetch_log_feed_id_fetched_at', table_name='feed_fetch_log')
+    op.drop_table('feed_fetch_log')
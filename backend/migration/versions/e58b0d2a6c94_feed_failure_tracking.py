@@ -0,0 +1,32 @@
+"""feed failure tracking
+
+Revision ID: e58b0d2a6c94
+Revises: c3d7a9e41f06
+Create Date: 2026-10-17 12:41:09.266530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e58b0d2a6c94'
+down_revision: Union[str, None] = 'c3d7a9e41f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('status', sa.String(), server_default='active', nullable=False))
+    op.add_column('feeds', sa.Column('consecutive_failures', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('feeds', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('feeds', sa.Column('last_error_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'last_error_at')
+    op.drop_column('feeds', 'last_error')
+    op.drop_column('feeds', 'consecutive_failures')
+    op.drop_column('feeds', 'status')
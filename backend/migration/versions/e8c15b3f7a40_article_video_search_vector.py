@@ -0,0 +1,41 @@
+"""article and video search vector
+
+Revision ID: e8c15b3f7a40
+Revises: d4a07c2e9b15
+Create Date: 2026-10-17 15:37:48.102394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c15b3f7a40'
+down_revision: Union[str, None] = 'd4a07c2e9b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+        "setweight(to_tsvector('english', left(coalesce(content, ''), 200000)), 'C')",
+        persisted=True
+    ), nullable=True))
+    op.create_index('ix_articles_search_vector', 'articles', ['search_vector'], unique=False, postgresql_using='gin')
+    op.add_column('videos', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True
+    ), nullable=True))
+    op.create_index('ix_videos_search_vector', 'videos', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_search_vector', table_name='videos', postgresql_using='gin')
+    op.drop_column('videos', 'search_vector')
+    op.drop_index('ix_articles_search_vector', table_name='articles', postgresql_using='gin')
+    op.drop_column('articles', 'search_vector')
@@ -0,0 +1,103 @@
+"""feed channel category counters
+
+Revision ID: f1d27a9c53b8
+Revises: 8c41e6b2f9d7
+Create Date: 2026-10-17 17:21:36.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d27a9c53b8'
+down_revision: Union[str, None] = '8c41e6b2f9d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = {
+    'feeds': ['total_articles', 'unread_articles', 'favorited_articles'],
+    'channels': ['total_videos', 'favorited_videos'],
+    'categories': ['total_articles', 'unread_articles', 'favorited_articles', 'total_videos', 'favorited_videos'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in COUNTERS.items():
+        for column in columns:
+            op.add_column(table, sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    # Initial values, the same as the periodic reconciliation computes
+    op.execute("""
+        UPDATE feeds SET
+            total_articles = c.total_articles,
+            unread_articles = c.unread_articles,
+            favorited_articles = c.favorited_articles
+        FROM (
+            SELECT fa.feed_id,
+                   count(*) AS total_articles,
+                   count(*) FILTER (WHERE NOT a.is_read) AS unread_articles,
+                   count(*) FILTER (WHERE a.is_favorited) AS favorited_articles
+            FROM feed_articles fa JOIN articles a ON a.id = fa.article_id
+            GROUP BY fa.feed_id
+        ) c
+        WHERE feeds.id = c.feed_id
+    """)
+    op.execute("""
+        UPDATE channels SET
+            total_videos = c.total_videos,
+            favorited_videos = c.favorited_videos
+        FROM (
+            SELECT channel_id,
+                   count(*) AS total_videos,
+                   count(*) FILTER (WHERE is_favorited) AS favorited_videos
+            FROM videos
+            GROUP BY channel_id
+        ) c
+        WHERE channels.id = c.channel_id
+    """)
+    # Articles in several feeds of a category count once
+    op.execute("""
+        UPDATE categories SET
+            total_articles = coalesce(a.total_articles, 0),
+            unread_articles = coalesce(a.unread_articles, 0),
+            favorited_articles = coalesce(a.favorited_articles, 0),
+            total_videos = coalesce(v.total_videos, 0),
+            favorited_videos = coalesce(v.favorited_videos, 0)
+        FROM categories c
+        LEFT JOIN (
+            SELECT fc.category_id,
+                   count(DISTINCT fa.article_id) AS total_articles,
+                   count(DISTINCT fa.article_id) FILTER (WHERE NOT a.is_read) AS unread_articles,
+                   count(DISTINCT fa.article_id) FILTER (WHERE a.is_favorited) AS favorited_articles
+            FROM feed_categories fc
+            JOIN feed_articles fa ON fa.feed_id = fc.feed_id
+            JOIN articles a ON a.id = fa.article_id
+            GROUP BY fc.category_id
+        ) a ON a.category_id = c.id
+        LEFT JOIN (
+            SELECT cc.category_id,
+                   count(*) AS total_videos,
+                   count(*) FILTER (WHERE videos.is_favorited) AS favorited_videos
+            FROM channel_categories cc JOIN videos ON videos.channel_id = cc.channel_id
+            GROUP BY cc.category_id
+        ) v ON v.category_id = c.id
+        WHERE categories.id = c.id
+    """)
+
+    # Categories waiting for their counters to be recounted
+    op.create_table(
+        'stale_categories',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stale_categories')
+    for table, columns in reversed(COUNTERS.items()):
+        for column in reversed(columns):
+            op.drop_column(table, column)
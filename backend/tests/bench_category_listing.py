@@ -0,0 +1,89 @@
+"""
+Times the category listing against the eager loading it replaced, with 50
+categories, 1000 feeds and 500 channels, each member in 3 categories.
+Drops and recreates the tables of TEST_DATABASE_URL. Run from backend/:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m tests.bench_category_listing
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("YOUTUBE_API_KEY", "unused")
+
+from sqlalchemy import insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.crud import crud_category  # noqa: E402
+from app.db.models.category import Category, ChannelCategory, FeedCategory  # noqa: E402
+from app.db.models.channel import Channel  # noqa: E402
+from app.db.models.feed import Feed  # noqa: E402
+from app.db.models import article, feed_articles, feed_fetch_log, refresh_job, video  # noqa: E402,F401
+
+CATEGORIES, FEEDS, CHANNELS, CATEGORIES_PER_MEMBER = 50, 1000, 500, 3
+
+
+async def _seed(db):
+    await db.execute(insert(Category), [{"name": f"Category {i}"} for i in range(CATEGORIES)])
+    await db.execute(insert(Feed), [
+        {"name": f"Feed {i}", "url": f"https://example.com/feed{i}.xml"} for i in range(FEEDS)
+    ])
+    await db.execute(insert(Channel), [
+        {"id": f"UC{i}", "title": f"Channel {i}", "uploads_id": f"UU{i}"} for i in range(CHANNELS)
+    ])
+    await db.execute(insert(FeedCategory), [
+        {"feed_id": i + 1, "category_id": (i + n) % CATEGORIES + 1}
+        for i in range(FEEDS) for n in range(CATEGORIES_PER_MEMBER)
+    ])
+    await db.execute(insert(ChannelCategory), [
+        {"channel_id": f"UC{i}", "category_id": (i + n) % CATEGORIES + 1}
+        for i in range(CHANNELS) for n in range(CATEGORIES_PER_MEMBER)
+    ])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+    await db.commit()
+
+
+async def eager_listing(db):
+    """The listing before: categories joined to their feeds and channels, and those to their categories."""
+    query = select(Category).options(
+        joinedload(Category.feeds).joinedload(Feed.categories),
+        joinedload(Category.channels).joinedload(Channel.categories),
+    )
+    result = await db.execute(query)
+    return result.unique().scalars().all()
+
+
+async def _time(sessionmaker, listing, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        async with sessionmaker() as db:
+            start = time.perf_counter()
+            await listing(db)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main():
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with sessionmaker() as db:
+        await _seed(db)
+
+    # The eager listing takes seconds here: its rows multiply feeds, channels and their categories
+    eager = await _time(sessionmaker, eager_listing, runs=3)
+    aggregated = await _time(sessionmaker, crud_category.get_all_categories, runs=10)
+    print(f"{CATEGORIES} categories, {FEEDS} feeds, {CHANNELS} channels, best of 3 and 10 runs")
+    print(f"eager loading   {eager * 1000:8.1f} ms")
+    print(f"aggregated      {aggregated * 1000:8.1f} ms  ({eager / aggregated:.1f}x)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
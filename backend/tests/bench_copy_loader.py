@@ -0,0 +1,108 @@
+"""
+Times the COPY loaders against the INSERT paths they replace for backfills,
+in rows per second: 20k videos of 20 channels with copy_videos against
+create_videos (in batches of 500, as channel backfills called it, and in one
+call), and 20k articles of 20 feeds with copy_associate_articles_with_feeds
+against bulk_associate_articles_with_feeds. Each run loads into empty tables.
+Drops and recreates the tables of TEST_DATABASE_URL. Run from backend/:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m tests.bench_copy_loader
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("YOUTUBE_API_KEY", "unused")
+
+from sqlalchemy import insert, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.crud import bulk_operations, crud_video  # noqa: E402
+from app.db.models.channel import Channel  # noqa: E402
+from app.db.models.feed import Feed  # noqa: E402
+from app.db.models import article, category, feed_articles, feed_fetch_log, refresh_job, video  # noqa: E402,F401
+from app.schemas.article import ArticleCreate  # noqa: E402
+from app.schemas.video import VideoCreate  # noqa: E402
+
+ROWS, OWNERS, BATCH, RUNS = 20_000, 20, 500, 3
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _videos() -> list[VideoCreate]:
+    return [
+        VideoCreate(
+            id=f"video{i:06d}", title=f"Video {i}", description=f"Description of video {i}. " * 5,
+            channel_id=f"UC{i % OWNERS}", thumbnail_url=f"https://i.ytimg.com/vi/video{i:06d}/hqdefault.jpg",
+            published_at=START + timedelta(minutes=i),
+        )
+        for i in range(ROWS)
+    ]
+
+
+def _articles() -> dict[int, list[ArticleCreate]]:
+    articles_by_feed = {feed_id: [] for feed_id in range(1, OWNERS + 1)}
+    for i in range(ROWS):
+        articles_by_feed[i % OWNERS + 1].append(ArticleCreate(
+            title=f"Post {i}", link=f"https://example.com/posts/{i}", summary=f"Summary of post {i}. " * 5,
+            published_at=START + timedelta(minutes=i), content_hash=f"{i:064x}",
+        ))
+    return articles_by_feed
+
+
+async def create_videos_in_batches(db, videos: list[VideoCreate]) -> None:
+    """The channel backfill before: create_videos with BATCH videos at a time."""
+    for start in range(0, len(videos), BATCH):
+        await crud_video.create_videos(db, videos[start:start + BATCH])
+
+
+async def _reset(sessionmaker) -> None:
+    async with sessionmaker() as db:
+        await db.execute(text("TRUNCATE videos, articles, feed_articles, stale_categories, channels, feeds RESTART IDENTITY CASCADE"))
+        await db.execute(insert(Channel), [
+            {"id": f"UC{i}", "title": f"Channel {i}", "uploads_id": f"UU{i}"} for i in range(OWNERS)
+        ])
+        await db.execute(insert(Feed), [
+            {"name": f"Feed {i}", "url": f"https://example.com/feed{i}.xml"} for i in range(OWNERS)
+        ])
+        await db.commit()
+
+
+async def _rows_per_second(sessionmaker, load, rows) -> float:
+    """Best of RUNS loads into empty tables."""
+    timings = []
+    for _ in range(RUNS):
+        await _reset(sessionmaker)
+        async with sessionmaker() as db:
+            start = time.perf_counter()
+            await load(db, rows)
+            timings.append(time.perf_counter() - start)
+    return ROWS / min(timings)
+
+
+async def main():
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    videos, articles = _videos(), _articles()
+    loaders = (
+        ("videos", f"create_videos, {BATCH} per call", create_videos_in_batches, videos),
+        ("videos", "create_videos, one call", crud_video.create_videos, videos),
+        ("videos", "copy_videos", crud_video.copy_videos, videos),
+        ("articles", "bulk_associate_articles_with_feeds", bulk_operations.bulk_associate_articles_with_feeds, articles),
+        ("articles", "copy_associate_articles_with_feeds", bulk_operations.copy_associate_articles_with_feeds, articles),
+    )
+    print(f"{ROWS} rows of {OWNERS} channels or feeds, best of {RUNS} runs")
+    print(f"{'':<10}{'loader':<38}{'rows/s':>10}")
+    for table, name, load, rows in loaders:
+        print(f"{table:<10}{name:<38}{await _rows_per_second(sessionmaker, load, rows):>10.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""
+Times extract_and_remove_first_image against the BeautifulSoup version it
+replaced, per entry, on the fixture corpus. Run from backend/:
+
+    python -m tests.bench_entry_images
+"""
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("YOUTUBE_API_KEY", "unused")
+
+from app.utils.feedparse import extract_and_remove_first_image  # noqa: E402
+from tests.test_entry_images import CORPUS, bs4_extract_and_remove_first_image, read_entry  # noqa: E402
+
+
+def _per_call(function, html: str) -> float:
+    timer = timeit.Timer(lambda: function(html))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main():
+    print(f"{'entry':<28}{'bytes':>8}{'bs4 us':>10}{'new us':>10}{'speedup':>9}")
+    total_old = total_new = 0.0
+    for path in CORPUS:
+        html = read_entry(path)
+        old = _per_call(bs4_extract_and_remove_first_image, html)
+        new = _per_call(extract_and_remove_first_image, html)
+        total_old += old
+        total_new += new
+        print(f"{path.stem:<28}{len(html):>8}{old * 1e6:>10.1f}{new * 1e6:>10.1f}{old / new:>8.1f}x")
+    print(f"{'corpus':<28}{'':>8}{total_old * 1e6:>10.1f}{total_new * 1e6:>10.1f}{total_old / total_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Times the article ingest of one feed refresh (50 entries) with
+bulk_associate_articles_with_feed against the path it replaced: select the
+feed, select the existing links, upsert, commit, link, commit (five round
+trips and two commits). The current path runs two statements (the upsert,
+then the link statement, see build_link_statement) and one commit: the
+original goal of a single statement had to be split in two, so it makes three
+round trips rather than one.
+
+RTT_MS adds that many milliseconds per round trip, to see the difference a
+network between the app and Postgres makes. Drops and recreates the tables of
+TEST_DATABASE_URL. Run from backend/:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://... [RTT_MS=0.5] python -m tests.bench_feed_refresh
+"""
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("YOUTUBE_API_KEY", "unused")
+
+from sqlalchemy import event, insert, select, text  # noqa: E402
+from sqlalchemy.dialects.postgresql import insert as pg_insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.crud import bulk_operations  # noqa: E402
+from app.db.models.article import Article  # noqa: E402
+from app.db.models.feed import Feed  # noqa: E402
+from app.db.models.feed_articles import FeedArticles  # noqa: E402
+from app.db.models import category, channel, feed_fetch_log, refresh_job, video  # noqa: E402,F401
+from app.schemas.article import ArticleCreate  # noqa: E402
+from app.utils.feedparse import compute_content_hash  # noqa: E402
+
+ENTRIES, REFRESHES, BACKGROUND_ARTICLES = 50, 50, 100_000
+RTT_MS = float(os.environ.get("RTT_MS", "0"))
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def five_round_trip_associate(db, feed_id: int, articles: list[ArticleCreate]) -> None:
+    """The ingest before: pre-select the existing links, upsert the rest, link, committing twice."""
+    if not (await db.execute(select(Feed).where(Feed.id == feed_id))).scalars().first():
+        raise ValueError(f"Feed with ID {feed_id} does not exist.")
+    existing = {
+        row.link: row for row in (await db.execute(
+            select(Article.id, Article.link, Article.content_hash).where(Article.link.in_([str(a.link) for a in articles]))
+        )).all()
+    }
+    link_to_id = {}
+    to_upsert = []
+    for article in articles:
+        row = existing.get(str(article.link))
+        if row is None or row.content_hash != article.content_hash:
+            to_upsert.append(article)
+        else:
+            link_to_id[row.link] = row.id
+    if to_upsert:
+        stmt = pg_insert(Article).values([article.model_dump() for article in to_upsert])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["link"],
+            set_={name: stmt.excluded[name] for name in ("title", "updated_at", "author", "summary", "content", "image_url", "categories", "content_hash")},
+            where=Article.content_hash.is_distinct_from(stmt.excluded.content_hash),
+        ).returning(Article.id, Article.link)
+        result = await db.execute(stmt)
+        await db.commit()
+        link_to_id.update({row.link: row.id for row in result.all()})
+    await db.execute(
+        pg_insert(FeedArticles)
+        .values([{"feed_id": feed_id, "article_id": article_id} for article_id in link_to_id.values()])
+        .on_conflict_do_nothing(index_elements=["feed_id", "article_id"])
+    )
+    await db.commit()
+
+
+def _entries(prefix: str, first: int, changed: set[int] = frozenset()) -> list[ArticleCreate]:
+    """A feed document: the ENTRIES articles starting at `first`, those in `changed` with a new summary."""
+    entries = []
+    for i in range(first, first + ENTRIES):
+        summary = f"Summary {i}" + (" (edited)" if i in changed else "")
+        title, link = f"Post {i}", f"https://example.com/{prefix}/{i}"
+        entries.append(ArticleCreate(
+            title=title, link=link, summary=summary, published_at=START + timedelta(minutes=i),
+            content_hash=compute_content_hash(title, summary, None, None, None),
+        ))
+    return entries
+
+
+async def _seed(db) -> list[int]:
+    feed_ids = list((await db.execute(insert(Feed).returning(Feed.id), [
+        {"name": name, "url": f"https://example.com/{name}.xml"} for name in ("before", "after")
+    ])).scalars())
+    # Other feeds' articles, so link lookups and the unique index aren't trivially small
+    for first in range(0, BACKGROUND_ARTICLES, 5000):
+        await db.execute(insert(Article), [
+            {"title": f"Other {i}", "link": f"https://example.org/{i}", "published_at": START}
+            for i in range(first, first + 5000)
+        ])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+    await db.commit()
+    return feed_ids
+
+
+async def _time(sessionmaker, associate, feed_id: int, documents) -> tuple[float, float]:
+    """Median milliseconds per refresh and round trips per refresh."""
+    timings = []
+    round_trips[0] = 0
+    for document in documents:
+        async with sessionmaker() as db:
+            start = time.perf_counter()
+            await associate(db, feed_id, document)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, round_trips[0] / len(documents)
+
+
+# Statements and commits sent since _time started
+round_trips = [0]
+
+
+def _count_round_trips(engine):
+    def counted(connection, *args):
+        round_trips[0] += 1
+        if RTT_MS:
+            time.sleep(RTT_MS / 1000)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", counted)
+    event.listen(engine.sync_engine, "commit", lambda connection: counted(connection))
+
+
+async def main():
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    _count_round_trips(engine)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with sessionmaker() as db:
+        before_id, after_id = await _seed(db)
+
+    # Each refresh moves the document 5 entries down, editing 2 of the others
+    def documents(prefix):
+        return [_entries(prefix, 5 * n, changed={5 * n + 10, 5 * n + 20}) for n in range(REFRESHES)]
+    # A document already ingested, as most refreshes of an unchanged feed see it
+    def unchanged(prefix):
+        return [_entries(prefix, 5 * REFRESHES)] * REFRESHES
+
+    print(f"{ENTRIES} entries per refresh, median of {REFRESHES} refreshes, {RTT_MS} ms added per round trip")
+    print(f"{'':<28}{'before ms':>10}{'trips':>7}{'after ms':>10}{'trips':>7}")
+    for name, make in (("new and edited entries", documents), ("unchanged document", unchanged)):
+        old = await _time(sessionmaker, five_round_trip_associate, before_id, make("before"))
+        new = await _time(sessionmaker, bulk_operations.bulk_associate_articles_with_feed, after_id, make("after"))
+        print(f"{name:<28}{old[0]:>10.2f}{old[1]:>7.1f}{new[0]:>10.2f}{new[1]:>7.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
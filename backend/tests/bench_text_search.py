@@ -0,0 +1,108 @@
+"""
+Times full-text search (q) against the ILIKE '%term%' scan it replaced, on
+a synthetic corpus of a million articles whose words follow a skewed
+distribution: w1 is in about half of them, `needle` in 100. ILIKE has no
+index to use on summary and content, so it reads the table until it has a
+page. Pages of 20, newest first and by relevance, without a total count.
+Drops and recreates the tables of TEST_DATABASE_URL (seeding takes a few
+minutes). Run from backend/:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m tests.bench_text_search
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("YOUTUBE_API_KEY", "unused")
+
+from sqlalchemy import or_, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.crud import crud_article  # noqa: E402
+from app.db.crud.filters import contains  # noqa: E402
+from app.db.models.article import Article  # noqa: E402
+from app.db.models import category, channel, feed, feed_articles, feed_fetch_log, refresh_job, video  # noqa: E402,F401
+from app.schemas.article import ArticleSearchParams  # noqa: E402
+
+ARTICLES, BATCH, VOCABULARY, RUNS = 1_000_000, 100_000, 5000, 5
+
+# Words drawn as w<n>, n = VOCABULARY * random()^3: low n are common, high n rare
+SEED = text(f"""
+    INSERT INTO articles (title, link, summary, content, published_at, created_at, last_updated, is_read, is_favorited)
+    SELECT
+        (SELECT string_agg('w' || floor({VOCABULARY} * power(random(), 3))::int, ' ') FROM generate_series(1, 6 + n % 2)),
+        'https://example.com/' || n,
+        (SELECT string_agg('w' || floor({VOCABULARY} * power(random(), 3))::int, ' ') FROM generate_series(1, 20 + n % 2))
+            || CASE WHEN n % 10000 = 0 THEN ' needle' ELSE '' END,
+        (SELECT string_agg('w' || floor({VOCABULARY} * power(random(), 3))::int, ' ') FROM generate_series(1, 40 + n % 2)),
+        now() - n * interval '1 minute', now() - n * interval '1 minute', now() - n * interval '1 minute',
+        false, false
+    FROM generate_series(CAST(:first AS integer), CAST(:last AS integer)) AS n
+""")
+
+
+async def _seed(db) -> None:
+    # The n % 2 terms make the subqueries depend on n, so each row gets its own words
+    for first in range(1, ARTICLES + 1, BATCH):
+        await db.execute(SEED, {"first": first, "last": first + BATCH - 1})
+        await db.commit()
+
+
+async def ilike_search(db, term: str, limit: int = 20) -> list:
+    """The search before: a substring match on every text column."""
+    columns = (Article.title, Article.summary, Article.content)
+    query = (
+        select(Article.id)
+        .where(or_(*(contains(column, term) for column in columns)))
+        .order_by(Article.created_at.desc().nulls_last(), Article.id.desc())
+        .limit(limit)
+    )
+    return (await db.execute(query)).all()
+
+
+async def _best_ms(sessionmaker, search) -> float:
+    timings = []
+    for _ in range(RUNS):
+        async with sessionmaker() as db:
+            start = time.perf_counter()
+            await search(db)
+            timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def _full_text(q: str, order_by: str):
+    params = ArticleSearchParams(q=q, order_by=order_by, limit=20, count="none")
+    return lambda db: crud_article.get_articles(db, params)
+
+
+async def main():
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    start = time.perf_counter()
+    async with sessionmaker() as db:
+        await _seed(db)
+    async with engine.connect() as connection:
+        # VACUUM can't run in a transaction
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE articles"))
+    print(f"{ARTICLES} articles seeded in {time.perf_counter() - start:.0f} s, best of {RUNS} runs, pages of 20")
+
+    queries = (("needle", "needle"), ("w1", "w1"), ("w1 w2", None), ('"w1 w2"', None), ("w1 -w2", None))
+    print(f"{'q':<12}{'matches':>9}{'ILIKE ms':>10}{'newest ms':>11}{'relevance ms':>14}")
+    for q, term in queries:
+        async with sessionmaker() as db:
+            _, matches, _, _ = await crud_article.get_articles(db, ArticleSearchParams(q=q, limit=1))
+        ilike = f"{await _best_ms(sessionmaker, lambda db: ilike_search(db, term)):.1f}" if term else "-"
+        newest = await _best_ms(sessionmaker, _full_text(q, "created_at"))
+        relevance = await _best_ms(sessionmaker, _full_text(q, "relevance"))
+        print(f"{q:<12}{matches:>9}{ilike:>10}{newest:>11.1f}{relevance:>14.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
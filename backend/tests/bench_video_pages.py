@@ -0,0 +1,93 @@
+"""
+Times /youtube/videos/ pages deep in the default order (published_at, newest
+first) with offset and with cursor paging, on 200k videos of which a tenth
+have no publication date. Drops and recreates the tables of TEST_DATABASE_URL.
+Run from backend/:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://... python -m tests.bench_video_pages
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("YOUTUBE_API_KEY", "unused")
+
+from sqlalchemy import insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.crud import crud_video  # noqa: E402
+from app.db.crud.pagination import encode_cursor, keyset_order  # noqa: E402
+from app.db.models.channel import Channel  # noqa: E402
+from app.db.models.video import Video  # noqa: E402
+from app.db.models import article, category, feed, feed_articles, feed_fetch_log, refresh_job  # noqa: E402,F401
+from app.schemas.video import VideoSearchParams  # noqa: E402
+
+VIDEOS, CHUNK, LIMIT = 200_000, 5000, 50
+# The last depth is past the dated videos, among the NULLs
+DEPTHS = [0, 1_000, 10_000, 50_000, 100_000, 179_990, 190_000]
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+async def _seed(db):
+    await db.execute(insert(Channel).values(id="UC1", title="Channel", uploads_id="UU1"))
+    for first in range(0, VIDEOS, CHUNK):
+        await db.execute(insert(Video), [
+            {
+                "id": f"v{i:06}", "title": f"Video {i}", "channel_id": "UC1", "is_favorited": False,
+                "created_at": START, "last_updated": START,
+                "published_at": START + timedelta(minutes=i) if i % 10 else None,
+            }
+            for i in range(first, first + CHUNK)
+        ])
+    await db.commit()
+    await db.execute(text("ANALYZE videos"))
+    await db.commit()
+
+
+async def _cursor_at(db, depth: int) -> str | None:
+    """The cursor of a page starting at the given depth, as the previous page would have returned it."""
+    if depth == 0:
+        return None
+    last = (await db.execute(
+        select(Video.published_at, Video.id)
+        .order_by(*keyset_order(Video.published_at, Video.id, descending=True))
+        .offset(depth - 1).limit(1)
+    )).one()
+    return encode_cursor("published_at", last.published_at, last.id)
+
+
+async def _time(sessionmaker, params: VideoSearchParams, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        async with sessionmaker() as db:
+            start = time.perf_counter()
+            await crud_video.get_videos(db, params)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main():
+    engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with sessionmaker() as db:
+        await _seed(db)
+
+    print(f"{VIDEOS} videos, pages of {LIMIT}, best of 5 runs (no total count)")
+    print(f"{'depth':>8} {'offset':>10} {'cursor':>10}")
+    for depth in DEPTHS:
+        async with sessionmaker() as db:
+            cursor = await _cursor_at(db, depth)
+        offset = await _time(sessionmaker, VideoSearchParams(limit=LIMIT, offset=depth, count="none"))
+        seek = await _time(sessionmaker, VideoSearchParams(limit=LIMIT, cursor=cursor, count="none"))
+        print(f"{depth:>8} {offset * 1000:8.1f}ms {seek * 1000:8.1f}ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
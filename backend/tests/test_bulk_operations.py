@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.db.crud import bulk_operations
+from app.db.models.article import Article
+from app.db.models.feed import Feed
+from app.db.models.feed_articles import FeedArticles
+from app.schemas.article import ArticleCreate
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+
+async def _create_feeds(db, count: int) -> list[int]:
+    result = await db.execute(
+        insert(Feed).returning(Feed.id),
+        [{"name": f"Feed {i}", "url": f"https://example.com/feed{i}.xml"} for i in range(count)],
+    )
+    await db.commit()
+    return list(result.scalars())
+
+
+def _article(link: str = "https://example.com/post", content_hash: str = "hash") -> ArticleCreate:
+    return ArticleCreate(
+        title="Post", link=link, published_at=datetime(2026, 1, 1, tzinfo=timezone.utc), content_hash=content_hash
+    )
+
+
+async def test_associate_counts_new_and_unchanged_articles(db):
+    (feed_id,) = await _create_feeds(db, 1)
+
+    first = await bulk_operations.bulk_associate_articles_with_feed(db, feed_id, [_article()])
+    second = await bulk_operations.bulk_associate_articles_with_feed(db, feed_id, [_article()])
+
+    assert first["new_articles_count"] == 1
+    assert first["new_relationships_count"] == 1
+    assert second["new_articles_count"] == 0
+    assert second["unchanged_articles_count"] == 1
+    assert second["new_relationships_count"] == 0
+    assert (await db.get(Feed, feed_id)).total_articles == 1
+
+
+async def test_associate_stores_every_article_field(db):
+    (feed_id,) = await _create_feeds(db, 1)
+    article = ArticleCreate(
+        title="Post", link="https://example.com/post", author="Ann", summary="Short", content="<p>Long</p>",
+        image_url="https://example.com/cover.png", categories=["news", "tech"],
+        published_at=datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc),
+        updated_at=datetime(2026, 1, 2, tzinfo=timezone.utc), content_hash="hash",
+    )
+
+    await bulk_operations.bulk_associate_articles_with_feed(db, feed_id, [article])
+
+    stored = (await db.execute(select(Article))).scalar_one()
+    assert ArticleCreate.model_validate(stored, from_attributes=True) == article
+    assert (stored.is_read, stored.is_favorited) == (False, False)
+
+
+async def test_concurrent_upsert_of_the_same_link_links_both_feeds(sessionmaker):
+    async with sessionmaker() as setup:
+        first_feed, second_feed = await _create_feeds(setup, 2)
+
+    async with sessionmaker() as first, sessionmaker() as second:
+        # The first worker has upserted the link but not committed yet
+        await first.execute(bulk_operations.build_upsert_statement([_article()]))
+
+        # The second one conflicts on the same link and waits for the first
+        ingest = asyncio.create_task(
+            bulk_operations.bulk_associate_articles_with_feed(second, second_feed, [_article()])
+        )
+        await asyncio.sleep(0.5)
+        assert not ingest.done()
+
+        await first.execute(bulk_operations.build_link_statement(first_feed, [str(_article().link)]))
+        await first.commit()
+        counts = await ingest
+
+    assert counts["new_articles_count"] == 0
+    assert counts["unchanged_articles_count"] == 1
+    assert counts["new_relationships_count"] == 1
+
+    async with sessionmaker() as check:
+        links = (await check.execute(select(FeedArticles.feed_id).order_by(FeedArticles.feed_id))).scalars().all()
+        assert links == [first_feed, second_feed]
+        assert (await check.get(Feed, second_feed)).total_articles == 1
+        assert len((await check.execute(select(Article.id))).all()) == 1
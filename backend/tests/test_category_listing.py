@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import insert
+
+from app.db.crud import crud_category, crud_channel, crud_feed
+from app.db.models.category import Category
+from app.db.models.channel import Channel
+from app.db.models.feed import Feed
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+
+@pytest.fixture
+async def categories(db):
+    feed_ids = list((await db.execute(
+        insert(Feed).returning(Feed.id),
+        [{"name": f"Feed {i:02}", "url": f"https://example.com/feed{i}.xml"} for i in range(60)],
+    )).scalars())
+    channel_ids = [f"UC{i:02}" for i in range(25)]
+    await db.execute(insert(Channel), [
+        {"id": channel_id, "title": f"Channel {channel_id}", "uploads_id": f"UU{channel_id}"}
+        for channel_id in channel_ids
+    ])
+    big, feeds_only, channels_only, empty = (await db.execute(
+        insert(Category).returning(Category.id),
+        [{"name": "Big"}, {"name": "Feeds only"}, {"name": "Channels only"}, {"name": "Empty"}],
+    )).scalars()
+    await db.commit()
+
+    # Big has 50 feeds and 20 channels (1000 pairs if the listing multiplied them),
+    # and shares its first feed with Feeds only
+    await crud_category.assign_feeds_to_categories(db, feed_ids[:50], [big])
+    await crud_category.assign_channels_to_categories(db, channel_ids[:20], [big])
+    await crud_category.assign_feeds_to_categories(db, [feed_ids[0], *feed_ids[50:53]], [feeds_only])
+    await crud_category.assign_channels_to_categories(db, channel_ids[20:22], [channels_only])
+    return {"Big": big, "Feeds only": feeds_only, "Channels only": channels_only, "Empty": empty}
+
+
+async def test_counts_and_ids_match_the_members(db, statements, categories):
+    statements.clear()
+    listed = await crud_category.get_all_categories(db)
+
+    # One query, one row per category
+    assert len(statements) == 1
+    assert [category["name"] for category in listed] == sorted(categories)
+
+    for category in listed:
+        assert category["id"] == categories[category["name"]]
+        feeds = await crud_feed.get_category_feeds(db, category["id"])
+        channels = await crud_channel.get_category_channels(db, category["id"])
+        assert category["feed_count"] == len(feeds)
+        assert category["feed_ids"] == sorted(feed.id for feed in feeds)
+        assert category["channel_count"] == len(channels)
+        assert category["channel_ids"] == sorted(channel.id for channel in channels)
+
+    by_name = {category["name"]: category for category in listed}
+    assert (by_name["Big"]["feed_count"], by_name["Big"]["channel_count"]) == (50, 20)
+    assert (by_name["Empty"]["feed_ids"], by_name["Empty"]["channel_ids"]) == ([], [])
+
+
+async def test_name_filter_keeps_the_counts(db, categories):
+    listed = await crud_category.get_all_categories(db, name="Feeds")
+
+    assert [(category["name"], category["feed_count"]) for category in listed] == [("Feeds only", 4)]
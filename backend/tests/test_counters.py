@@ -0,0 +1,189 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.db.crud import bulk_operations, crud_article, crud_category, crud_channel, crud_counters, crud_feed, crud_video
+from app.db.models.category import Category
+from app.db.models.channel import Channel
+from app.db.models.feed import Feed
+from app.db.models.video import Video
+from app.schemas.article import ArticleCreate, ArticleUpdate
+from app.schemas.video import VideoCreate, VideoUpdate
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+PUBLISHED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _article(link: str) -> ArticleCreate:
+    return ArticleCreate(title="Post", link=link, published_at=PUBLISHED)
+
+
+def _video(video_id: str, channel_id: str = "UC1") -> VideoCreate:
+    return VideoCreate(id=video_id, title=f"Video {video_id}", channel_id=channel_id, published_at=PUBLISHED)
+
+
+@pytest.fixture
+async def library(db):
+    """Two feeds in the News category (the second one also in Tech) and a channel in News."""
+    feed_ids = list((await db.execute(
+        insert(Feed).returning(Feed.id),
+        [{"name": f"Feed {i}", "url": f"https://example.com/feed{i}.xml"} for i in range(2)],
+    )).scalars())
+    await db.execute(insert(Channel).values(id="UC1", title="Channel", uploads_id="UU1"))
+    news, tech = (await db.execute(insert(Category).returning(Category.id), [{"name": "News"}, {"name": "Tech"}])).scalars()
+    await db.commit()
+    await crud_category.assign_feeds_to_categories(db, feed_ids, [news])
+    await crud_category.assign_feeds_to_categories(db, feed_ids[1:], [tech])
+    await crud_category.add_channel_to_category(db, news, "UC1")
+    return {"feeds": feed_ids, "news": news, "tech": tech}
+
+
+async def _feed_counters(db, feed_id: int) -> tuple[int, int, int]:
+    feed = (await db.execute(
+        select(*(getattr(Feed, name) for name in crud_counters.ARTICLE_COUNTERS)).where(Feed.id == feed_id)
+    )).one()
+    return tuple(feed)
+
+
+async def _channel_counters(db, channel_id: str = "UC1") -> tuple[int, int]:
+    channel = (await db.execute(
+        select(*(getattr(Channel, name) for name in crud_counters.VIDEO_COUNTERS)).where(Channel.id == channel_id)
+    )).one()
+    return tuple(channel)
+
+
+async def _category_counters(db) -> dict[str, tuple[int, ...]]:
+    """The categories' counters as listed, once the scheduler recounted the queued ones."""
+    await crud_counters.refresh_category_counters(db)
+    return {
+        category["name"]: tuple(category[name] for name in crud_counters.CATEGORY_COUNTERS)
+        for category in await crud_category.get_all_categories(db)
+    }
+
+
+async def test_ingest_and_flags_move_the_feed_counters(db, library):
+    first, second = library["feeds"]
+    await bulk_operations.bulk_associate_articles_with_feed(db, first, [_article("https://example.com/a"), _article("https://example.com/b")])
+    await bulk_operations.bulk_associate_articles_with_feed(db, second, [_article("https://example.com/b")])
+    assert await _feed_counters(db, first) == (2, 2, 0)
+    assert await _feed_counters(db, second) == (1, 1, 0)
+
+    article = await crud_article.get_article_by_link(db, "https://example.com/b")
+    await crud_article.update_article(db, article, ArticleUpdate(is_read=True, is_favorited=True))
+
+    assert await _feed_counters(db, first) == (2, 1, 1)
+    assert await _feed_counters(db, second) == (1, 0, 1)
+
+
+async def test_categories_count_distinct_articles(db, library):
+    first, second = library["feeds"]
+    await bulk_operations.bulk_associate_articles_with_feed(db, first, [_article("https://example.com/a")])
+    await bulk_operations.bulk_associate_articles_with_feed(db, second, [_article("https://example.com/a"), _article("https://example.com/b")])
+    await crud_video.create_videos(db, [_video("v1"), _video("v2")])
+
+    # a is in both News feeds, it counts once there
+    assert await _category_counters(db) == {"News": (2, 2, 0, 2, 0), "Tech": (2, 2, 0, 0, 0)}
+
+    article = await crud_article.get_article_by_link(db, "https://example.com/a")
+    await crud_article.update_article(db, article, ArticleUpdate(is_read=True, is_favorited=True))
+    await crud_video.update_video(db, "v1", VideoUpdate(is_favorited=True))
+
+    assert await _category_counters(db) == {"News": (2, 1, 1, 2, 1), "Tech": (2, 1, 1, 0, 0)}
+
+
+async def test_membership_changes_recount_the_categories(db, library):
+    first, second = library["feeds"]
+    await bulk_operations.bulk_associate_articles_with_feed(db, first, [_article("https://example.com/a")])
+    await bulk_operations.bulk_associate_articles_with_feed(db, second, [_article("https://example.com/b")])
+    await crud_video.create_videos(db, [_video("v1")])
+    assert await _category_counters(db) == {"News": (2, 2, 0, 1, 0), "Tech": (1, 1, 0, 0, 0)}
+
+    await crud_category.remove_feed_from_category(db, library["news"], first)
+    await crud_category.add_feed_to_category(db, library["tech"], first)
+    assert await _category_counters(db) == {"News": (1, 1, 0, 1, 0), "Tech": (2, 2, 0, 0, 0)}
+
+    await crud_feed.delete_feed(db, second)
+    await crud_channel.delete_channel(db, "UC1")
+    assert await _category_counters(db) == {"News": (0, 0, 0, 0, 0), "Tech": (1, 1, 0, 0, 0)}
+
+
+async def test_categories_are_recounted_outside_the_write(db, library):
+    first, _ = library["feeds"]
+    await bulk_operations.bulk_associate_articles_with_feed(db, first, [_article("https://example.com/a")])
+
+    # Listed as stored until the queued recount ran
+    listed = await crud_category.get_all_categories(db)
+    assert [category["total_articles"] for category in listed] == [0, 0]
+
+    assert await crud_counters.refresh_category_counters(db) == 1
+    assert await crud_counters.refresh_category_counters(db) == 0
+    listed = await crud_category.get_all_categories(db)
+    assert [category["total_articles"] for category in listed] == [1, 0]
+
+
+async def test_create_videos_fills_in_the_defaults(db, library):
+    await crud_video.create_videos(db, [_video("v1"), _video("v2")])
+    await crud_video.create_videos(db, [_video("v2"), _video("v3")])
+
+    videos = (await db.execute(select(Video).order_by(Video.id))).scalars().all()
+    assert [(video.id, video.is_favorited) for video in videos] == [("v1", False), ("v2", False), ("v3", False)]
+    assert all(video.created_at and video.last_updated for video in videos)
+    assert await _channel_counters(db) == (3, 0)
+
+
+async def test_copy_videos_fills_in_the_defaults(db, library):
+    assert await crud_video.copy_videos(db, [_video("v1"), _video("v2")]) == 2
+    assert await crud_video.copy_videos(db, [_video("v2"), _video("v3")]) == 1
+
+    videos = (await db.execute(select(Video).order_by(Video.id))).scalars().all()
+    assert [(video.id, video.is_favorited) for video in videos] == [("v1", False), ("v2", False), ("v3", False)]
+    assert all(video.created_at and video.last_updated for video in videos)
+    assert await _channel_counters(db) == (3, 0)
+
+
+async def test_video_flags_and_deletes_move_the_channel_counters(db, library):
+    await crud_video.create_videos(db, [_video("v1"), _video("v2")])
+
+    await crud_video.update_video(db, "v1", VideoUpdate(is_favorited=True))
+    assert await _channel_counters(db) == (2, 1)
+
+    await crud_video.delete_video(db, "v1")
+    assert await _channel_counters(db) == (1, 0)
+
+
+async def test_reconcile_fixes_drift(db, library):
+    first, _ = library["feeds"]
+    await bulk_operations.bulk_associate_articles_with_feed(db, first, [_article("https://example.com/a")])
+    await crud_video.create_videos(db, [_video("v1")])
+    await crud_counters.refresh_category_counters(db)
+    await db.execute(update(Feed).values(total_articles=7))
+    await db.execute(update(Channel).values(favorited_videos=3))
+    await db.execute(update(Category).values(unread_articles=5))
+    await db.commit()
+
+    assert await crud_counters.reconcile_counters(db) == {"feeds": 2, "channels": 1, "categories": 2}
+    assert await _feed_counters(db, first) == (1, 1, 0)
+    assert await _channel_counters(db) == (1, 0)
+    assert await _category_counters(db) == {"News": (1, 1, 0, 1, 0), "Tech": (0, 0, 0, 0, 0)}
+    assert await crud_counters.reconcile_counters(db) == {"feeds": 0, "channels": 0, "categories": 0}
+
+
+async def test_ingests_into_feeds_of_one_category_dont_wait_on_each_other(sessionmaker, library):
+    first, second = library["feeds"]
+    async with sessionmaker() as one, sessionmaker() as two:
+        # The first refresh is still in its transaction when the second one runs
+        upsert = bulk_operations.build_upsert_statement([_article("https://example.com/a")])
+        await one.execute(upsert)
+        await one.execute(bulk_operations.build_link_statement(first, ["https://example.com/a"]))
+
+        await asyncio.wait_for(
+            bulk_operations.bulk_associate_articles_with_feed(two, second, [_article("https://example.com/b")]),
+            timeout=5,
+        )
+        await one.commit()
+
+    async with sessionmaker() as db:
+        assert await _category_counters(db) == {"News": (2, 2, 0, 0, 0), "Tech": (1, 1, 0, 0, 0)}
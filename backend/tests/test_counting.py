@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.crud import counting, crud_article
+from app.db.models.article import Article
+from app.schemas.article import ArticleSearchParams, ArticleUpdate
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    counting._count_cache.clear()
+    yield
+    counting._count_cache.clear()
+
+
+@pytest.fixture
+async def articles(db):
+    await db.execute(insert(Article), [
+        {"title": f"Post {i}", "link": f"https://example.com/{i}", "published_at": datetime(2026, 1, 1, tzinfo=timezone.utc)}
+        for i in range(5)
+    ])
+    await db.commit()
+
+
+async def _count(db, **params) -> tuple[int | None, bool]:
+    _, total_count, approximate, _ = await crud_article.get_articles(db, ArticleSearchParams(**params))
+    return total_count, approximate
+
+
+async def test_exact_count_follows_reads(db, articles):
+    assert await _count(db, is_read=False) == (5, False)
+
+    article = await crud_article.get_article_by_id(db, 1)
+    await crud_article.update_article(db, article, ArticleUpdate(is_read=True))
+
+    assert await _count(db, is_read=False) == (4, False)
+
+
+async def test_capped_count_under_the_cap_is_exact(db, articles, monkeypatch):
+    monkeypatch.setattr(settings, "search_count_cap", 10)
+    assert await _count(db, is_read=False, count="capped") == (5, False)
+
+    article = await crud_article.get_article_by_id(db, 1)
+    await crud_article.update_article(db, article, ArticleUpdate(is_read=True))
+
+    assert await _count(db, is_read=False, count="capped") == (4, False)
+
+
+async def test_capped_count_over_the_cap_is_cached_as_approximate(db, articles, monkeypatch):
+    monkeypatch.setattr(settings, "search_count_cap", 3)
+    assert await _count(db, is_read=False, count="capped") == (3, True)
+
+    article = await crud_article.get_article_by_id(db, 1)
+    await crud_article.update_article(db, article, ArticleUpdate(is_read=True))
+
+    assert await _count(db, is_read=False, offset=100, count="capped") == (3, True)
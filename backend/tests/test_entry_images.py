@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.utils.feedparse import extract_and_remove_first_image
+
+CORPUS = sorted((Path(__file__).parent / "fixtures" / "entry_html").glob("*.html"))
+
+
+def bs4_extract_and_remove_first_image(html_content: str | None):
+    """The BeautifulSoup implementation extract_and_remove_first_image replaced, frozen as it was."""
+    if not html_content:
+        return None, html_content
+    soup = BeautifulSoup(html_content, "html.parser")
+    img_tag = soup.find("img")
+    if img_tag and "src" in img_tag.attrs:
+        img_src = img_tag["src"]
+        img_tag.decompose()
+        return img_src, str(soup)
+    return None, html_content
+
+
+def _serialized(html: str) -> str:
+    # The old version returned BeautifulSoup's re-serialization, the new one the original
+    # text: compare both through a fresh parse (which also merges adjacent whitespace)
+    return str(BeautifulSoup(html, "html.parser"))
+
+
+def read_entry(path: Path) -> str:
+    with open(path, encoding="utf-8", newline="") as file:  # keep \r\n line endings
+        return file.read()
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda path: path.stem)
+def test_matches_bs4_version(path):
+    html = read_entry(path)
+    expected_src, expected_html = bs4_extract_and_remove_first_image(html)
+    src, updated_html = extract_and_remove_first_image(html)
+
+    if expected_src == "":
+        # Deliberate difference: an empty src is no image, so the HTML is left alone
+        assert (src, updated_html) == (None, html)
+        return
+    assert src == expected_src
+    if src is None:
+        assert updated_html == html
+    else:
+        assert _serialized(updated_html) == _serialized(expected_html)
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda path: path.stem)
+def test_rest_of_the_html_is_untouched(path):
+    html = read_entry(path)
+    src, updated_html = extract_and_remove_first_image(html)
+    if src is None:
+        return
+    removed = len(html) - len(updated_html)
+    assert any(
+        html[start:start + removed].lower().startswith("<img")
+        and html[:start] + html[start + removed:] == updated_html
+        for start in range(len(updated_html) + 1)
+    )
+
+
+@pytest.mark.parametrize("html", [None, ""])
+def test_empty_content(html):
+    assert extract_and_remove_first_image(html) == (None, html)
@@ -0,0 +1,70 @@
+import re
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import inspect, insert
+
+from app.db.crud import bulk_operations, crud_feed
+from app.db.models.category import Category, FeedCategory
+from app.db.models.feed import Feed
+from app.schemas.article import ArticleCreate
+from app.schemas.feed import FeedSearchParams
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+FEEDS = 30
+# Queries touching the articles or the members of the categories
+MEMBER_TABLES = re.compile(r"\b(articles|feed_articles|channel_categories|channels)\b(?!\.)")
+
+
+@pytest.fixture
+async def feeds(db):
+    feed_ids = list((await db.execute(
+        insert(Feed).returning(Feed.id),
+        [{"name": f"Feed {i:02}", "url": f"https://example.com/feed{i}.xml"} for i in range(FEEDS)],
+    )).scalars())
+    category_ids = list((await db.execute(
+        insert(Category).returning(Category.id), [{"name": "News"}, {"name": "Tech"}]
+    )).scalars())
+    await db.execute(insert(FeedCategory), [
+        {"feed_id": feed_id, "category_id": category_ids[i % 2]} for i, feed_id in enumerate(feed_ids)
+    ])
+    await db.commit()
+    for i, feed_id in enumerate(feed_ids):
+        await bulk_operations.bulk_associate_articles_with_feed(db, feed_id, [
+            ArticleCreate(
+                title="Post", link=f"https://example.com/{i}/{n}",
+                published_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            )
+            for n in range(5)
+        ])
+    db.expunge_all()
+    return feed_ids
+
+
+def _assert_only_feeds_and_categories_loaded(statements, loaded):
+    # The feeds, then their categories for the whole list: no query per feed
+    assert len(statements) == 2, [statement for statement, _ in statements]
+    for statement, _ in statements:
+        assert not MEMBER_TABLES.search(statement), statement
+    for feed in loaded:
+        assert "articles" in inspect(feed).unloaded
+        assert feed.categories
+        for category in feed.categories:
+            assert {"feeds", "channels"} <= inspect(category).unloaded
+
+
+async def test_get_all_feeds_loads_only_feeds_and_categories(db, statements, feeds):
+    statements.clear()
+    loaded = await crud_feed.get_all_feeds(db)
+
+    assert len(loaded) == FEEDS
+    _assert_only_feeds_and_categories_loaded(statements, loaded)
+
+
+async def test_get_feeds_loads_only_feeds_and_categories(db, statements, feeds):
+    statements.clear()
+    loaded = await crud_feed.get_feeds(db, FeedSearchParams(categories=["News", "Tech"]))
+
+    assert len(loaded) == FEEDS
+    _assert_only_feeds_and_categories_loaded(statements, loaded)
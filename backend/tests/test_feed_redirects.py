@@ -0,0 +1,68 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.crud import crud_feed
+from app.db.models.feed import Feed
+from app.schemas.feed import FeedCreate
+from app.services import feed_service
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+
+@pytest.fixture
+async def feed_id(db):
+    now = datetime.now(timezone.utc)
+    result = await db.execute(insert(Feed).returning(Feed.id), [
+        {"name": "Feed", "url": "https://example.com/feed/", "created_at": now, "last_updated": now,
+         "last_checked_at": now - timedelta(days=1)},
+        {"name": "Other", "url": "https://example.org/feed", "created_at": now, "last_updated": now},
+    ])
+    await db.commit()
+    return result.scalars().first()
+
+
+@pytest.fixture
+def fetched_from(monkeypatch):
+    """Makes parse_feed answer with an empty feed at the URL the test sets."""
+    location = {}
+
+    async def parse_feed(url, etag, modified, watermark, known_links, stats):
+        return FeedCreate(name="Feed", url=location["url"]), []
+
+    monkeypatch.setattr(feed_service, "parse_feed", parse_feed)
+    return location
+
+
+async def _refreshed_url(db, feed_id: int) -> str:
+    await feed_service.handle_refresh_feed(feed_id, db)
+    db.expire_all()
+    return (await crud_feed.get_feed_by_id(db, feed_id)).url
+
+
+@pytest.mark.parametrize("location", [
+    "https://example.com/feed",
+    "https://EXAMPLE.com:443/feed/",
+])
+async def test_trivially_different_url_is_kept(db, feed_id, fetched_from, location, caplog):
+    fetched_from["url"] = location
+
+    with caplog.at_level(logging.INFO, logger=feed_service.logger.name):
+        assert await _refreshed_url(db, feed_id) == "https://example.com/feed/"
+    assert "moved" not in caplog.text
+
+
+async def test_moved_feed_gets_the_new_url(db, feed_id, fetched_from, caplog):
+    fetched_from["url"] = "https://feeds.example.com/main.xml"
+
+    with caplog.at_level(logging.INFO, logger=feed_service.logger.name):
+        assert await _refreshed_url(db, feed_id) == "https://feeds.example.com/main.xml"
+    assert f"Feed {feed_id} moved from https://example.com/feed/ to https://feeds.example.com/main.xml" in caplog.text
+
+
+async def test_url_of_another_feed_is_not_taken(db, feed_id, fetched_from):
+    fetched_from["url"] = "https://example.org/feed"
+
+    assert await _refreshed_url(db, feed_id) == "https://example.com/feed/"
@@ -0,0 +1,27 @@
+import pytest
+
+from app.utils.feedfetch import normalize_url
+
+
+@pytest.mark.parametrize("url, same_as", [
+    ("https://example.com/feed/", "https://example.com/feed"),
+    ("HTTPS://Example.COM/feed", "https://example.com/feed"),
+    ("https://example.com:443/feed", "https://example.com/feed"),
+    ("http://example.com:80/feed", "http://example.com/feed"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/feed#top", "https://example.com/feed"),
+])
+def test_trivial_differences_are_the_same_url(url, same_as):
+    assert normalize_url(url) == normalize_url(same_as)
+
+
+@pytest.mark.parametrize("url, other", [
+    ("http://example.com/feed", "https://example.com/feed"),
+    ("https://example.com:8443/feed", "https://example.com/feed"),
+    ("http://example.com:443/feed", "http://example.com/feed"),
+    ("https://example.com/Feed", "https://example.com/feed"),
+    ("https://example.com/feed?format=atom", "https://example.com/feed?format=rss"),
+    ("https://www.example.com/feed", "https://example.com/feed"),
+])
+def test_real_differences_are_kept(url, other):
+    assert normalize_url(url) != normalize_url(other)
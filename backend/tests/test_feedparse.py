@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from app.utils.feedparse import parse_feed_content
+
+FEED_URL = "https://example.com/feed.xml"
+WATERMARK = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _rss(items: list[tuple[str, datetime]]) -> bytes:
+    entries = "".join(
+        f"<item><title>{link}</title><link>{link}</link>"
+        f"<pubDate>{format_datetime(published)}</pubDate></item>"
+        for link, published in items
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Example</title>'
+        f"<link>https://example.com/</link>{entries}</channel></rss>"
+    ).encode()
+
+
+def _day(day: int, month: int = 2) -> datetime:
+    return datetime(2026, month, day, tzinfo=timezone.utc)
+
+
+def _parsed_links(items, watermark=WATERMARK, known_links=None) -> list[str]:
+    _, articles = parse_feed_content(_rss(items), FEED_URL, None, None, watermark, known_links)
+    return [article["link"] for article in articles]
+
+
+def test_known_entries_up_to_the_watermark_are_skipped():
+    items = [("https://example.com/new", _day(2, 3)), ("https://example.com/old", _day(1))]
+
+    assert _parsed_links(items, known_links=["https://example.com/old"]) == ["https://example.com/new"]
+
+
+def test_backdated_entry_is_parsed():
+    # Published after the last refresh, but dated before the watermark
+    items = [("https://example.com/old", _day(1)), ("https://example.com/backdated", _day(3))]
+
+    assert _parsed_links(items, known_links=["https://example.com/old"]) == ["https://example.com/backdated"]
+
+
+def test_unsorted_feed_is_parsed_past_known_entries():
+    known = [(f"https://example.com/known-{i}", _day(i + 1)) for i in range(20)]
+    items = known + [("https://example.com/late", _day(1))]
+
+    links = _parsed_links(items, known_links=[link for link, _ in known])
+
+    assert links == ["https://example.com/late"]
+
+
+def test_known_entry_updated_after_the_watermark_is_parsed():
+    items = [("https://example.com/old", _day(2, 3))]
+
+    assert _parsed_links(items, known_links=["https://example.com/old"]) == ["https://example.com/old"]
+
+
+def test_without_known_links_every_entry_is_parsed():
+    items = [("https://example.com/a", _day(1)), ("https://example.com/b", _day(2))]
+
+    assert _parsed_links(items, known_links=None) == ["https://example.com/a", "https://example.com/b"]
+
+
+def test_entry_links_of_the_document_are_reported():
+    items = [("https://example.com/a", _day(1)), ("https://example.com/b", _day(2))]
+
+    feed, _ = parse_feed_content(_rss(items), FEED_URL, None, None)
+
+    assert feed["entry_links"] == ["https://example.com/a", "https://example.com/b"]
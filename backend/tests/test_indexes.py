@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.db.crud import crud_article, crud_video
+from app.db.models.article import Article
+from app.db.models.channel import Channel
+from app.db.models.video import Video
+from app.schemas.article import ArticleSearchParams
+from app.schemas.video import VideoSearchParams
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def library(db):
+    # Mostly read, unfavorited rows, so the partial indexes cover a small part of the tables
+    await db.execute(insert(Article), [
+        {
+            "title": f"Post {i}", "link": f"https://example.com/{i}", "published_at": START + timedelta(hours=i),
+            "created_at": START + timedelta(hours=i), "last_updated": START,
+            "is_read": i % 50 != 0, "is_favorited": i % 100 == 0,
+        }
+        for i in range(2000)
+    ])
+    await db.execute(insert(Channel).values(id="UC1", title="Channel", uploads_id="UU1", created_at=START, last_updated=START))
+    await db.execute(insert(Video), [
+        {
+            "id": f"v{i}", "title": f"Video {i}", "channel_id": "UC1", "published_at": START + timedelta(hours=i),
+            "created_at": START, "last_updated": START, "is_favorited": i % 100 == 0,
+        }
+        for i in range(2000)
+    ])
+    await db.commit()
+    for table in ("articles", "videos"):
+        await db.execute(text(f"ANALYZE {table}"))
+    await db.commit()
+
+
+def _literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple)):
+        value = "{" + ",".join(f'"{item}"' for item in value) + "}"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+async def _generic_plan(db, statement: str, parameters) -> str:
+    """
+    EXPLAIN of a statement as the app ran it, planned as a generic plan: the way
+    asyncpg's cached prepared statements end up being planned after a few runs.
+    """
+    connection = await db.connection()
+    await connection.exec_driver_sql("SET LOCAL plan_cache_mode = force_generic_plan")
+    await connection.exec_driver_sql(f"PREPARE planned AS {statement}")
+    arguments = f"({', '.join(_literal(value) for value in parameters)})" if parameters else ""
+    result = await connection.exec_driver_sql(f"EXPLAIN EXECUTE planned{arguments}")
+    plan = "\n".join(result.scalars())
+    await connection.exec_driver_sql("DEALLOCATE planned")
+    await db.rollback()
+    return plan
+
+
+async def _page_plan(db, statements, search, params) -> str:
+    statements.clear()
+    await search(db, params)
+    (page_query,) = [(statement, parameters) for statement, parameters in statements if "LIMIT" in statement]
+    return await _generic_plan(db, *page_query)
+
+
+@pytest.mark.parametrize(
+    "params, index",
+    [
+        (ArticleSearchParams(), "ix_articles_created_at_id"),
+        (ArticleSearchParams(order_by="published_at"), "ix_articles_published_at_id"),
+        (ArticleSearchParams(is_read=False), "ix_articles_unread_created_at"),
+        (ArticleSearchParams(is_favorited=True), "ix_articles_favorited_created_at"),
+    ],
+    ids=["newest", "published", "unread", "favorited"],
+)
+async def test_article_pages_read_the_index(db, statements, library, params, index):
+    plan = await _page_plan(db, statements, crud_article.get_articles, params)
+    assert f"Index Scan using {index}" in plan, plan
+    assert "Sort" not in plan, plan
+
+
+@pytest.mark.parametrize(
+    "params, index",
+    [
+        (VideoSearchParams(), "ix_videos_published_at_id"),
+        (VideoSearchParams(is_favorited=True), "ix_videos_favorited_published_at"),
+    ],
+    ids=["newest", "favorited"],
+)
+async def test_video_pages_read_the_index(db, statements, library, params, index):
+    plan = await _page_plan(db, statements, crud_video.get_videos, params)
+    assert f"Index Scan using {index}" in plan, plan
+    assert "Sort" not in plan, plan
+
+
+@pytest.mark.parametrize(
+    "search, params, index",
+    [
+        (crud_article.get_articles, ArticleSearchParams(limit=50), "ix_articles_created_at_id"),
+        (crud_video.get_videos, VideoSearchParams(limit=50), "ix_videos_published_at_id"),
+    ],
+    ids=["articles", "videos"],
+)
+async def test_cursor_pages_seek_in_the_index(db, statements, library, search, params, index):
+    *_, next_cursor = await search(db, params)
+    plan = await _page_plan(db, statements, search, params.model_copy(update={"cursor": next_cursor}))
+
+    # The cursor is a range of the index, not a filter on rows read from the top
+    assert f"Index Scan using {index}" in plan, plan
+    assert "Index Cond" in plan, plan
+    assert "Filter" not in plan, plan
+    assert "Sort" not in plan, plan
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.crud import crud_video
+from app.db.models.channel import Channel
+from app.db.models.video import Video
+from app.schemas.video import VideoSearchParams
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def videos(db):
+    """Ten videos, v4 and v5 published at the same time, v6 to v9 without a publication date."""
+    await db.execute(insert(Channel).values(id="UC1", title="Channel", uploads_id="UU1"))
+    await db.execute(insert(Video), [
+        {
+            "id": f"v{i}", "title": f"Video {i}", "channel_id": "UC1", "created_at": START, "last_updated": START,
+            "published_at": START + timedelta(days=min(i, 4)) if i < 6 else None,
+        }
+        for i in range(10)
+    ])
+    await db.commit()
+
+
+async def _walk(db, limit: int) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        videos, _, _, cursor = await crud_video.get_videos(db, VideoSearchParams(limit=limit, cursor=cursor, count="none"))
+        pages.append([video.id for video in videos])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 6, 10])
+async def test_cursor_pages_list_every_video_once_in_order(db, videos, limit):
+    videos, _, _, _ = await crud_video.get_videos(db, VideoSearchParams(count="none"))
+    in_order = [video.id for video in videos]
+    assert in_order[-4:] == ["v9", "v8", "v7", "v6"]
+
+    pages = await _walk(db, limit)
+
+    assert [video_id for page in pages for video_id in page] == in_order
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+async def test_page_crossing_into_the_nulls_fetches_them_separately(db, statements, videos):
+    _, _, _, cursor = await crud_video.get_videos(db, VideoSearchParams(limit=4, count="none"))
+    statements.clear()
+
+    page, _, _, _ = await crud_video.get_videos(db, VideoSearchParams(limit=4, cursor=cursor, count="none"))
+
+    assert [video.id for video in page] == ["v1", "v0", "v9", "v8"]
+    seek, tail = [statement for statement, _ in statements if "LIMIT" in statement]
+    assert "IS NULL" not in seek
+    assert "IS NULL" in tail
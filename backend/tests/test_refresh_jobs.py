@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.crud import crud_feed, crud_refresh_job
+from app.db.models.feed import Feed
+from app.services import feed_service
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+HOLD = timedelta(minutes=15)
+
+
+@pytest.fixture
+async def feed_id(db):
+    now = datetime.now(timezone.utc)
+    result = await db.execute(insert(Feed).returning(Feed.id).values(
+        name="Feed", url="https://example.com/feed.xml", created_at=now, last_updated=now,
+        # Checked 10 minutes ago and already due, as a negative jitter on next_fetch_at allows
+        last_checked_at=now - timedelta(minutes=10), next_fetch_at=now - timedelta(seconds=1),
+        refresh_interval=15 * 60,
+    ))
+    await db.commit()
+    return result.scalar_one()
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Replaces the network fetch with a 304 Not Modified, recording the fetched URLs."""
+    fetched = []
+
+    async def not_modified(url, etag, modified, watermark, known_links, stats):
+        fetched.append(url)
+        return None, []
+
+    monkeypatch.setattr(feed_service, "parse_feed", not_modified)
+    return fetched
+
+
+async def test_due_feeds_are_queued_as_scheduled(db, feed_id):
+    assert await crud_refresh_job.enqueue_due_feeds(db, 10, HOLD) == [feed_id]
+
+    assert await crud_refresh_job.claim_refresh_jobs(db, "worker", 10) == [(1, feed_id, True)]
+
+
+async def test_user_refreshes_are_not_scheduled(db, feed_id):
+    await crud_refresh_job.enqueue_refresh_jobs(db, [feed_id])
+
+    assert await crud_refresh_job.claim_refresh_jobs(db, "worker", 10) == [(1, feed_id, False)]
+
+
+async def test_coming_due_marks_a_queued_user_refresh_scheduled(db, feed_id):
+    await crud_refresh_job.enqueue_refresh_jobs(db, [feed_id])
+    await crud_refresh_job.enqueue_due_feeds(db, 10, HOLD)
+
+    assert await crud_refresh_job.claim_refresh_jobs(db, "worker", 10) == [(1, feed_id, True)]
+
+
+async def test_user_refresh_of_a_recently_checked_feed_is_skipped(db, feed_id, fetches):
+    result = await feed_service.handle_refresh_feed(feed_id, db)
+
+    assert result == {"message": "Feed recently updated. No need to refresh."}
+    assert fetches == []
+
+
+async def test_scheduled_refresh_of_a_recently_checked_feed_fetches(db, feed_id, fetches):
+    result = await feed_service.handle_refresh_feed(feed_id, db, scheduled=True)
+
+    assert result["message"] == "Feed has no updates"
+    assert fetches == ["https://example.com/feed.xml"]
+    db.expire_all()
+    feed = await crud_feed.get_feed_by_id(db, feed_id)
+    assert feed.next_fetch_at > datetime.now(timezone.utc)
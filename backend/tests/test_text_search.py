@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app.db.crud import crud_article, crud_video
+from app.db.models.article import Article
+from app.db.models.channel import Channel
+from app.db.models.video import Video
+from app.routers import articles as articles_router, youtube as youtube_router
+from app.schemas.article import ArticleSearchParams
+from app.schemas.video import VideoSearchParams
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+CREATED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def articles(db):
+    """Articles about databases and cooking, created in id order so the newest one is last."""
+    rows = [
+        ("Postgres full text search", "Ranking search results in Postgres.", None),
+        ("Weekly links", "A few links about text editors and search.", None),
+        ("Cooking pasta", None, "Salt the water. Postgres is not needed for pasta."),
+        ("MySQL full text search", "Full text search in MySQL.", None),
+        ("Salad recipes", "Greens, oil and salt.", None),
+    ]
+    await db.execute(insert(Article), [
+        {
+            "title": title, "link": f"https://example.com/{i}", "summary": summary, "content": content,
+            "created_at": CREATED, "last_updated": CREATED,
+        }
+        for i, (title, summary, content) in enumerate(rows)
+    ])
+    await db.commit()
+
+
+async def _search(db, q: str, **params) -> list[Article]:
+    found, _, _, _ = await crud_article.get_articles(db, ArticleSearchParams(q=q, count="none", **params))
+    return found
+
+
+async def _titles(db, q: str, **params) -> list[str]:
+    return [article.title for article in await _search(db, q, **params)]
+
+
+async def test_q_uses_web_search_syntax(db, articles):
+    # Words are ANDed, "phrases" must be adjacent, -words are excluded, `or` is an alternative
+    assert set(await _titles(db, "full text search")) == {"Postgres full text search", "MySQL full text search"}
+    assert set(await _titles(db, '"text search"')) == {"Postgres full text search", "MySQL full text search"}
+    assert await _titles(db, '"full text" -mysql') == ["Postgres full text search"]
+    assert set(await _titles(db, "pasta or salad")) == {"Cooking pasta", "Salad recipes"}
+    # Stemmed: "recipe" finds "recipes"
+    assert await _titles(db, "recipe") == ["Salad recipes"]
+    # Malformed input is parsed as well as it can be instead of failing
+    assert await _titles(db, 'pasta & (" !') == ["Cooking pasta"]
+    assert await _titles(db, "the") == []
+
+
+async def test_relevance_ranks_title_matches_above_summary_and_content_matches(db, articles):
+    found = await _search(db, "search or salt", order_by="relevance")
+
+    # Title matches first, then summaries, then content, equal ranks newest first
+    assert [article.title for article in found] == [
+        "MySQL full text search", "Postgres full text search", "Salad recipes", "Weekly links", "Cooking pasta",
+    ]
+    ranks = [article.rank for article in found]
+    assert ranks == sorted(ranks, reverse=True)
+    assert ranks[0] == ranks[1] > ranks[2] > 0
+
+
+async def test_headline_highlights_the_summary_or_the_content(db, articles):
+    found = {article.title: article for article in await _search(db, "postgres")}
+
+    assert found["Postgres full text search"].headline == "Ranking search results in <mark>Postgres</mark>"
+    # Without a summary, the snippet comes from the content
+    assert "<mark>Postgres</mark> is not needed" in found["Cooking pasta"].headline
+
+
+async def test_q_is_ordered_by_the_requested_column_unless_relevance(db, articles):
+    found = await _search(db, "search")
+
+    # Newest first, which is the highest id here as they share created_at
+    assert [article.id for article in found] == sorted((article.id for article in found), reverse=True)
+    assert all(article.rank is not None and article.headline for article in found)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+async def test_relevance_cursor_pages_list_every_match_once_in_order(db, articles, limit):
+    in_order = [article.id for article in await _search(db, "search or salt", order_by="relevance")]
+    assert len(in_order) == 5
+
+    pages, cursor = [], None
+    while True:
+        found, _, _, cursor = await crud_article.get_articles(
+            db, ArticleSearchParams(q="search or salt", order_by="relevance", limit=limit, cursor=cursor, count="none")
+        )
+        pages.append([article.id for article in found])
+        if cursor is None:
+            break
+
+    assert [article_id for page in pages for article_id in page] == in_order
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+async def test_relevance_without_q_is_rejected(db, articles):
+    with pytest.raises(ValueError, match="needs a search query"):
+        await crud_article.get_articles(db, ArticleSearchParams(order_by="relevance"))
+
+    with pytest.raises(HTTPException) as error:
+        await articles_router.get_articles(db, ArticleSearchParams(order_by="relevance"))
+    assert error.value.status_code == 400
+
+
+async def test_video_search_highlights_the_description_or_the_title(db):
+    await db.execute(insert(Channel).values(id="UC1", title="Channel", uploads_id="UU1"))
+    await db.execute(insert(Video), [
+        {"id": "v1", "title": "Postgres tuning", "description": None, "channel_id": "UC1"},
+        {"id": "v2", "title": "Weekly show", "description": "This week: tuning Postgres.", "channel_id": "UC1"},
+        {"id": "v3", "title": "Cooking pasta", "description": "Salt the water.", "channel_id": "UC1"},
+    ])
+    await db.commit()
+
+    found, _, _, _ = await crud_video.get_videos(db, VideoSearchParams(q="postgres", order_by="relevance", count="none"))
+
+    assert [(video.id, video.headline) for video in found] == [
+        ("v1", "<mark>Postgres</mark> tuning"),
+        ("v2", "This week: tuning <mark>Postgres</mark>"),
+    ]
+    with pytest.raises(HTTPException) as error:
+        await youtube_router.get_videos(db, VideoSearchParams(order_by="relevance"))
+    assert error.value.status_code == 400
@@ -0,0 +1,168 @@
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.db.crud import crud_feed
+from app.db.models.article import Article
+from app.db.models.feed import Feed
+from app.schemas.feed import FeedCreate
+from app.services import websub_service
+from app.utils.feedfetch import feed_fetcher
+from app.utils.parse_pool import parse_pool
+
+pytestmark = [pytest.mark.anyio, pytest.mark.database]
+
+HUB = "https://hub.example.com/"
+TOPIC = "https://example.com/feed.xml"
+SECRET = "s3cret"
+
+PUSHED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <title>Feed</title><link>https://example.com/</link>
+  <item>
+    <title>Pushed post</title><link>https://example.com/pushed</link>
+    <pubDate>Thu, 01 Jan 2026 12:00:00 GMT</pubDate>
+  </item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    """
+    A stand-in hub behind the feed fetcher's client: records the forms POSTed
+    to it and answers with hub["status"] (202 Accepted by default).
+    """
+    state = {"requests": [], "status": 202}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        state["requests"].append((str(request.url), {k: v[0] for k, v in parse_qs(request.content.decode()).items()}))
+        return httpx.Response(state["status"])
+
+    monkeypatch.setattr(settings, "websub_callback_base_url", "https://reader.example.com/")
+    monkeypatch.setattr(feed_fetcher, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+    return state
+
+
+@pytest.fixture(autouse=True)
+def parse_inline(monkeypatch):
+    monkeypatch.setattr(parse_pool, "_max_workers", 0)
+
+
+@pytest.fixture
+async def feed(db):
+    now = datetime.now(timezone.utc)
+    feed_id = (await db.execute(insert(Feed).returning(Feed.id), [
+        {"name": "Feed", "url": TOPIC, "created_at": now, "last_updated": now},
+    ])).scalar_one()
+    await db.commit()
+    return await crud_feed.get_feed_by_id(db, feed_id)
+
+
+async def _reloaded(db, feed_id: int) -> Feed:
+    db.expire_all()
+    return await crud_feed.get_feed_by_id(db, feed_id)
+
+
+async def _subscribed(db, feed: Feed) -> Feed:
+    """The feed once a subscription was requested with SECRET."""
+    await crud_feed.record_websub_request(db, feed.id, HUB, TOPIC, SECRET)
+    return await _reloaded(db, feed.id)
+
+
+def _advertised(hub_url: str | None = HUB) -> FeedCreate:
+    return FeedCreate(name="Feed", url=TOPIC, websub_hub=hub_url, websub_topic=TOPIC if hub_url else None)
+
+
+def _signature(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+async def test_subscribing_posts_to_the_hub_and_stores_the_request(db, feed, hub):
+    await websub_service.ensure_subscription(db, feed, _advertised())
+
+    [(url, form)] = hub["requests"]
+    assert url == HUB
+    assert form == {
+        "hub.mode": "subscribe",
+        "hub.topic": TOPIC,
+        "hub.callback": f"https://reader.example.com/websub/{feed.id}",
+        "hub.secret": form["hub.secret"],
+        "hub.lease_seconds": str(settings.websub_lease_seconds),
+    }
+    stored = await _reloaded(db, feed.id)
+    assert (stored.websub_hub, stored.websub_topic, stored.websub_secret) == (HUB, TOPIC, form["hub.secret"])
+    # The lease waits for the hub's verification
+    assert stored.websub_lease_expires_at is None
+
+    # An unverified request isn't repeated right away
+    await websub_service.ensure_subscription(db, stored, _advertised())
+    assert len(hub["requests"]) == 1
+
+
+async def test_failed_or_disabled_subscriptions_store_nothing(db, feed, hub, monkeypatch):
+    hub["status"] = 500
+    await websub_service.ensure_subscription(db, feed, _advertised())
+    assert len(hub["requests"]) == 1
+
+    await websub_service.ensure_subscription(db, feed, _advertised(hub_url=None))
+    monkeypatch.setattr(settings, "websub_callback_base_url", None)
+    await websub_service.ensure_subscription(db, feed, _advertised())
+    assert len(hub["requests"]) == 1
+
+    assert (await _reloaded(db, feed.id)).websub_secret is None
+
+
+async def test_verified_intent_echoes_the_challenge_and_stores_the_lease(db, feed):
+    feed = await _subscribed(db, feed)
+
+    challenge = await websub_service.verify_intent(db, feed.id, "subscribe", TOPIC, "c4allenge", 3600)
+
+    assert challenge == "c4allenge"
+    lease = (await _reloaded(db, feed.id)).websub_lease_expires_at
+    assert abs(lease - (datetime.now(timezone.utc) + timedelta(hours=1))) < timedelta(minutes=1)
+
+    assert await websub_service.verify_intent(db, feed.id, "unsubscribe", TOPIC, "bye", None) == "bye"
+    assert (await _reloaded(db, feed.id)).websub_lease_expires_at is None
+
+
+@pytest.mark.parametrize("feed_offset, topic", [(0, "https://example.com/other.xml"), (1, TOPIC)])
+async def test_intent_for_an_unknown_subscription_is_refused(db, feed, feed_offset, topic):
+    feed = await _subscribed(db, feed)
+
+    with pytest.raises(HTTPException) as error:
+        await websub_service.verify_intent(db, feed.id + feed_offset, "subscribe", topic, "c4allenge", 3600)
+
+    assert error.value.status_code == 404
+    assert (await _reloaded(db, feed.id)).websub_lease_expires_at is None
+
+
+async def test_signed_push_is_ingested(db, feed):
+    feed = await _subscribed(db, feed)
+
+    await websub_service.handle_push(db, feed.id, PUSHED, _signature(PUSHED))
+
+    articles = (await db.execute(select(Article.title, Article.link))).all()
+    assert [tuple(article) for article in articles] == [("Pushed post", "https://example.com/pushed")]
+    assert (await _reloaded(db, feed.id)).entries_watermark == datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("signature", [
+    None,
+    "sha256=0000",
+    "md5=" + hashlib.md5(PUSHED).hexdigest(),
+    _signature(PUSHED, secret="wrong"),
+    _signature(PUSHED + b" "),
+])
+async def test_push_with_a_bad_signature_is_ignored(db, feed, signature):
+    feed = await _subscribed(db, feed)
+
+    await websub_service.handle_push(db, feed.id, PUSHED, signature)
+
+    assert (await db.execute(select(Article.id))).first() is None